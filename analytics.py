@@ -0,0 +1,165 @@
+"""
+Analytics for the Abraham Accords Literacy Dashboard
+AALNI scoring, evidence-based investment need, phased budget allocation and
+scenario evaluation, computed from the panel so they work for any year.
+"""
+
+import numpy as np
+import pandas as pd
+
+from conflict_model import adjust_transitions
+from panel_index import PanelIndex, reduce_blocks
+
+# ============================================================================
+# AALNI
+# ============================================================================
+SDG_TARGET = 95.0
+
+AALNI_WEIGHTS = {
+    'Baseline_Gap': 0.30,
+    'Gender_Disparity': 0.25,
+    'Rural_Urban_Divide': 0.20,
+    'Economic_Constraint': 0.15,
+    'Quality_Deficit': 0.10,
+}
+
+# 1.0x (stable) to 3.0x (severe conflict); intermediate levels are interpolated
+CONFLICT_MULTIPLIERS = {'Stable': 1.0, 'Unstable': 1.5, 'Conflict': 2.0, 'Severe_Conflict': 3.0}
+
+CONFLICT_ORDER = list(CONFLICT_MULTIPLIERS)
+
+INDICATOR_COLUMNS = ['Adult_Literacy_Rate', 'Gender_Parity_Index', 'Rural_Urban_Gap',
+                     'Learning_Quality_Index', 'Illiterate_Population_Millions']
+
+
+def available_years(panel):
+    return PanelIndex.of(panel).years()
+
+
+def latest_observations(panel, year):
+    """Each country's latest observation up to the end of a year; rows sharing that
+    date (one per program) are averaged, and the most severe conflict status is kept"""
+    index = PanelIndex.of(panel)
+    regions, start, stop = index.asof_blocks(pd.Timestamp(year=year, month=12, day=31))
+    latest = pd.DataFrame({'CountryName': index.regions[regions],
+                           'Year': pd.DatetimeIndex(index.dates[start]).year})
+    for name in INDICATOR_COLUMNS:
+        latest[name] = reduce_blocks(index.column(name), start, stop, 'mean')
+    severity = index.mapped('Conflict_Status', {status: code for code, status in enumerate(CONFLICT_ORDER)})
+    latest['Conflict_Status'] = [CONFLICT_ORDER[int(code)] for code in reduce_blocks(severity, start, stop, 'max')]
+    return latest
+
+
+def aalni_scores(panel, year, economic_constraint):
+    """AALNI per country as of a year (each country's latest observation up to it)
+
+    panel is a DataFrame or PanelIndex. economic_constraint is {country: score};
+    it is not in the panel and is held at the values published with the 2024 scores.
+    """
+    rows = latest_observations(panel, year)
+    if rows.empty:
+        return rows
+    rows = rows.rename(columns={'CountryName': 'Country', 'Year': 'Observed_Year'})
+
+    rows['Baseline_Gap'] = (SDG_TARGET - rows['Adult_Literacy_Rate']).clip(lower=0)
+    rows['Gender_Disparity'] = ((1 - rows['Gender_Parity_Index']) * 100).clip(lower=0)
+    rows['Rural_Urban_Divide'] = rows['Rural_Urban_Gap']
+    rows['Economic_Constraint'] = rows['Country'].map(economic_constraint)
+    rows['Quality_Deficit'] = 100 - rows['Learning_Quality_Index']
+    rows['Conflict_Multiplier'] = rows['Conflict_Status'].map(CONFLICT_MULTIPLIERS)
+
+    components = rows[list(AALNI_WEIGHTS)].to_numpy(dtype=float)
+    rows['Base_Score'] = components @ np.array(list(AALNI_WEIGHTS.values()))
+    rows['AALNI_Score'] = rows['Base_Score'] * rows['Conflict_Multiplier']
+    rows = rows.sort_values('AALNI_Score', ascending=False)
+    rows['Rank'] = np.arange(1, len(rows) + 1)
+    return rows.reset_index(drop=True)
+
+# ============================================================================
+# INVESTMENT NEED AND ALLOCATION
+# ============================================================================
+# Morocco's empirical model (see README: Evidence-Based Investment Calculation)
+PENETRATION = 0.438
+IMPROVEMENT_POINTS = 19.8
+COST_PER_POINT_USD = 1.86
+INFRASTRUCTURE_OVERHEAD = 1.15
+
+PHASE1_BUDGET_M = 950.0
+PHASE2_BUDGET_M = 357.5
+ME_RESERVE_M = 80.0
+
+
+def investment_need(scores, committed=None):
+    """Need in $M per country: beneficiaries x points x $/point x conflict multiplier
+
+    committed is an optional {country: $M} floor, e.g. maintenance budgets for high
+    performers that the formula would under-fund.
+    """
+    beneficiaries = scores['Illiterate_Population_Millions'] * PENETRATION
+    need = beneficiaries * IMPROVEMENT_POINTS * COST_PER_POINT_USD * scores['Conflict_Multiplier']
+    if committed:
+        need = np.maximum(need, scores['Country'].map(committed).fillna(0.0))
+    return pd.Series(need.to_numpy(), index=scores['Country'], name='Need_M')
+
+
+def allocate(scores, need, budget_m=PHASE1_BUDGET_M, reserve_m=ME_RESERVE_M):
+    """Phase 1 allocation: stable countries are funded in full (highest AALNI first),
+    conflict-affected countries share the remainder in proportion to need"""
+    available = max(budget_m - reserve_m, 0.0)
+    stable = scores.set_index('Country')['Conflict_Multiplier'] <= 1.0
+    order = scores.sort_values('AALNI_Score', ascending=False)['Country']
+    phase1 = pd.Series(0.0, index=need.index)
+
+    for country in order[stable.reindex(order).to_numpy()]:
+        phase1[country] = min(need[country], available)
+        available -= phase1[country]
+
+    conflict = need[~stable.reindex(need.index).to_numpy()]
+    if len(conflict) and conflict.sum() > 0:
+        phase1[conflict.index] = np.minimum(conflict, available * conflict / conflict.sum())
+
+    table = pd.DataFrame({'Need_M': need, 'Phase_1_Allocation_M': phase1})
+    table['Phase_2_Need_M'] = table['Need_M'] - table['Phase_1_Allocation_M']
+    table['Phase_1_Percent'] = 100 * table['Phase_1_Allocation_M'] / table['Need_M']
+    table = table.loc[order].reset_index().rename(columns={'index': 'Country'})
+    return table, {'budget_m': budget_m, 'reserve_m': reserve_m,
+                   'allocated_m': float(table['Phase_1_Allocation_M'].sum()),
+                   'total_need_m': float(table['Need_M'].sum() * INFRASTRUCTURE_OVERHEAD)}
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+def evaluate_scenario(scores, need, projections, conflict_model, budget_m=PHASE1_BUDGET_M,
+                      phase2_budget_m=PHASE2_BUDGET_M, reserve_m=ME_RESERVE_M,
+                      escalation=1.0, de_escalation=1.0, sustained=1):
+    """Allocation, Phase 2 trigger outlook and expected 2030 literacy for one scenario
+
+    Phase 2 starts in year 4 if the conflict trigger was met by the end of Phase 1
+    and is funded in proportion to phase2_budget_m over the remaining need.
+    """
+    allocation, totals = allocate(scores, need, budget_m, reserve_m)
+    phase2_need = allocation['Phase_2_Need_M'].sum()
+    coverage = min(phase2_budget_m / phase2_need, 1.0) if phase2_need > 0 else 1.0
+
+    transition = adjust_transitions(conflict_model.transition, escalation, de_escalation)
+    outlook = conflict_model.trigger_summary(years=6, transition=transition, sustained=sustained)
+    by_year = outlook['by_year']
+    p_trigger = float(by_year['Cumulative_Probability'].iloc[2])
+
+    phase1_only = projections[projections['Scenario'].isin(['Phase 1 Only', 'Phase 1', 'Baseline'])]
+    with_phase2 = projections[projections['Scenario'] == 'Phase 1 + Phase 2'].set_index('Country')
+    expected = phase1_only.set_index('Country')['Projected_2030'].copy()
+    for country, projected in with_phase2['Projected_2030'].items():
+        expected[country] += p_trigger * coverage * (projected - expected[country])
+
+    return {
+        'allocation': allocation,
+        'totals': dict(totals, phase2_budget_m=phase2_budget_m, phase2_coverage=coverage),
+        'phase2_trigger': {
+            'probability_by_year_3': p_trigger,
+            'probability_by_year_6': float(by_year['Cumulative_Probability'].iloc[5]),
+            'expected_year': outlook['expected_year'],
+        },
+        'expected_2030': pd.DataFrame({'Country': expected.index, 'Expected_2030': expected.to_numpy(),
+                                       'Achieves_SDG': expected.to_numpy() >= SDG_TARGET}),
+    }
@@ -0,0 +1,264 @@
+"""
+JSON API for the Abraham Accords Literacy Dashboard
+ASGI service exposing AALNI scores, allocations, scenarios, projections and cost
+rankings from the same datasets and computations as the dashboard. Every response
+carries an ETag derived from the dataset version, so unchanged data is answered
+with 304 Not Modified, and rendered bodies are cached per data version.
+
+Usage:
+    uvicorn api:app --port 8000 [--workers 4]
+
+Endpoints (GET):
+    /api/v1/version
+    /api/v1/scores?year=2024          AALNI as of a year (default: latest)
+    /api/v1/scores/years
+    /api/v1/allocation?budget=950&reserve=80
+    /api/v1/scenario?budget=950&phase2_budget=357.5&escalation=1&de_escalation=1&sustained=1
+    /api/v1/projections
+    /api/v1/cost-rankings
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+
+import numpy as np
+import orjson
+
+from analytics import (ME_RESERVE_M, PHASE1_BUDGET_M, PHASE2_BUDGET_M, aalni_scores, allocate,
+                       available_years, evaluate_scenario, investment_need)
+from versioning import get_store
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/v1'
+REFRESH_INTERVAL = 1.0
+RESPONSE_CACHE_SIZE = 1024
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+class ApiError(Exception):
+    """Client error, returned as {"error": message} with the given status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+# ============================================================================
+# PARAMETERS
+# ============================================================================
+def _number(params, name, default, minimum=None, maximum=None, cast=float):
+    if name not in params:
+        return default
+    try:
+        value = cast(params[name])
+    except ValueError:
+        raise ApiError(400, f"{name} must be a number") from None
+    if not np.isfinite(value) or (minimum is not None and value < minimum) \
+            or (maximum is not None and value > maximum):
+        raise ApiError(400, f"{name} must be between {minimum} and {maximum}")
+    return value
+
+
+def _reserve(params, budget):
+    """M&E reserve in $M, never more than the budget (the default is capped at it)"""
+    return _number(params, 'reserve', min(ME_RESERVE_M, budget), minimum=0, maximum=budget)
+
+
+def _records(frame):
+    """DataFrame as a list of row dicts (NaN becomes null)"""
+    # float32 snapshot columns go through their shortest repr, so 96.3 is not sent as 96.30000305
+    narrow = frame.select_dtypes(include='float32').columns
+    if len(narrow):
+        frame = frame.astype({col: 'float64' for col in narrow})
+        frame[narrow] = frame[narrow].to_numpy(dtype=np.float32).astype(str).astype(np.float64)
+    return frame.replace({np.nan: None}).to_dict('records')
+
+# ============================================================================
+# ENDPOINTS
+# ============================================================================
+def _economic_constraint(store, snapshot):
+    published = store.get('aalni_scores', snapshot)
+    return dict(zip(published['CountryName'], published['Economic_Constraint']))
+
+
+def _scores(store, snapshot, params):
+    index = store.get('panel_index', snapshot)
+    years = available_years(index)
+    year = _number(params, 'year', years[-1], minimum=years[0], maximum=9999, cast=int)
+    return aalni_scores(index, year, _economic_constraint(store, snapshot))
+
+
+def _need(store, snapshot, scores):
+    # The dashboard's maintenance budgets for high performers act as a floor
+    committed = store.get('aalni_data', snapshot)
+    return investment_need(scores, dict(zip(committed['Country'], committed['Total_Need_M'])))
+
+
+def get_version(store, snapshot, params):
+    return {'version': snapshot.version, 'artifacts': snapshot.versions}
+
+
+def get_scores(store, snapshot, params):
+    scores = _scores(store, snapshot, params)
+    return {'as_of_year': int(scores['Observed_Year'].max()), 'scores': _records(scores)}
+
+
+def get_score_years(store, snapshot, params):
+    return {'years': available_years(store.get('panel_index', snapshot))}
+
+
+def get_allocation(store, snapshot, params):
+    budget = _number(params, 'budget', PHASE1_BUDGET_M, minimum=0, maximum=1e6)
+    reserve = _reserve(params, budget)
+    scores = _scores(store, snapshot, params)
+    table, totals = allocate(scores, _need(store, snapshot, scores), budget, reserve)
+    return {'totals': totals, 'allocation': _records(table)}
+
+
+def get_scenario(store, snapshot, params):
+    budget = _number(params, 'budget', PHASE1_BUDGET_M, minimum=0, maximum=1e6)
+    scores = _scores(store, snapshot, params)
+    result = evaluate_scenario(
+        scores, _need(store, snapshot, scores), store.get('projections_2030', snapshot),
+        store.get('sudan_conflict_model', snapshot),
+        budget_m=budget,
+        phase2_budget_m=_number(params, 'phase2_budget', PHASE2_BUDGET_M, minimum=0, maximum=1e6),
+        reserve_m=_reserve(params, budget),
+        escalation=_number(params, 'escalation', 1.0, minimum=0, maximum=10),
+        de_escalation=_number(params, 'de_escalation', 1.0, minimum=0, maximum=10),
+        sustained=_number(params, 'sustained', 1, minimum=1, maximum=6, cast=int),
+    )
+    return {'totals': result['totals'], 'phase2_trigger': result['phase2_trigger'],
+            'allocation': _records(result['allocation']), 'expected_2030': _records(result['expected_2030'])}
+
+
+def get_projections(store, snapshot, params):
+    return {'forecast': _records(store.get('forecast', snapshot)),
+            'scenarios': _records(store.get('projections_2030', snapshot))}
+
+
+def get_cost_rankings(store, snapshot, params):
+    return {'rankings': _records(store.get('cost_rankings', snapshot))}
+
+
+ROUTES = {
+    f"{API_PREFIX}/version": get_version,
+    f"{API_PREFIX}/scores": get_scores,
+    f"{API_PREFIX}/scores/years": get_score_years,
+    f"{API_PREFIX}/allocation": get_allocation,
+    f"{API_PREFIX}/scenario": get_scenario,
+    f"{API_PREFIX}/projections": get_projections,
+    f"{API_PREFIX}/cost-rankings": get_cost_rankings,
+}
+
+# ============================================================================
+# ASGI APPLICATION
+# ============================================================================
+class DashboardApi:
+    """Minimal ASGI app: GET-only JSON routes with version-keyed ETags and body cache"""
+
+    def __init__(self, routes=ROUTES, store_factory=get_store):
+        self.routes = routes
+        self.store_factory = store_factory
+        self._store = None
+        self._last_refresh = 0.0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def current_store(self):
+        """The store, refreshed at most once per interval; loading and refreshing (file
+        stats, and a reload when data changed) run in a worker thread, off the event loop"""
+        loop = asyncio.get_running_loop()
+        if self._store is None:
+            self._store = await loop.run_in_executor(None, self.store_factory)
+        now = time.monotonic()
+        if now - self._last_refresh > REFRESH_INTERVAL:
+            self._last_refresh = now
+            await loop.run_in_executor(None, self._store.refresh)
+        return self._store
+
+    def _cached(self, key):
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            return cached
+
+    def _render(self, key, snapshot):
+        """(etag, body) for one (version, path, query) key"""
+        _, path, query = key
+        body = orjson.dumps(self.routes[path](self._store, snapshot, dict(parse_qsl(query))),
+                            option=JSON_OPTIONS)
+        etag = '"' + hashlib.sha1(f"{snapshot.version}|{path}?{query}".encode()).hexdigest()[:20] + '"'
+        with self._lock:
+            self._cache[key] = (etag, body)
+            while len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return etag, body
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        path = scope['path'].rstrip('/') or '/'
+        query = scope['query_string'].decode('latin-1')
+        headers = dict(scope['headers'])
+
+        if scope['method'] not in ('GET', 'HEAD'):
+            await self._send(send, 405, orjson.dumps({'error': 'method not allowed'}), [(b'allow', b'GET, HEAD')])
+            return
+        if path not in self.routes:
+            await self._send(send, 404, orjson.dumps({'error': f"no route {path}"}))
+            return
+
+        snapshot = (await self.current_store()).snapshot
+        key = (snapshot.version, path, '&'.join(sorted(query.split('&'))) if query else '')
+        try:
+            cached = self._cached(key)
+            if cached is None:
+                # Computations can take tens of milliseconds; keep the event loop free
+                cached = await asyncio.get_running_loop().run_in_executor(None, self._render, key, snapshot)
+            etag, body = cached
+        except ApiError as exc:
+            await self._send(send, exc.status, orjson.dumps({'error': exc.message}))
+            return
+        except Exception:
+            logger.exception("Error serving %s?%s", path, query)
+            await self._send(send, 500, orjson.dumps({'error': 'internal error'}))
+            return
+
+        extra = [(b'etag', etag.encode()), (b'cache-control', b'no-cache'),
+                 (b'x-data-version', snapshot.version.encode())]
+        if etag in headers.get(b'if-none-match', b'').decode('latin-1'):
+            await self._send(send, 304, b'', extra)
+        else:
+            await self._send(send, 200, b'' if scope['method'] == 'HEAD' else body, extra)
+
+    async def _send(self, send, status, body, extra_headers=()):
+        headers = [(b'content-type', b'application/json'),
+                   (b'content-length', str(len(body)).encode())] + list(extra_headers)
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Load the datasets before accepting requests
+                await self.current_store()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+app = DashboardApi()
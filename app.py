@@ -6,14 +6,12 @@ Deploy to: Hugging Face Spaces
 """
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime
 
 # Import pages module
-from pages_content import render_page
+from pages_content import fragment, render_page
+from dashboard_data import FRAME_NAMES
+from versioning import get_store
+from warmup import SESSION_MODELS, warm_up_in_background
 
 # ============================================================================
 # PAGE CONFIG
@@ -73,82 +71,40 @@ st.markdown("""
 # DATA PREPARATION
 # ============================================================================
 
-@st.cache_data
-def load_data():
-    """Load and prepare all datasets with updated calculations"""
-    
-    # AALNI Rankings Data (Updated)
-    aalni_data = pd.DataFrame({
-        'Country': ['Sudan', 'Morocco', 'Israel', 'UAE', 'Bahrain'],
-        'AALNI_Score': [115.7, 24.5, 2.0, 1.8, 1.5],
-        'Adult_Literacy_Rate': [57.0, 72.1, 97.8, 96.3, 97.5],
-        'Gender_Parity_Index': [0.69, 0.81, 0.99, 0.99, 0.99],
-        'Rural_Urban_Gap': [30.0, 25.8, 2.5, 3.0, 2.0],
-        'Conflict_Status': ['Severe_Conflict', 'Stable', 'Stable', 'Stable', 'Stable'],
-        'Phase_1_Allocation_M': [700.0, 135.3, 15.0, 12.0, 8.0],
-        'Phase_2_Allocation_M': [266.6, 0.0, 0.0, 0.0, 0.0],
-        'Total_Need_M': [966.6, 135.3, 15.0, 12.0, 8.0],
-        'Phase_1_Percent': [72.4, 100.0, 100.0, 100.0, 100.0]
-    })
-    
-    # Morocco Timeline Data (Updated with Phase 1 projection)
-    morocco_timeline = pd.DataFrame({
-        'Year': [2008, 2010, 2012, 2014, 2016, 2018, 2020, 2022, 2024, 2026, 2028, 2030],
-        'Literacy_Rate': [39.6, 43.2, 45.9, 47.7, 57.7, 63.1, 67.8, 69.4, 72.1, 78.5, 85.0, 95.0],
-        'Type': ['Actual', 'Actual', 'Actual', 'Actual', 'Actual', 'Actual', 'Actual', 
-                'Actual', 'Actual', 'Projected', 'Projected', 'Projected'],
-        'Phase': ['Pre-intervention', 'Pre-intervention', 'Pre-intervention', 'Intervention Start',
-                 'Phase 1', 'Phase 1', 'Phase 1', 'Phase 1', 'Phase 1', 
-                 'Phase 1', 'Phase 1 Complete', 'SDG Achieved']
-    })
-    
-    # Cost-Effectiveness Data (Updated with $1.86 efficiency)
-    cost_effectiveness = pd.DataFrame({
-        'Program': ['UAE Compulsory\nEducation', 'Morocco National\nProgram', 
-                   'Bahrain Workplace\nMandate', 'Israel Ulpan\nMethod', 
-                   'UAE National\nStrategy'],
-        'Country': ['UAE', 'Morocco', 'Bahrain', 'Israel', 'UAE'],
-        'Cost_Per_Point': [0.53, 1.86, 3.37, 28.31, 150.0],
-        'Literacy_Improvement': [42.0, 19.8, 12.5, 12.8, 0.5],
-        'Duration_Years': [49, 10, 34, 75, 8],
-        'Cost_Per_Person': [22.4, 36.74, 42.15, 362.33, 75.0],
-        'Beneficiaries_M': [8.2, 8.46, 0.85, 0.12, 0.05]
-    })
-    
-    # Feature Importance Data (88.9% Rule)
-    feature_importance = pd.DataFrame({
-        'Feature': ['Secondary\nEnrollment', 'Gender\nParity', 'Learning\nQuality', 
-                   'Rural-Urban\nGap', 'Out-of-School\nChildren', 'Primary\nEnrollment',
-                   'Year', 'Conflict\nSeverity', 'Investment\nAmount'],
-        'Importance': [26.3, 18.5, 16.7, 14.7, 12.8, 2.6, 2.6, 2.2, 1.6],
-        'Category': ['Systemic', 'Systemic', 'Systemic', 'Systemic', 'Systemic',
-                    'Infrastructure', 'Temporal', 'Context', 'Financial']
-    })
-    
-    # 2030 Projections Data (Updated with scenario-based outcomes)
-    projections_2030 = pd.DataFrame({
-        'Country': ['Sudan', 'Sudan', 'Morocco', 'Israel', 'UAE', 'Bahrain'],
-        'Scenario': ['Phase 1 Only', 'Phase 1 + Phase 2', 'Phase 1', 'Baseline', 'Baseline', 'Baseline'],
-        'Current_2024': [57.0, 57.0, 72.1, 97.8, 96.3, 97.5],
-        'Projected_2030': [57.0, 87.5, 95.0, 98.0, 98.9, 97.4],
-        'Gap_to_SDG': [38.0, 7.5, 0.0, 0.0, 0.0, 0.0],
-        'Status': ['Stabilized', 'Substantial Progress', 'SDG Achieved', 'Maintained', 'Maintained', 'Maintained'],
-        'Investment_M': [700.0, 966.6, 135.3, 15.0, 12.0, 8.0]
-    })
-    
-    # Sudan Conflict Impact Data
-    sudan_conflict = pd.DataFrame({
-        'Year': [2014, 2016, 2018, 2019, 2020, 2022, 2024, 2026, 2028, 2030],
-        'Literacy_Rate': [60.7, 60.5, 60.7, 60.0, 59.0, 59.0, 57.0, 57.0, 57.0, 57.0],
-        'Conflict_Intensity': [0, 0, 1, 2, 3, 5, 8, 6, 4, 2],
-        'Type': ['Actual', 'Actual', 'Actual', 'Actual', 'Actual', 'Actual', 
-                'Actual', 'Phase 1 Proj.', 'Phase 1 Proj.', 'Phase 2 Proj.']
-    })
-    
-    return aalni_data, morocco_timeline, cost_effectiveness, feature_importance, projections_2030, sudan_conflict
+@st.cache_data(max_entries=2 * len(FRAME_NAMES))
+def load_frame(name, artifact_version, _snapshot):
+    """One dashboard frame, cached per version of its own file, so a data change
+    only re-keys the frames whose files changed"""
+    return get_store().get(name, _snapshot)
+
+def session_data(store):
+    """This session's frames and models, fetched again only when the data version changes
+
+    Kept in session state so a rerun does not pay st.cache_data's copy of every frame.
+    """
+    snapshot = store.snapshot
+    cached = st.session_state.get('dashboard_data')
+    if cached is None or cached['version'] != snapshot.version:
+        cached = st.session_state['dashboard_data'] = {
+            'version': snapshot.version,
+            'frames': tuple(load_frame(name, snapshot.versions[name], snapshot) for name in FRAME_NAMES),
+            'models': {name: store.get(name, snapshot) for name in SESSION_MODELS},
+        }
+    return cached
+
+@st.cache_resource
+def start_warm_up():
+    """Pre-build page figures in the background once per process (cache hits after warmup.py)"""
+    return warm_up_in_background()
+
+start_warm_up()
+
+# Pick up changed files under data/ and results/ without restarting (stat-only when unchanged)
+data_store = get_store()
+data_store.refresh()
 
 # Load data
-aalni_data, morocco_timeline, cost_effectiveness, feature_importance, projections_2030, sudan_conflict = load_data()
+dashboard_data = session_data(data_store)
 
 # ============================================================================
 # HEADER
@@ -168,7 +124,7 @@ page = st.sidebar.radio(
     "Select View:",
     ["Executive Summary", "AALNI Rankings", "Morocco Case Study", 
      "Sudan Conflict Analysis", "Cost-Effectiveness", "Feature Importance (88.9% Rule)", 
-     "2030 Projections", "Policy Recommendations"]
+     "2030 Projections", "Policy Recommendations", "Data Explorer"]
 )
 
 st.sidebar.markdown("---")
@@ -194,6 +150,8 @@ st.sidebar.info("""
 """)
 
 st.sidebar.markdown("---")
+st.sidebar.caption(f"Data version: {data_store.version}")
+
 st.sidebar.markdown("""
 ### Partners
 - Peblink
@@ -205,8 +163,13 @@ st.sidebar.markdown("""
 # ============================================================================
 # RENDER SELECTED PAGE
 # ============================================================================
-render_page(page, aalni_data, morocco_timeline, cost_effectiveness, 
-           feature_importance, projections_2030, sudan_conflict)
+# Widgets on a page rerun only the page fragment, not the CSS, header, sidebar and footer
+@fragment
+def render_page_fragment(page, data):
+    models = data['models']
+    render_page(page, *data['frames'], models['cube'], models['sudan_conflict_model'])
+
+render_page_fragment(page, dashboard_data)
 
 # ============================================================================
 # FOOTER
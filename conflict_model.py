@@ -0,0 +1,185 @@
+"""
+Conflict-trajectory model for the Abraham Accords Literacy Dashboard
+Markov regime-switching model fitted from the panel's Conflict_Status history.
+Simulates many conflict-intensity paths at once (vectorized over paths) and
+reports when a Phase 2 trigger such as "conflict severity <= 2.0" is first met.
+"""
+
+import numpy as np
+import pandas as pd
+
+from panel_index import PanelIndex
+
+REGIMES = ['Stable', 'Unstable', 'Conflict', 'Severe_Conflict']
+
+# Intensity (0-10 scale) per regime when no observed intensity is available to fit it
+DEFAULT_INTENSITY = {
+    'Stable': (0.5, 0.5),
+    'Unstable': (1.5, 0.75),
+    'Conflict': (4.5, 1.0),
+    'Severe_Conflict': (8.0, 1.0),
+}
+
+PHASE2_THRESHOLD = 2.0
+
+# ============================================================================
+# FITTING
+# ============================================================================
+def regime_history(panel, country):
+    """Annual regime sequence for one country (CountryID or CountryName)
+
+    panel is a DataFrame or PanelIndex. Rows sharing a date keep the most severe
+    status, and a status carries forward until the next observation.
+    """
+    index = PanelIndex.of(panel)
+    if country not in index:
+        raise ValueError(f"No panel rows for {country!r}")
+    rows = index.rows(country)
+
+    codes = rows['Conflict_Status'].map({regime: idx for idx, regime in enumerate(REGIMES)})
+    years = pd.to_datetime(rows['Date']).dt.year
+    by_year = codes.groupby(years).max()
+    annual = by_year.reindex(range(by_year.index.min(), by_year.index.max() + 1)).ffill()
+    return annual.astype(int)
+
+
+def fit_transition_matrix(states, n_regimes=len(REGIMES), stay_prior=2.0, move_prior=0.25):
+    """Row-stochastic transition matrix from transition counts plus a Dirichlet prior
+
+    The prior keeps regimes that were never left (or never seen) persistent, and
+    favours moving one regime at a time over jumps.
+    """
+    states = np.asarray(states)
+    counts = np.zeros((n_regimes, n_regimes))
+    np.add.at(counts, (states[:-1], states[1:]), 1)
+    distance = np.abs(np.subtract.outer(np.arange(n_regimes), np.arange(n_regimes)))
+    counts += np.where(distance == 0, stay_prior, move_prior / np.maximum(distance, 1) ** 2)
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def fit_intensity_levels(history, observed_intensity=None):
+    """(mean, std) intensity per regime, from observed {year: intensity} where available"""
+    levels = np.array([DEFAULT_INTENSITY[regime] for regime in REGIMES], dtype=float)
+    if observed_intensity is None:
+        return levels
+
+    observed = pd.Series(observed_intensity, dtype=float)
+    aligned = pd.DataFrame({'regime': history.reindex(observed.index), 'intensity': observed}).dropna()
+    for code, group in aligned.groupby('regime')['intensity']:
+        levels[int(code), 0] = group.mean()
+        if len(group) > 1:
+            levels[int(code), 1] = max(group.std(), 0.25)
+    return levels
+
+
+def observed_intensity(conflict_frame):
+    """{year: intensity} from the actual (non-projected) rows of a dashboard conflict frame"""
+    actual = conflict_frame[conflict_frame['Type'] == 'Actual']
+    return dict(zip(actual['Year'], actual['Conflict_Intensity']))
+
+
+def adjust_transitions(transition, escalation=1.0, de_escalation=1.0):
+    """Scale the probability of moving to worse / better regimes and renormalize"""
+    upper = np.triu(np.ones_like(transition, dtype=bool), k=1)
+    lower = np.tril(np.ones_like(transition, dtype=bool), k=-1)
+    moves = transition * np.where(upper, escalation, 1.0) * np.where(lower, de_escalation, 1.0)
+    np.fill_diagonal(moves, 0.0)
+
+    # The stay probability absorbs the change; rows whose moves exceed 1 are rescaled
+    moves /= np.maximum(moves.sum(axis=1), 1.0)[:, None]
+    adjusted = moves.copy()
+    # Clipped so rounding cannot leave a slightly negative stay probability
+    np.fill_diagonal(adjusted, np.maximum(1.0 - moves.sum(axis=1), 0.0))
+    return adjusted
+
+# ============================================================================
+# MODEL
+# ============================================================================
+class RegimeSwitchingModel:
+    """Markov regime-switching conflict model for one country"""
+
+    def __init__(self, transition, intensity_levels, start_regime, start_year,
+                 persistence=0.5, country=None):
+        self.transition = np.asarray(transition, dtype=float)
+        self.intensity_levels = np.asarray(intensity_levels, dtype=float)
+        self.start_regime = int(start_regime)
+        self.start_year = int(start_year)
+        self.persistence = persistence
+        self.country = country
+
+    @classmethod
+    def from_panel(cls, panel, country, observed_intensity=None, **prior):
+        history = regime_history(panel, country)
+        return cls(fit_transition_matrix(history.to_numpy(), **prior),
+                   fit_intensity_levels(history, observed_intensity),
+                   start_regime=history.iloc[-1], start_year=history.index[-1], country=country)
+
+    def transition_table(self, transition=None):
+        transition = self.transition if transition is None else transition
+        return pd.DataFrame(transition, index=pd.Index(REGIMES, name='From'), columns=REGIMES)
+
+    def simulate(self, years=10, n_paths=10000, transition=None, seed=0):
+        """Regime and intensity paths, each shaped (n_paths, years)
+
+        Column 0 is the first simulated year (start_year + 1). Intensity is the
+        regime mean plus AR(1) noise, clipped to the 0-10 scale.
+        """
+        transition = self.transition if transition is None else np.asarray(transition, dtype=float)
+        rng = np.random.default_rng(seed)
+        cumulative = np.cumsum(transition, axis=1)
+        cumulative[:, -1] = 1.0
+
+        regimes = np.empty((n_paths, years), dtype=np.int8)
+        state = np.full(n_paths, self.start_regime, dtype=np.int64)
+        draws = rng.random((n_paths, years))
+        for step in range(years):
+            # Inverse-CDF draw for every path at once
+            state = (draws[:, step, None] > cumulative[state]).sum(axis=1)
+            regimes[:, step] = state
+
+        shocks = rng.standard_normal((n_paths, years)) * self.intensity_levels[regimes, 1]
+        noise = np.empty_like(shocks)
+        noise[:, 0] = shocks[:, 0]
+        for step in range(1, years):
+            noise[:, step] = self.persistence * noise[:, step - 1] + shocks[:, step]
+        intensity = np.clip(self.intensity_levels[regimes, 0] + noise, 0.0, 10.0)
+        return regimes, intensity
+
+    def trigger_times(self, intensity, threshold=PHASE2_THRESHOLD, sustained=1):
+        """First simulated year index at which intensity has been <= threshold for
+        `sustained` consecutive years; -1 where it never happens"""
+        below = (intensity <= threshold).astype(np.int32)
+        if sustained > 1:
+            running = np.cumsum(below, axis=1)
+            window = running.copy()
+            window[:, sustained:] -= running[:, :-sustained]
+            met = window >= sustained
+        else:
+            met = below.astype(bool)
+        return np.where(met.any(axis=1), met.argmax(axis=1), -1)
+
+    def trigger_summary(self, years=10, n_paths=10000, transition=None, threshold=PHASE2_THRESHOLD,
+                        sustained=1, seed=0):
+        """Probability and timing of the Phase 2 trigger across simulated paths"""
+        regimes, intensity = self.simulate(years, n_paths, transition, seed)
+        first = self.trigger_times(intensity, threshold, sustained)
+        triggered = first >= 0
+        calendar = np.arange(self.start_year + 1, self.start_year + 1 + years)
+
+        by_year = pd.DataFrame({
+            'Year': calendar,
+            'Cumulative_Probability': np.bincount(first[triggered], minlength=years).cumsum() / n_paths,
+            'Intensity_P10': np.percentile(intensity, 10, axis=0),
+            'Intensity_Median': np.median(intensity, axis=0),
+            'Intensity_P90': np.percentile(intensity, 90, axis=0),
+        })
+        trigger_years = calendar[first[triggered]]
+        return {
+            'probability': triggered.mean(),
+            'expected_year': trigger_years.mean() if triggered.any() else None,
+            'median_year': float(np.median(trigger_years)) if triggered.any() else None,
+            'by_year': by_year,
+            'regime_shares': pd.DataFrame(
+                np.stack([(regimes == code).mean(axis=0) for code in range(len(REGIMES))], axis=1),
+                index=pd.Index(calendar, name='Year'), columns=REGIMES),
+        }
@@ -0,0 +1,179 @@
+"""
+Precomputed aggregate cube for the Abraham Accords Literacy Dashboard
+Aggregates the panel once into country x year x indicator arrays (sum / count /
+last) over the years the panel actually observes, with the sparsely filled
+quarter level kept only for occupied cells, so interactive filters are answered
+by array indexing instead of a pandas group-by per rerun.
+"""
+
+import numpy as np
+import pandas as pd
+
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+STATS = ['mean', 'sum', 'last']
+
+# Identifier-like numeric columns that are not indicators
+NON_INDICATOR_COLUMNS = ['Year', 'Year_Numeric']
+
+
+def panel_indicators(panel):
+    """Numeric (non-boolean) panel columns that can be aggregated"""
+    return [col for col in panel.columns
+            if col not in NON_INDICATOR_COLUMNS
+            and pd.api.types.is_numeric_dtype(panel[col])
+            and not pd.api.types.is_bool_dtype(panel[col])]
+
+
+def _aggregate(cells, n_cells, values, date_order):
+    """sum / count / last per cell code, as (n_cells, n_indicators) arrays"""
+    n_indicators = values.shape[1]
+    sums = np.zeros((n_cells, n_indicators), dtype=np.float32)
+    counts = np.zeros((n_cells, n_indicators), dtype=np.int32)
+    last = np.full((n_cells, n_indicators), np.nan, dtype=np.float32)
+
+    for idx in range(n_indicators):
+        column = values[:, idx]
+        valid = ~np.isnan(column)
+        sums[:, idx] = np.bincount(cells[valid], weights=column[valid], minlength=n_cells)
+        counts[:, idx] = np.bincount(cells[valid], minlength=n_cells)
+
+        # Latest observation per cell: first occurrence when scanning newest-first
+        ordered = date_order[valid[date_order]][::-1]
+        latest_cells, first = np.unique(cells[ordered], return_index=True)
+        last[latest_cells, idx] = column[ordered[first]]
+
+    return sums, counts, last
+
+
+class IndicatorCube:
+    """Aggregates over (country, year, indicator), plus quarters for occupied cells
+
+    Only years present in the panel get a slot, and year prefix sums make any
+    year-range total O(1) per cell. Quarter-level aggregates are stored for the
+    (country, year, quarter) cells that have rows, not as a dense axis. Values are
+    float32 to keep subnational-scale cubes in memory.
+    """
+
+    def __init__(self, panel, indicators=None, country_col='CountryName', date_col='Date'):
+        self.indicators = list(indicators or panel_indicators(panel))
+        self.indicator_index = {name: idx for idx, name in enumerate(self.indicators)}
+
+        country_codes, countries = pd.factorize(panel[country_col], sort=True)
+        self.countries = list(countries)
+        self.country_index = {country: idx for idx, country in enumerate(self.countries)}
+
+        dates = pd.to_datetime(panel[date_col])
+        years, year_codes = np.unique(dates.dt.year.to_numpy(), return_inverse=True)
+        self.years = years.tolist()
+        quarter_codes = dates.dt.quarter.to_numpy() - 1
+        date_order = np.argsort(dates.to_numpy(), kind='stable')
+        values = panel[self.indicators].to_numpy(dtype=float)
+
+        shape = (len(self.countries), len(self.years))
+        year_cells = np.ravel_multi_index((country_codes, year_codes), shape)
+        year_sum, year_count, year_last = _aggregate(year_cells, int(np.prod(shape)), values, date_order)
+        self.year_sum = year_sum.reshape(shape + (-1,))
+        self.year_count = year_count.reshape(shape + (-1,))
+        self.year_last = year_last.reshape(shape + (-1,))
+
+        # Prefix sums along years: range totals are prefix[y1] - prefix[y0] for positions y0:y1
+        pad = ((0, 0), (1, 0), (0, 0))
+        self.prefix_sum = np.pad(np.cumsum(self.year_sum, axis=1, dtype=np.float64), pad)
+        self.prefix_count = np.pad(np.cumsum(self.year_count, axis=1, dtype=np.int32), pad)
+
+        # Quarter level, over occupied (country, year, quarter) cells only
+        quarter_cells, quarter_codes_of_rows = np.unique(year_cells * len(QUARTERS) + quarter_codes,
+                                                         return_inverse=True)
+        self.quarter_cells = np.stack(np.unravel_index(quarter_cells, shape + (len(QUARTERS),)), axis=1)
+        self.quarter_sum, self.quarter_count, self.quarter_last = _aggregate(
+            quarter_codes_of_rows.reshape(-1), len(quarter_cells), values, date_order)
+
+    @property
+    def nbytes(self):
+        """Memory held by the aggregate arrays"""
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+    def _positions(self, countries, year_range, indicators):
+        """Country and indicator indexes, plus the slice of observed years in year_range"""
+        countries = self.countries if countries is None else list(countries)
+        indicators = self.indicators if indicators is None else list(indicators)
+        first, last = year_range or (self.years[0], self.years[-1])
+        years = slice(int(np.searchsorted(self.years, int(first), side='left')),
+                      int(np.searchsorted(self.years, int(last), side='right')))
+        return (countries, np.array([self.country_index[c] for c in countries], dtype=np.intp),
+                years, indicators, np.array([self.indicator_index[i] for i in indicators], dtype=np.intp))
+
+    def series(self, countries=None, year_range=None, indicators=None, stat='mean'):
+        """Per-year values as a long frame (Country, Year, Indicator, Value)"""
+        countries, c_idx, years, indicators, i_idx = self._positions(countries, year_range, indicators)
+
+        if stat == 'last':
+            block = self.year_last[c_idx, years][:, :, i_idx].astype(np.float64)
+        else:
+            block = self.year_sum[c_idx, years][:, :, i_idx].astype(np.float64)
+            if stat == 'mean':
+                counts = self.year_count[c_idx, years][:, :, i_idx]
+                block = np.divide(block, counts, out=np.full(block.shape, np.nan), where=counts > 0)
+            else:
+                block[self.year_count[c_idx, years][:, :, i_idx] == 0] = np.nan
+
+        n_c, n_y, n_i = block.shape
+        result = pd.DataFrame({
+            'Country': np.repeat(countries, n_y * n_i),
+            'Year': np.tile(np.repeat(self.years[years], n_i), n_c),
+            'Indicator': np.tile(indicators, n_c * n_y),
+            'Value': block.reshape(-1),
+        })
+        return result.dropna(subset=['Value']).reset_index(drop=True)
+
+    def quarterly(self, countries=None, year_range=None, indicators=None, stat='mean'):
+        """Per-quarter values as a long frame (Country, Year, Quarter, Indicator, Value)"""
+        countries, c_idx, years, indicators, i_idx = self._positions(countries, year_range, indicators)
+        country_codes, year_codes, quarter_codes = self.quarter_cells.T
+        selected = np.flatnonzero(np.isin(country_codes, c_idx)
+                                  & (year_codes >= years.start) & (year_codes < years.stop))
+
+        if stat == 'last':
+            block = self.quarter_last[selected][:, i_idx].astype(np.float64)
+        else:
+            block = self.quarter_sum[selected][:, i_idx].astype(np.float64)
+            counts = self.quarter_count[selected][:, i_idx]
+            if stat == 'mean':
+                block = np.divide(block, counts, out=np.full(block.shape, np.nan), where=counts > 0)
+            else:
+                block[counts == 0] = np.nan
+
+        n_i = len(indicators)
+        result = pd.DataFrame({
+            'Country': np.repeat(np.array(self.countries, dtype=object)[country_codes[selected]], n_i),
+            'Year': np.repeat(np.asarray(self.years)[year_codes[selected]], n_i),
+            'Quarter': np.repeat(np.array(QUARTERS)[quarter_codes[selected]], n_i),
+            'Indicator': np.tile(indicators, len(selected)),
+            'Value': block.reshape(-1),
+        })
+        return result.dropna(subset=['Value']).reset_index(drop=True)
+
+    def totals(self, countries=None, year_range=None, indicators=None, stat='mean'):
+        """One value per (country, indicator) over the whole year range"""
+        countries, c_idx, years, indicators, i_idx = self._positions(countries, year_range, indicators)
+        y0, y1 = years.start, years.stop
+
+        if y1 <= y0:
+            block = np.full((len(c_idx), len(i_idx)), np.nan)
+        elif stat == 'last':
+            window = self.year_last[c_idx, y0:y1][:, :, i_idx]
+            has_value = ~np.isnan(window)
+            latest = window.shape[1] - 1 - np.argmax(has_value[:, ::-1, :], axis=1)
+            block = np.take_along_axis(window, latest[:, None, :], axis=1)[:, 0, :].astype(np.float64)
+        else:
+            sums = (self.prefix_sum[c_idx, y1] - self.prefix_sum[c_idx, y0])[:, i_idx]
+            counts = (self.prefix_count[c_idx, y1] - self.prefix_count[c_idx, y0])[:, i_idx]
+            if stat == 'mean':
+                block = np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+            else:
+                block = np.where(counts > 0, sums, np.nan)
+
+        return pd.DataFrame(block, index=pd.Index(countries, name='Country'), columns=indicators)
@@ -0,0 +1,33 @@
+"""
+Dashboard datasets for the Abraham Accords Literacy Dashboard
+Reads the curated frames rendered by the dashboard pages from data/dashboard/,
+independent of Streamlit so that validation, warm-up and batch jobs can reuse them.
+Each frame is its own versioned file, so editing one only invalidates what
+depends on it.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent
+
+# Order matches the tuple returned by build_dashboard_frames / app.session_data
+FRAME_NAMES = ('aalni_data', 'morocco_timeline', 'cost_effectiveness',
+               'feature_importance', 'projections_2030', 'sudan_conflict')
+
+FRAME_FILES = {name: f"data/dashboard/{name}.csv" for name in FRAME_NAMES}
+
+
+def read_dashboard_frame(name, root=ROOT):
+    return pd.read_csv(Path(root) / FRAME_FILES[name])
+
+
+def build_dashboard_frames(root=ROOT):
+    """All dashboard datasets, in FRAME_NAMES order"""
+    return tuple(read_dashboard_frame(name, root) for name in FRAME_NAMES)
+
+
+def dashboard_frames_by_name(root=ROOT):
+    """Dashboard datasets keyed by their FRAME_NAMES entry"""
+    return dict(zip(FRAME_NAMES, build_dashboard_frames(root)))
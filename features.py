@@ -0,0 +1,187 @@
+"""
+Feature pipeline for the Abraham Accords Literacy Dashboard
+Builds model-training features from the panel: per-region lags, leads, trailing
+rolling means, growth rates and time since the region's intervention started.
+Everything is computed on the (region, date)-sorted panel index with array
+shifts and prefix sums (no group-by apply), can be streamed over panel files in
+chunks of whole regions, and is cached per feature spec.
+
+Usage:
+    python features.py --out output/panel_features.arrow
+    python features.py --panel data/regional_panel.csv --chunksize 500000 --out features.arrow
+"""
+
+import argparse
+import hashlib
+import json
+import time
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from panel_index import PanelIndex, reduce_blocks
+from snapshots import to_arrow_table
+
+# Lags/leads/windows/growth periods count observations of the region, not quarters
+DEFAULT_FEATURE_SPEC = {
+    'columns': ['Adult_Literacy_Rate', 'Youth_Literacy_Rate', 'Gender_Parity_Index',
+                'Secondary_Enrollment_Rate', 'Learning_Quality_Index', 'Rural_Urban_Gap',
+                'Annual_Investment_USD_Millions'],
+    'lags': [1, 2, 4],
+    'leads': [1, 4],
+    'rolling': [4, 8],
+    'growth': [1, 4],
+    'intervention': True,
+}
+
+INTERVENTION_VALUES = {'Yes': 1.0, 'No': 0.0, True: 1.0, False: 0.0}
+
+# Features per (panel index, spec); entries go away with the index's data version
+_FEATURE_CACHE = weakref.WeakKeyDictionary()
+
+
+def spec_key(spec):
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+# ============================================================================
+# FEATURES
+# ============================================================================
+def observation_index(panel, columns, intervention=True):
+    """Index with one row per (region, date); rows sharing a date (programs) are averaged"""
+    index = PanelIndex.of(panel)
+    start = np.flatnonzero(np.r_[True, index.keys[1:] != index.keys[:-1]])
+    stop = np.r_[start[1:], len(index)]
+
+    frame = pd.DataFrame({index.region_col: index.regions[index.codes[start]],
+                          index.date_col: index.dates[start]})
+    for name in columns:
+        frame[name] = reduce_blocks(index.column(name), start, stop, 'mean')
+    if intervention:
+        active = index.mapped('Intervention_Active', INTERVENTION_VALUES)
+        frame['Intervention_Active'] = reduce_blocks(active, start, stop, 'max')
+    return PanelIndex(frame, index.region_col, index.date_col, id_col=None)
+
+
+def years_since_intervention(index):
+    """Years from each region's first active-intervention date (negative before, NaN if never)"""
+    years = index.dates.astype('datetime64[D]').astype(float) / 365.25
+    active = index.column('Intervention_Active') > 0
+    first = np.fmin.reduceat(np.where(active, years, np.nan), index.offsets[:-1])
+    return years - first[index.codes]
+
+
+def compute_features(panel, spec=DEFAULT_FEATURE_SPEC):
+    """Feature frame with one row per (region, date), sorted by region then date"""
+    index = observation_index(panel, spec['columns'], spec.get('intervention', False))
+    frame = index.frame[[index.region_col, index.date_col]].copy()
+    columns = {}
+    for name in spec['columns']:
+        values = index.column(name)
+        columns[name] = values
+        for periods in spec.get('lags', []):
+            columns[f"{name}_lag{periods}"] = index.lag(name, periods)
+        for periods in spec.get('leads', []):
+            columns[f"{name}_lead{periods}"] = index.lag(name, -periods)
+        for window in spec.get('rolling', []):
+            columns[f"{name}_roll{window}"] = index.rolling(name, window)
+        for periods in spec.get('growth', []):
+            previous = index.lag(name, periods)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                growth = 100 * (values / previous - 1)
+            columns[f"{name}_growth{periods}"] = np.where(np.isfinite(growth), growth, np.nan)
+    if spec.get('intervention', False):
+        columns['Intervention_Active'] = index.column('Intervention_Active')
+        columns['Years_Since_Intervention'] = years_since_intervention(index)
+    # One concat instead of inserting columns one by one
+    return pd.concat([frame, pd.DataFrame(columns)], axis=1)
+
+
+def build_features(index, spec=DEFAULT_FEATURE_SPEC):
+    """compute_features, cached per panel index and spec"""
+    cached = _FEATURE_CACHE.setdefault(index, {})
+    key = spec_key(spec)
+    if key not in cached:
+        cached[key] = compute_features(index, spec)
+    return cached[key]
+
+
+def training_matrix(features, target='Adult_Literacy_Rate', horizon=1):
+    """(X, y) for predicting target `horizon` observations ahead
+
+    Lead columns look into the future, so they are only ever used as the target.
+    """
+    label = f"{target}_lead{horizon}"
+    if label not in features.columns:
+        raise KeyError(f"Feature spec has no {label} column; add {horizon} to 'leads'")
+    rows = features[label].notna()
+    inputs = [col for col in features.columns
+              if '_lead' not in col and features[col].dtype.kind in 'fiu']
+    return features.loc[rows, inputs], features.loc[rows, label]
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+def iter_features(chunks, spec=DEFAULT_FEATURE_SPEC, region_col='CountryName'):
+    """Features for a panel read in chunks, e.g. pd.read_csv(..., chunksize=n)
+
+    A region's rows must be contiguous in the input (true for the panel exports).
+    The last region of each chunk may continue in the next one, so it is held back
+    and prepended to the next chunk; every yielded frame covers whole regions.
+    """
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        last = chunk[region_col].iat[-1]
+        tail = chunk[region_col].to_numpy() == last
+        carry = chunk[tail]
+        if not tail.all():
+            yield compute_features(chunk[~tail], spec)
+    if carry is not None and len(carry):
+        yield compute_features(carry, spec)
+
+
+def write_features(chunks, path, spec=DEFAULT_FEATURE_SPEC):
+    """Stream features into one Arrow IPC file, a record batch per chunk"""
+    writer, schema, rows = None, None, 0
+    with pa.OSFile(str(path), 'wb') as sink:
+        for features in iter_features(chunks, spec):
+            features['Date'] = features['Date'].dt.strftime('%Y-%m-%d')
+            table = to_arrow_table(features, 'panel_features', source=f"spec {spec_key(spec)}")
+            if writer is None:
+                # The row count is unknown until the stream ends, so it is left out
+                schema = table.schema.with_metadata(
+                    {key: value for key, value in table.schema.metadata.items() if key != b'rows'})
+                writer = pa.ipc.new_file(sink, schema)
+            writer.write_table(table.cast(schema))
+            rows += len(features)
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build lag/lead/rolling training features from the panel')
+    parser.add_argument('--panel', default='data/abraham_accords_panel_data.csv')
+    # Not under data/ or results/: those are versioned, and a rebuild would bump the data version
+    parser.add_argument('--out', default='output/panel_features.arrow')
+    parser.add_argument('--chunksize', type=int, default=200000, help='panel rows read per chunk')
+    parser.add_argument('--spec', help='JSON file with a feature spec (default: DEFAULT_FEATURE_SPEC)')
+    args = parser.parse_args()
+
+    spec = DEFAULT_FEATURE_SPEC
+    if args.spec:
+        with open(args.spec) as handle:
+            spec = json.load(handle)
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    rows = write_features(pd.read_csv(args.panel, chunksize=args.chunksize), args.out, spec)
+    print(f"{rows} feature rows ({spec_key(spec)}) -> {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Bulk-file ingestion for the Abraham Accords Literacy Dashboard
+Streams UNESCO UIS and World Bank EdStats bulk downloads (CSV or zip) and maps
+the tracked countries and indicators into the master dataset long format.
+
+Usage:
+    python ingest.py --unesco SDG_DATA_NATIONAL.zip --world-bank EdStats_CSV.zip \
+        -o data/abraham_accords_ingested.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import zipfile
+
+# ============================================================================
+# TRACKED COUNTRIES & INDICATORS
+# ============================================================================
+TRACKED_COUNTRIES = {
+    'ISR': 'Israel',
+    'ARE': 'UAE',
+    'BHR': 'Bahrain',
+    'MAR': 'Morocco',
+    'SDN': 'Sudan',
+}
+
+MASTER_COLUMNS = ['Country', 'Indicator_Category', 'Indicator_Name', 'Total_Value',
+                  'Male_Value', 'Female_Value', 'Urban_Value', 'Rural_Value',
+                  'Data_Year', 'Source', 'Confidence_Level', 'Notes']
+
+# Source indicator code -> (Indicator_Category, Indicator_Name, value column, scale)
+UNESCO_INDICATORS = {
+    'LR.AG15T99': ('Literacy_Rates', 'Adult_Literacy_Rate_15plus', 'Total_Value', 1.0),
+    'LR.AG15T99.M': ('Literacy_Rates', 'Adult_Literacy_Rate_15plus', 'Male_Value', 1.0),
+    'LR.AG15T99.F': ('Literacy_Rates', 'Adult_Literacy_Rate_15plus', 'Female_Value', 1.0),
+    'LR.AG15T24': ('Literacy_Rates', 'Youth_Literacy_Rate_15to24', 'Total_Value', 1.0),
+    'LR.AG15T24.M': ('Literacy_Rates', 'Youth_Literacy_Rate_15to24', 'Male_Value', 1.0),
+    'LR.AG15T24.F': ('Literacy_Rates', 'Youth_Literacy_Rate_15to24', 'Female_Value', 1.0),
+    'LR.AG15T99.GPIA': ('Gender_Parity', 'Adult_Literacy_GPI', 'Total_Value', 1.0),
+    'LR.AG15T24.GPIA': ('Gender_Parity', 'Youth_Literacy_GPI', 'Total_Value', 1.0),
+    'OFST.1.CP': ('Enrollment_Completion', 'Out_of_School_Children_thousands', 'Total_Value', 0.001),
+    'PTRHC.1': ('Teacher_Quality', 'Primary_Pupil_Teacher_Ratio', 'Total_Value', 1.0),
+    'PTRHC.2T3': ('Teacher_Quality', 'Secondary_Pupil_Teacher_Ratio', 'Total_Value', 1.0),
+    'TRTP.1': ('Teacher_Quality', 'Pct_Trained_Teachers_Primary', 'Total_Value', 1.0),
+}
+
+WORLD_BANK_INDICATORS = {
+    'SE.PRM.ENRR': ('Enrollment_Completion', 'Primary_Enrollment_Rate', 'Total_Value', 1.0),
+    'SE.SEC.ENRR': ('Enrollment_Completion', 'Secondary_Enrollment_Rate', 'Total_Value', 1.0),
+    'SE.PRM.CMPT.ZS': ('Enrollment_Completion', 'Primary_Completion_Rate', 'Total_Value', 1.0),
+    'SE.SEC.CMPT.LO.ZS': ('Enrollment_Completion', 'Secondary_Completion_Rate', 'Total_Value', 1.0),
+    'SE.ENR.PRIM.FM.ZS': ('Gender_Parity', 'Primary_Enrollment_GPI', 'Total_Value', 1.0),
+    'SE.ENR.SECO.FM.ZS': ('Gender_Parity', 'Secondary_Enrollment_GPI', 'Total_Value', 1.0),
+    'SE.XPD.TOTL.GD.ZS': ('Teacher_Quality', 'Govt_Expenditure_Education_Pct_GDP', 'Total_Value', 1.0),
+    'SP.POP.TOTL': ('Demographics', 'Population_Millions', 'Total_Value', 1e-6),
+    'NY.GDP.PCAP.CD': ('Demographics', 'GDP_per_Capita_USD', 'Total_Value', 1.0),
+    'SI.POV.NAHC': ('Demographics', 'Poverty_Rate_Pct', 'Total_Value', 1.0),
+    'SE.ADT.LITR.ZS': ('Literacy_Rates', 'Adult_Literacy_Rate_15plus', 'Total_Value', 1.0),
+    'SE.ADT.LITR.MA.ZS': ('Literacy_Rates', 'Adult_Literacy_Rate_15plus', 'Male_Value', 1.0),
+    'SE.ADT.LITR.FE.ZS': ('Literacy_Rates', 'Adult_Literacy_Rate_15plus', 'Female_Value', 1.0),
+}
+
+UNESCO_SOURCE = 'UNESCO_UIS'
+WORLD_BANK_SOURCE = 'World_Bank_EdStats'
+
+# ============================================================================
+# STREAM READERS
+# ============================================================================
+@contextlib.contextmanager
+def _open_text_stream(path, member_suffix):
+    """Open a CSV file, or the matching member of a zip archive, as a text stream"""
+    if not str(path).lower().endswith('.zip'):
+        with open(path, newline='', encoding='utf-8-sig') as stream:
+            yield stream
+        return
+
+    with zipfile.ZipFile(path) as archive:
+        members = [name for name in archive.namelist()
+                   if name.lower().endswith(member_suffix.lower())]
+        if not members:
+            raise ValueError(f"No member ending in '{member_suffix}' found in {path}")
+        with io.TextIOWrapper(archive.open(members[0]), encoding='utf-8-sig', newline='') as stream:
+            yield stream
+
+
+def _to_float(value):
+    """Parse a bulk-file value, returning None for blanks and flags like '..'"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _count_malformed(stats):
+    if stats is not None:
+        stats['malformed_rows'] = stats.get('malformed_rows', 0) + 1
+
+
+def iter_unesco_records(path, member_suffix='_DATA_NATIONAL.csv', stats=None):
+    """Yield (country, indicator_code, year, value) from a UIS bulk export (long format)
+
+    Tracked rows that are truncated or have no integer year are skipped and counted
+    in stats['malformed_rows'] (stats is an optional dict updated in place).
+    """
+    with _open_text_stream(path, member_suffix) as stream:
+        reader = csv.reader(stream)
+        header = [col.strip().lower().replace('_', '') for col in next(reader)]
+        indicator_col = header.index('indicatorid')
+        country_col = header.index('countryid') if 'countryid' in header else header.index('geounit')
+        year_col = header.index('year')
+        value_col = header.index('value')
+
+        for row in reader:
+            if not row:
+                continue
+            try:
+                country = row[country_col]
+                indicator = row[indicator_col]
+                if country not in TRACKED_COUNTRIES or indicator not in UNESCO_INDICATORS:
+                    continue
+                year = int(row[year_col])
+                value = _to_float(row[value_col])
+            except (IndexError, ValueError):
+                _count_malformed(stats)
+                continue
+            if value is not None:
+                yield country, indicator, year, value
+
+
+def iter_world_bank_records(path, member_suffix='EdStatsData.csv', stats=None):
+    """Yield (country, indicator_code, year, value) from a World Bank bulk export (wide years)
+
+    Every reported year is yielded; truncated tracked rows are counted as in
+    iter_unesco_records.
+    """
+    with _open_text_stream(path, member_suffix) as stream:
+        reader = csv.reader(stream)
+        header = next(reader)
+        country_col = header.index('Country Code')
+        indicator_col = header.index('Indicator Code')
+        year_cols = [(idx, int(col)) for idx, col in enumerate(header) if col.strip().isdigit()]
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) <= max(country_col, indicator_col):
+                _count_malformed(stats)
+                continue
+            country = row[country_col]
+            indicator = row[indicator_col]
+            if country not in TRACKED_COUNTRIES or indicator not in WORLD_BANK_INDICATORS:
+                continue
+            for idx, year in year_cols:
+                value = _to_float(row[idx]) if idx < len(row) else None
+                if value is not None:
+                    yield country, indicator, year, value
+
+# ============================================================================
+# MAPPING TO MASTER FORMAT
+# ============================================================================
+def collect_values(records, indicator_map, source, collected=None, replace_ties=False):
+    """Collect values as {(country, category, name): {year: {value column: (value, source)}}}
+
+    Memory is bounded by tracked countries x tracked indicators x years, not file size.
+    With replace_ties, a value for a column and year already collected is overwritten.
+    """
+    collected = {} if collected is None else collected
+
+    for country, code, year, value in records:
+        category, name, column, scale = indicator_map[code]
+        columns = collected.setdefault((TRACKED_COUNTRIES[country], category, name), {}).setdefault(year, {})
+        if column not in columns or replace_ties:
+            columns[column] = (value * scale, source)
+
+    return collected
+
+
+def build_master_rows(collected):
+    """One master row per indicator, with every value taken from the same year
+
+    Data_Year is the latest year with a Total_Value (or with any value, for
+    indicators that only report breakdowns); columns reported only in other years
+    are left blank rather than mixed into the row.
+    """
+    rows = []
+
+    for (country, category, name), years in sorted(collected.items()):
+        with_total = [year for year, columns in years.items() if 'Total_Value' in columns]
+        year = max(with_total or years)
+        columns = years[year]
+        row = {
+            'Country': country, 'Indicator_Category': category, 'Indicator_Name': name,
+            'Data_Year': year, 'Source': '; '.join(sorted({source for _, source in columns.values()})),
+            'Confidence_Level': 'HIGH', 'Notes': ''
+        }
+        for column, (value, _) in columns.items():
+            row[column] = round(value, 3)
+        rows.append(row)
+
+    return rows
+
+
+def write_master_csv(rows, output_path):
+    """Write rows in the abraham_accords_master_dataset.csv column layout"""
+    with open(output_path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=MASTER_COLUMNS, restval='')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def ingest(unesco_path=None, world_bank_path=None, output_path='data/abraham_accords_ingested.csv',
+           stats=None):
+    """Stream the given bulk files and write the tracked indicators in master format
+
+    stats (optional dict) receives the count of skipped malformed rows.
+    """
+    collected = {}
+
+    if world_bank_path:
+        collect_values(iter_world_bank_records(world_bank_path, stats=stats), WORLD_BANK_INDICATORS,
+                       WORLD_BANK_SOURCE, collected)
+    # UIS is the primary source for literacy figures, so it wins ties on year
+    if unesco_path:
+        collect_values(iter_unesco_records(unesco_path, stats=stats), UNESCO_INDICATORS,
+                       UNESCO_SOURCE, collected, replace_ties=True)
+
+    rows = build_master_rows(collected)
+    write_master_csv(rows, output_path)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest UNESCO / World Bank bulk exports")
+    parser.add_argument('--unesco', help="UIS bulk export (.csv or .zip)")
+    parser.add_argument('--world-bank', help="World Bank EdStats bulk export (.csv or .zip)")
+    parser.add_argument('-o', '--output', default='data/abraham_accords_ingested.csv',
+                        help="Output CSV in master dataset format")
+    args = parser.parse_args()
+
+    if not args.unesco and not args.world_bank:
+        parser.error("at least one of --unesco or --world-bank is required")
+
+    stats = {}
+    rows = ingest(args.unesco, args.world_bank, args.output, stats)
+    print(f"Wrote {len(rows)} indicator rows to {args.output}")
+    if stats.get('malformed_rows'):
+        print(f"Skipped {stats['malformed_rows']} malformed rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+Load test for the Abraham Accords Literacy Dashboard
+Simulated users open a session over Streamlit's websocket protocol and keep
+switching pages, so every request is a full script rerun (not just a static GET).
+Reports reruns per second and latency percentiles, optionally for several worker
+counts started through serve.py. With --interact, users stay on one page and move
+a slider there instead, which with partial reruns re-executes only the page
+fragment; --partial off,on compares both settings with server CPU per rerun.
+With --api, keep-alive clients hit the JSON API instead and report requests per second.
+
+Usage:
+    python loadtest.py --url http://localhost:7860 --users 8 --duration 30
+    python loadtest.py --compare 1,2,4 --users 8 --duration 30
+    python loadtest.py --interact --partial off,on --users 8 --duration 30
+    python loadtest.py --api http://localhost:8000 --users 32 --duration 10 [--revalidate]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import tornado.httpclient
+import tornado.websocket
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from pages_content import PARTIAL_RERUNS_ENV_VAR
+
+SERVE_SCRIPT = str(Path(__file__).with_name('serve.py'))
+APP_SCRIPT = str(Path(__file__).with_name('app.py'))
+NAVIGATION_LABEL = 'Select View:'
+
+# In-page interactions as {page: (slider label, values to pick from)}
+INTERACTIONS = {
+    'Sudan Conflict Analysis': ('De-escalation likelihood', [[0.25 * step] for step in range(1, 13)]),
+    'Data Explorer': ('Years', [[start, 2024] for start in range(2014, 2024)]),
+}
+
+# Fragment reruns finish with their own status (Streamlit 1.37+)
+FINISHED_STATUSES = {ForwardMsg.FINISHED_SUCCESSFULLY,
+                     getattr(ForwardMsg, 'FINISHED_FRAGMENT_RUN_SUCCESSFULLY', ForwardMsg.FINISHED_SUCCESSFULLY)}
+
+API_PATHS = [
+    '/api/v1/scores', '/api/v1/scores?year=2015', '/api/v1/scores?year=2020',
+    '/api/v1/allocation', '/api/v1/allocation?budget=900',
+    '/api/v1/scenario', '/api/v1/scenario?de_escalation=2',
+    '/api/v1/projections', '/api/v1/cost-rankings', '/api/v1/version',
+]
+
+# ============================================================================
+# SIMULATED USER
+# ============================================================================
+class DashboardSession:
+    """One browser session: a websocket plus the navigation radio's widget id"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.connection = None
+        self.radio_id = None
+        self.pages = []
+        self.sliders = {}
+
+    async def connect(self):
+        # The initial page load sets the proxy's sticky-worker cookie
+        response = await tornado.httpclient.AsyncHTTPClient().fetch(self.url + '/')
+        cookies = '; '.join(value.split(';', 1)[0] for value in response.headers.get_list('Set-Cookie'))
+        request = tornado.httpclient.HTTPRequest(
+            self.url.replace('http', 'ws', 1) + '/_stcore/stream', headers={'Cookie': cookies})
+        self.connection = await tornado.websocket.websocket_connect(
+            request, subprotocols=['streamlit'], max_message_size=200 * 1024 * 1024)
+        await self.rerun()
+
+    async def rerun(self, page_index=None, slider=None):
+        """Request a rerun and wait for the script to finish; returns seconds taken
+
+        slider is an optional (label, values) change on the current page; inside a
+        fragment only that fragment reruns.
+        """
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        message.rerun_script.page_script_hash = ''
+        if page_index is not None:
+            widget = message.rerun_script.widget_states.widgets.add()
+            widget.id = self.radio_id
+            widget.int_value = page_index
+        if slider is not None:
+            label, values = slider
+            slider_id, fragment_id, options = self.sliders[label]
+            if options:
+                # A select_slider's state is the positions of the picked options
+                values = [options.index(str(value)) for value in values]
+            widget = message.rerun_script.widget_states.widgets.add()
+            widget.id = slider_id
+            widget.double_array_value.data.extend(values)
+            if fragment_id:
+                message.rerun_script.fragment_id = fragment_id
+
+        start = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        while True:
+            payload = await self.connection.read_message()
+            if payload is None:
+                raise ConnectionError('Session closed by server')
+            reply = ForwardMsg()
+            reply.ParseFromString(payload)
+            kind = reply.WhichOneof('type')
+            if kind == 'delta':
+                self._record_widget(reply)
+            elif kind == 'script_finished':
+                if reply.script_finished in FINISHED_STATUSES:
+                    return time.perf_counter() - start
+                if reply.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError('Dashboard script failed to compile')
+
+    def _record_widget(self, reply):
+        element = reply.delta.new_element
+        kind = element.WhichOneof('type')
+        if kind == 'radio' and element.radio.label == NAVIGATION_LABEL:
+            self.radio_id = element.radio.id
+            self.pages = list(element.radio.options)
+        elif kind == 'slider':
+            # Deltas only carry a fragment id in Streamlit versions with fragments
+            self.sliders[element.slider.label] = (element.slider.id, getattr(reply.delta, 'fragment_id', ''),
+                                                  list(element.slider.options))
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+async def run_user(url, deadline, latencies, seed):
+    rng = random.Random(seed)
+    session = DashboardSession(url)
+    await session.connect()
+    if session.radio_id is None:
+        raise RuntimeError('Navigation radio not found in the first run')
+    try:
+        while time.perf_counter() < deadline:
+            latencies.append(await session.rerun(rng.randrange(len(session.pages))))
+    finally:
+        session.close()
+
+
+async def run_interacting_user(url, deadline, latencies, seed):
+    """Opens one page (alternating between users) and keeps moving a slider on it"""
+    rng = random.Random(seed)
+    page = list(INTERACTIONS)[seed % len(INTERACTIONS)]
+    label, values = INTERACTIONS[page]
+    session = DashboardSession(url)
+    await session.connect()
+    try:
+        page_index = session.pages.index(page)
+        await session.rerun(page_index)
+        while time.perf_counter() < deadline:
+            latencies.append(await session.rerun(page_index, (label, rng.choice(values))))
+    finally:
+        session.close()
+
+
+async def load_test(url, users, duration, interact=False):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    user = run_interacting_user if interact else run_user
+    await asyncio.gather(*(user(url, deadline, latencies, seed) for seed in range(users)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return {
+        'reruns': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else float('nan'),
+        'p95_ms': float(np.percentile(latencies, 95)) if len(latencies) else float('nan'),
+    }
+
+# ============================================================================
+# JSON API
+# ============================================================================
+async def run_api_client(host, port, deadline, latencies, statuses, seed, revalidate):
+    """One keep-alive connection issuing GETs back to back"""
+    rng = random.Random(seed)
+    etags = {}
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            path = rng.choice(API_PATHS)
+            conditional = f"If-None-Match: {etags[path]}\r\n" if revalidate and path in etags else ''
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n{conditional}\r\n".encode())
+            head = await reader.readuntil(b'\r\n\r\n')
+            lines = head.decode('latin-1').split('\r\n')
+            headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+            headers = {name.lower(): value for name, value in headers.items()}
+            await reader.readexactly(int(headers.get('content-length', 0)))
+            latencies.append(time.perf_counter() - start)
+
+            status = int(lines[0].split()[1])
+            statuses[status] = statuses.get(status, 0) + 1
+            if 'etag' in headers:
+                etags[path] = headers['etag']
+    finally:
+        writer.close()
+
+
+async def api_load_test(url, connections, duration, revalidate=False):
+    parts = urlsplit(url)
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(run_api_client(parts.hostname, parts.port or 80, deadline, latencies,
+                                          statuses, seed, revalidate)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'statuses': statuses,
+    }
+
+# ============================================================================
+# SERVER COMPARISONS
+# ============================================================================
+def start_server(workers, port):
+    process = subprocess.Popen([sys.executable, SERVE_SCRIPT, '--workers', str(workers),
+                                '--port', str(port), '--address', '127.0.0.1',
+                                '--worker-port', str(port + 100)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return wait_healthy(process, port, 120 * workers)
+
+
+def start_streamlit(port, partial_reruns):
+    """A single Streamlit server with partial reruns 'on' or 'off'"""
+    env = dict(os.environ, **{PARTIAL_RERUNS_ENV_VAR: partial_reruns})
+    process = subprocess.Popen([sys.executable, '-m', 'streamlit', 'run', APP_SCRIPT,
+                                '--server.port', str(port), '--server.address', '127.0.0.1',
+                                '--server.headless', 'true', '--browser.gatherUsageStats', 'false'],
+                               # .streamlit/config.toml is read from the working directory
+                               cwd=Path(APP_SCRIPT).parent, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return wait_healthy(process, port, 120)
+
+
+def wait_healthy(process, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with {process.returncode}")
+        try:
+            tornado.httpclient.HTTPClient().fetch(f"http://127.0.0.1:{port}/_stcore/health")
+            return process
+        except Exception:
+            time.sleep(0.5)
+    process.kill()
+    raise TimeoutError(f"Server on port {port} did not become healthy")
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process and its threads (Linux /proc)"""
+    with open(f"/proc/{pid}/stat") as handle:
+        fields = handle.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def format_row(label, result):
+    row = (f"{label:>8} {result['reruns']:>8} {result['throughput']:>12.2f} "
+           f"{result['p50_ms']:>10.1f} {result['p95_ms']:>10.1f}")
+    if 'cpu_ms' in result:
+        row += f" {result['cpu_ms']:>12.1f}"
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rerun-throughput load test for the dashboard')
+    parser.add_argument('--url', default='http://127.0.0.1:7860')
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds per run')
+    parser.add_argument('--compare', help='comma-separated worker counts to start via serve.py')
+    parser.add_argument('--port', type=int, default=7870, help='proxy port used with --compare')
+    parser.add_argument('--interact', action='store_true',
+                        help='move in-page sliders instead of switching pages')
+    parser.add_argument('--partial', help='comma-separated partial-rerun settings (on/off) to start and compare')
+    parser.add_argument('--api', metavar='URL', help='load-test the JSON API at this base URL instead')
+    parser.add_argument('--revalidate', action='store_true', help='send If-None-Match (API mode)')
+    args = parser.parse_args()
+
+    if args.api:
+        result = asyncio.run(api_load_test(args.api, args.users, args.duration, args.revalidate))
+        print(f"{args.users} connections, {args.duration:.0f}s, {os.cpu_count()} CPUs: "
+              f"{result['requests']} requests, {result['throughput']:.0f} req/s, "
+              f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, statuses {result['statuses']}")
+        return
+
+    label = 'partial' if args.partial else 'workers'
+    header = f"{label:>8} {'reruns':>8} {'reruns/s':>12} {'p50 ms':>10} {'p95 ms':>10}"
+    print(f"{args.users} users, {args.duration:.0f}s per run, {os.cpu_count()} CPUs, "
+          f"{'slider interactions' if args.interact else 'page switches'}")
+    print(header + (f" {'CPU ms/rerun':>12}" if args.partial else ''))
+
+    if args.partial:
+        for setting in args.partial.split(','):
+            process = start_streamlit(args.port, setting)
+            try:
+                url = f"http://127.0.0.1:{args.port}"
+                # One untimed pass loads the data and builds each page's figures
+                asyncio.run(load_test(url, len(INTERACTIONS), 2, args.interact))
+                cpu_before = cpu_seconds(process.pid)
+                result = asyncio.run(load_test(url, args.users, args.duration, args.interact))
+                result['cpu_ms'] = 1000 * (cpu_seconds(process.pid) - cpu_before) / max(result['reruns'], 1)
+            finally:
+                stop_server(process)
+            print(format_row(setting, result), flush=True)
+        return
+
+    if not args.compare:
+        print(format_row('-', asyncio.run(load_test(args.url, args.users, args.duration, args.interact))))
+        return
+
+    for workers in [int(count) for count in args.compare.split(',')]:
+        process = start_server(workers, args.port)
+        try:
+            result = asyncio.run(load_test(f"http://127.0.0.1:{args.port}", args.users, args.duration,
+                                           args.interact))
+        finally:
+            stop_server(process)
+        print(format_row(str(workers), result), flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,13 +3,89 @@ Page rendering functions for Abraham Accords Literacy Dashboard
 Updated with conflict-realistic framework and revised calculations
 """
 
+import hashlib
+import os
+from collections import OrderedDict
+
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 
+import payload
+from conflict_model import PHASE2_THRESHOLD, REGIMES, adjust_transitions
+from shared_cache import get_shared_cache
+
+# ============================================================================
+# FIGURE CACHE
+# ============================================================================
+# Figures are built once per process and shared read-only across sessions,
+# keyed by builder and input content so new data yields new figures
+_FIGURE_CACHE = {}
+
+def frame_fingerprint(*frames):
+    digest = hashlib.sha1()
+    for frame in frames:
+        digest.update('|'.join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+    return digest.hexdigest()
+
+def cached_figure(builder, *frames):
+    """Return the figure for these inputs, building it on first use
+
+    With a shared cache configured, figures built by another worker are reused.
+    """
+    key = (builder.__name__, frame_fingerprint(*frames))
+    fig = _FIGURE_CACHE.get(key)
+    if fig is None:
+        shared = get_shared_cache()
+        if shared is None:
+            fig = builder(*frames)
+        else:
+            fig = shared.get_or_build(f"figure:{key[0]}:{key[1]}", lambda: builder(*frames))
+        fig = _FIGURE_CACHE[key] = fig
+    return fig
+
+def discard_figures(builder_name):
+    """Drop every cached figure of one builder, e.g. after its inputs changed"""
+    for key in [key for key in list(_FIGURE_CACHE) if key[0] == builder_name]:
+        _FIGURE_CACHE.pop(key, None)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.delete_prefix(f"figure:{builder_name}:")
+
+# ============================================================================
+# PARTIAL RERUNS AND SESSION RESULTS
+# ============================================================================
+# A widget inside a fragment reruns only that fragment (st.fragment, Streamlit 1.37+;
+# older versions rerun the whole script). DASHBOARD_PARTIAL_RERUNS=off disables it.
+PARTIAL_RERUNS_ENV_VAR = 'DASHBOARD_PARTIAL_RERUNS'
+MAX_SESSION_RESULTS = 64
+
+def fragment(func):
+    decorator = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    if decorator is None or os.environ.get(PARTIAL_RERUNS_ENV_VAR) == 'off':
+        return func
+    return decorator(func)
+
+def session_cached(name, owner, key, build):
+    """build() remembered in this session under key, until owner (the model or cube of
+    one data version) changes; moving a widget back to a setting then costs nothing"""
+    cache = st.session_state.get(name)
+    if cache is None or cache['owner'] is not owner:
+        cache = st.session_state[name] = {'owner': owner, 'results': OrderedDict()}
+    results = cache['results']
+    if key in results:
+        results.move_to_end(key)
+    else:
+        results[key] = build()
+        if len(results) > MAX_SESSION_RESULTS:
+            results.popitem(last=False)
+    return results[key]
+
 def render_page(page, aalni_data, morocco_timeline, cost_effectiveness, 
-                feature_importance, projections_2030, sudan_conflict):
+                feature_importance, projections_2030, sudan_conflict, cube=None,
+                conflict_model=None):
     """Route to appropriate page renderer"""
     
     if page == "Executive Summary":
@@ -19,7 +95,7 @@ def render_page(page, aalni_data, morocco_timeline, cost_effectiveness,
     elif page == "Morocco Case Study":
         render_morocco_case_study(morocco_timeline, cost_effectiveness)
     elif page == "Sudan Conflict Analysis":
-        render_sudan_analysis(sudan_conflict)
+        render_sudan_analysis(sudan_conflict, conflict_model)
     elif page == "Cost-Effectiveness":
         render_cost_effectiveness(cost_effectiveness)
     elif page == "Feature Importance (88.9% Rule)":
@@ -28,10 +104,21 @@ def render_page(page, aalni_data, morocco_timeline, cost_effectiveness,
         render_2030_projections(projections_2030)
     elif page == "Policy Recommendations":
         render_policy_recommendations(aalni_data, projections_2030)
+    elif page == "Data Explorer":
+        render_data_explorer(cube)
 
 # ============================================================================
 # EXECUTIVE SUMMARY
 # ============================================================================
+def build_scenario_table():
+    return pd.DataFrame({
+        'Scenario': ['Phase 1 Only\n(No Sudan Peace)', 'Phase 1 + Phase 2\n(Peace by 2027)', 'Best Case\n(Early Peace)'],
+        'Countries_Achieving_SDG': [3, 4, 5],
+        'Success_Rate': [60, 80, 100],
+        'Sudan_Outcome': ['57-60%\n(Stabilized)', '85-90%\n(Transformed)', '90-95%\n(Near SDG)'],
+        'Total_Investment': ['$950M', '$1,307.5M', '$1,307.5M+']
+    })
+
 def render_executive_summary(aalni_data, projections_2030):
     st.header("Executive Summary")
     
@@ -97,15 +184,8 @@ def render_executive_summary(aalni_data, projections_2030):
     # Success Scenarios
     st.subheader("2030 Success Scenarios")
     
-    scenario_data = pd.DataFrame({
-        'Scenario': ['Phase 1 Only\n(No Sudan Peace)', 'Phase 1 + Phase 2\n(Peace by 2027)', 'Best Case\n(Early Peace)'],
-        'Countries_Achieving_SDG': [3, 4, 5],
-        'Success_Rate': [60, 80, 100],
-        'Sudan_Outcome': ['57-60%\n(Stabilized)', '85-90%\n(Transformed)', '90-95%\n(Near SDG)'],
-        'Total_Investment': ['$950M', '$1,307.5M', '$1,307.5M+']
-    })
-    
-    st.dataframe(scenario_data, use_container_width=True, hide_index=True)
+    scenario_data = build_scenario_table()
+    payload.dataframe(scenario_data, 'scenario_table', use_container_width=True, hide_index=True)
     
     st.markdown("---")
     
@@ -124,22 +204,9 @@ def render_executive_summary(aalni_data, projections_2030):
 # ============================================================================
 # AALNI RANKINGS
 # ============================================================================
-def render_aalni_rankings(aalni_data):
-    st.header("Abraham Accords Literacy Need Index (AALNI)")
-    
-    st.markdown("""
-    The AALNI is the first standardized regional literacy assessment framework, combining:
-    - **Baseline Gap** (30%): Distance from 95% SDG target
-    - **Gender Disparity** (25%): Gender parity index gaps
-    - **Rural-Urban Divide** (20%): Geographic inequality
-    - **Economic Constraint** (15%): Poverty rates
-    - **Quality Deficit** (10%): Learning quality gaps
-    - **Conflict Multiplier**: 1.0× (stable) to 3.0× (severe conflict)
-    """)
-    
-    # AALNI Scores Chart
+def build_aalni_scores_figure(aalni_data):
     fig = go.Figure()
-    
+
     fig.add_trace(go.Bar(
         x=aalni_data['Country'],
         y=aalni_data['AALNI_Score'],
@@ -147,40 +214,63 @@ def render_aalni_rankings(aalni_data):
         text=aalni_data['AALNI_Score'].round(1),
         textposition='outside'
     ))
-    
+
     fig.update_layout(
         title="AALNI Vulnerability Scores (Higher = Greater Need)",
         xaxis_title="Country",
         yaxis_title="AALNI Score",
         height=400
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # Phase 1 Allocation
-    st.subheader("Phase 1 Budget Allocation ($950M)")
-    
-    fig2 = go.Figure(data=[go.Pie(
+    return fig
+
+def build_phase1_allocation_figure(aalni_data):
+    fig = go.Figure(data=[go.Pie(
         labels=aalni_data['Country'],
         values=aalni_data['Phase_1_Allocation_M'],
         hole=0.3,
         marker_colors=['#ef4444', '#f59e0b', '#3b82f6', '#3b82f6', '#3b82f6']
     )])
+
+    fig.update_layout(title="Phase 1 Allocation by Country", height=400)
+    return fig
+
+def build_allocation_table(aalni_data):
+    allocation_table = aalni_data[['Country', 'AALNI_Score', 'Phase_1_Allocation_M',
+                                   'Phase_2_Allocation_M', 'Total_Need_M', 'Phase_1_Percent']].copy()
+    allocation_table.columns = ['Country', 'AALNI Score', 'Phase 1 ($M)',
+                                'Phase 2 ($M)', 'Total Need ($M)', 'Phase 1 Coverage (%)']
+    return allocation_table
+
+def render_aalni_rankings(aalni_data):
+    st.header("Abraham Accords Literacy Need Index (AALNI)")
     
-    fig2.update_layout(title="Phase 1 Allocation by Country", height=400)
-    st.plotly_chart(fig2, use_container_width=True)
+    st.markdown("""
+    The AALNI is the first standardized regional literacy assessment framework, combining:
+    - **Baseline Gap** (30%): Distance from 95% SDG target
+    - **Gender Disparity** (25%): Gender parity index gaps
+    - **Rural-Urban Divide** (20%): Geographic inequality
+    - **Economic Constraint** (15%): Poverty rates
+    - **Quality Deficit** (10%): Learning quality gaps
+    - **Conflict Multiplier**: 1.0× (stable) to 3.0× (severe conflict)
+    """)
     
+    # AALNI Scores Chart
+    fig = cached_figure(build_aalni_scores_figure, aalni_data)
+    payload.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+
+    # Phase 1 Allocation
+    st.subheader("Phase 1 Budget Allocation ($950M)")
+
+    fig2 = cached_figure(build_phase1_allocation_figure, aalni_data)
+    payload.plotly_chart(fig2, use_container_width=True)
+
     # Detailed Table
     st.subheader("Detailed Allocation Breakdown")
-    
-    allocation_table = aalni_data[['Country', 'AALNI_Score', 'Phase_1_Allocation_M', 
-                                   'Phase_2_Allocation_M', 'Total_Need_M', 'Phase_1_Percent']].copy()
-    allocation_table.columns = ['Country', 'AALNI Score', 'Phase 1 ($M)', 
-                                'Phase 2 ($M)', 'Total Need ($M)', 'Phase 1 Coverage (%)']
-    
-    st.dataframe(allocation_table, use_container_width=True, hide_index=True)
+
+    allocation_table = build_allocation_table(aalni_data)
+    payload.dataframe(allocation_table, 'allocation_table', use_container_width=True, hide_index=True)
     
     st.markdown("""
     <div class="insight-box">
@@ -193,35 +283,13 @@ def render_aalni_rankings(aalni_data):
 # ============================================================================
 # MOROCCO CASE STUDY
 # ============================================================================
-def render_morocco_case_study(morocco_timeline, cost_effectiveness):
-    st.header("Morocco: Validated Success Model")
-    
-    st.markdown("""
-    Morocco's National Literacy Program (2014-2024) provides the empirical foundation 
-    for the Abraham Accords regional investment framework.
-    """)
-    
-    # Key Metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Investment", "$310.9M", "10 years")
-    with col2:
-        st.metric("Beneficiaries", "8.46M", "43.8% penetration")
-    with col3:
-        st.metric("Improvement", "+19.8 points", "52.3% → 72.1%")
-    with col4:
-        st.metric("Efficiency", "$1.86", "per person per point")
-    
-    # Timeline Chart
-    st.subheader("Morocco Literacy Timeline (2008-2030)")
-    
+def build_morocco_timeline_figure(morocco_timeline):
     fig = go.Figure()
-    
+
     # Split into actual and projected
     actual = morocco_timeline[morocco_timeline['Type'] == 'Actual']
     projected = morocco_timeline[morocco_timeline['Type'] == 'Projected']
-    
+
     fig.add_trace(go.Scatter(
         x=actual['Year'],
         y=actual['Literacy_Rate'],
@@ -230,7 +298,7 @@ def render_morocco_case_study(morocco_timeline, cost_effectiveness):
         line=dict(color='#3b82f6', width=3),
         marker=dict(size=8)
     ))
-    
+
     fig.add_trace(go.Scatter(
         x=projected['Year'],
         y=projected['Literacy_Rate'],
@@ -239,23 +307,48 @@ def render_morocco_case_study(morocco_timeline, cost_effectiveness):
         line=dict(color='#10b981', width=3, dash='dash'),
         marker=dict(size=8)
     ))
-    
+
     # Add SDG target line
-    fig.add_hline(y=95, line_dash="dot", line_color="gold", 
+    fig.add_hline(y=95, line_dash="dot", line_color="gold",
                   annotation_text="SDG 4 Target (95%)")
-    
+
     # Add intervention start marker
     fig.add_vline(x=2014, line_dash="dash", line_color="red",
                   annotation_text="Intervention Start")
-    
+
     fig.update_layout(
         xaxis_title="Year",
         yaxis_title="Adult Literacy Rate (%)",
         height=500,
         hovermode='x unified'
     )
+    return fig
+
+def render_morocco_case_study(morocco_timeline, cost_effectiveness):
+    st.header("Morocco: Validated Success Model")
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.markdown("""
+    Morocco's National Literacy Program (2014-2024) provides the empirical foundation 
+    for the Abraham Accords regional investment framework.
+    """)
+    
+    # Key Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Investment", "$310.9M", "10 years")
+    with col2:
+        st.metric("Beneficiaries", "8.46M", "43.8% penetration")
+    with col3:
+        st.metric("Improvement", "+19.8 points", "52.3% → 72.1%")
+    with col4:
+        st.metric("Efficiency", "$1.86", "per person per point")
+    
+    # Timeline Chart
+    st.subheader("Morocco Literacy Timeline (2008-2030)")
+
+    fig = cached_figure(build_morocco_timeline_figure, morocco_timeline)
+    payload.plotly_chart(fig, use_container_width=True)
     
     st.markdown("""
     <div class="success-box">
@@ -292,21 +385,9 @@ def render_morocco_case_study(morocco_timeline, cost_effectiveness):
 # ============================================================================
 # SUDAN CONFLICT ANALYSIS
 # ============================================================================
-def render_sudan_analysis(sudan_conflict):
-    st.header("Sudan: Conflict-Contingent Strategy")
-    
-    st.markdown("""
-    <div class="warning-box">
-    <h4>Critical Finding: Literacy Cannot Improve During Active Conflict</h4>
-    <p><strong>Empirical evidence from dataset:</strong> Literacy declined 3.7 percentage points 
-    during 2014-2024 conflict period (60.7% → 57.0%)</p>
-    <p><strong>Forecast without intervention:</strong> Continued decline to 54.1% by 2030</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Conflict Impact Chart
+def build_sudan_conflict_figure(sudan_conflict):
     fig = go.Figure()
-    
+
     # Literacy rate (left y-axis)
     fig.add_trace(go.Scatter(
         x=sudan_conflict['Year'],
@@ -316,7 +397,7 @@ def render_sudan_analysis(sudan_conflict):
         line=dict(color='#3b82f6', width=3),
         yaxis='y'
     ))
-    
+
     # Conflict intensity (right y-axis)
     fig.add_trace(go.Scatter(
         x=sudan_conflict['Year'],
@@ -326,7 +407,7 @@ def render_sudan_analysis(sudan_conflict):
         line=dict(color='#ef4444', width=3),
         yaxis='y2'
     ))
-    
+
     fig.update_layout(
         title="Sudan: Literacy Decline Correlates with Conflict Escalation",
         xaxis_title="Year",
@@ -347,8 +428,120 @@ def render_sudan_analysis(sudan_conflict):
         height=500,
         hovermode='x unified'
     )
+    return fig
+
+def build_conflict_outlook_figure(by_year, threshold):
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=list(by_year['Year']) + list(by_year['Year'][::-1]),
+        y=list(by_year['Intensity_P90']) + list(by_year['Intensity_P10'][::-1]),
+        fill='toself',
+        fillcolor='rgba(239, 68, 68, 0.15)',
+        line=dict(color='rgba(0,0,0,0)'),
+        name='Intensity 10-90%',
+        hoverinfo='skip'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=by_year['Year'],
+        y=by_year['Intensity_Median'],
+        name='Median Intensity',
+        mode='lines+markers',
+        line=dict(color='#ef4444', width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=by_year['Year'],
+        y=by_year['Cumulative_Probability'] * 100,
+        name='P(Phase 2 Trigger Met)',
+        mode='lines+markers',
+        line=dict(color='#10b981', width=3),
+        yaxis='y2'
+    ))
+
+    fig.add_hline(y=threshold, line_dash="dash", line_color="#6b7280",
+                  annotation_text=f"Trigger: severity ≤ {threshold}")
+
+    fig.update_layout(
+        title="Simulated Conflict Trajectories and Phase 2 Trigger Probability",
+        xaxis_title="Year",
+        yaxis=dict(title="Conflict Intensity (0-10 scale)", range=[0, 10]),
+        yaxis2=dict(title="Cumulative Probability (%)", overlaying='y', side='right', range=[0, 100]),
+        height=500,
+        hovermode='x unified'
+    )
+    return fig
+
+@fragment
+def render_conflict_outlook(conflict_model):
+    st.subheader("Phase 2 Trigger Outlook")
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.markdown("""
+    A Markov regime-switching model fitted to Sudan's conflict-status history simulates 
+    10,000 conflict paths. Adjust the transition assumptions to see how the probability 
+    and timing of the **conflict severity ≤ 2.0** trigger respond.
+    """)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        escalation = st.slider("Escalation likelihood", 0.25, 3.0, 1.0, 0.25,
+                               help="Multiplier on the fitted probabilities of moving to a worse regime")
+    with col2:
+        de_escalation = st.slider("De-escalation likelihood", 0.25, 3.0, 1.0, 0.25,
+                                  help="Multiplier on the fitted probabilities of moving to a calmer regime")
+    with col3:
+        sustained = st.slider("Years sustained", 1, 3, 1,
+                              help="Consecutive years at or below the threshold before the trigger counts")
+    with col4:
+        horizon = st.slider("Horizon (years)", 6, 15, 10)
+    
+    transition = adjust_transitions(conflict_model.transition, escalation, de_escalation)
+    settings = (escalation, de_escalation, sustained, horizon)
+    outlook = session_cached('conflict_outlooks', conflict_model, settings, lambda: conflict_model.trigger_summary(
+        years=horizon, transition=transition, threshold=PHASE2_THRESHOLD, sustained=sustained))
+    by_year = outlook['by_year']
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Trigger Met by Year 3", f"{by_year['Cumulative_Probability'].iloc[2]:.0%}",
+                  help="End of Phase 1")
+    with col2:
+        st.metric("Trigger Met by Year 6", f"{by_year['Cumulative_Probability'].iloc[5]:.0%}",
+                  help="End of the Phase 2 window")
+    with col3:
+        expected = outlook['expected_year']
+        st.metric("Expected Trigger Year", f"{expected:.1f}" if expected else "Not reached",
+                  f"{outlook['probability']:.0%} within {horizon} years", delta_color="off")
+    
+    fig = session_cached('conflict_outlook_figures', conflict_model, settings,
+                         lambda: build_conflict_outlook_figure(by_year, PHASE2_THRESHOLD))
+    payload.plotly_chart(fig, use_container_width=True)
+    
+    with st.expander("Transition assumptions (annual probabilities)"):
+        st.markdown(f"**Fitted from panel** ({conflict_model.country}, "
+                    f"starting from {REGIMES[conflict_model.start_regime]} in {conflict_model.start_year})")
+        payload.dataframe(conflict_model.transition_table().round(3), 'fitted_transitions',
+                          use_container_width=True)
+        st.markdown("**Adjusted**")
+        payload.dataframe(conflict_model.transition_table(transition).round(3), 'adjusted_transitions',
+                          use_container_width=True)
+
+def render_sudan_analysis(sudan_conflict, conflict_model=None):
+    st.header("Sudan: Conflict-Contingent Strategy")
+    
+    st.markdown("""
+    <div class="warning-box">
+    <h4>Critical Finding: Literacy Cannot Improve During Active Conflict</h4>
+    <p><strong>Empirical evidence from dataset:</strong> Literacy declined 3.7 percentage points 
+    during 2014-2024 conflict period (60.7% → 57.0%)</p>
+    <p><strong>Forecast without intervention:</strong> Continued decline to 54.1% by 2030</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Conflict Impact Chart
+    fig = cached_figure(build_sudan_conflict_figure, sudan_conflict)
+    payload.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     
@@ -403,6 +596,10 @@ def render_sudan_analysis(sudan_conflict):
         </div>
         """, unsafe_allow_html=True)
     
+    if conflict_model is not None:
+        st.markdown("---")
+        render_conflict_outlook(conflict_model)
+    
     st.markdown("---")
     
     # External Context
@@ -425,15 +622,7 @@ def render_sudan_analysis(sudan_conflict):
 # ============================================================================
 # COST-EFFECTIVENESS
 # ============================================================================
-def render_cost_effectiveness(cost_effectiveness):
-    st.header("Cost-Effectiveness Analysis")
-    
-    st.markdown("""
-    Comparative analysis of literacy interventions across the Abraham Accords region.
-    Morocco's model ranks #2 globally for optimal speed-to-cost ratio.
-    """)
-    
-    # Cost per point comparison
+def build_cost_per_point_figure(cost_effectiveness):
     fig = go.Figure(data=[go.Bar(
         x=cost_effectiveness['Program'],
         y=cost_effectiveness['Cost_Per_Point'],
@@ -441,7 +630,7 @@ def render_cost_effectiveness(cost_effectiveness):
         textposition='outside',
         marker_color=['#10b981', '#3b82f6', '#f59e0b', '#ef4444', '#991b1b']
     )])
-    
+
     fig.update_layout(
         title="Cost Efficiency: $ Per Percentage Point Improvement",
         xaxis_title="Program",
@@ -449,27 +638,41 @@ def render_cost_effectiveness(cost_effectiveness):
         yaxis_type="log",
         height=500
     )
-    
-    st.plotly_chart(fig, use_container_width=True)
-    
-    st.markdown("---")
-    
-    # Detailed comparison table
-    st.subheader("Detailed Program Comparison")
-    
+    return fig
+
+def build_comparison_table(cost_effectiveness):
     comparison_table = cost_effectiveness.copy()
     comparison_table = comparison_table.sort_values('Cost_Per_Point')
     comparison_table['Rank'] = range(1, len(comparison_table) + 1)
-    
-    comparison_table = comparison_table[['Rank', 'Program', 'Country', 'Cost_Per_Point', 
-                                        'Literacy_Improvement', 'Duration_Years', 
+
+    comparison_table = comparison_table[['Rank', 'Program', 'Country', 'Cost_Per_Point',
+                                        'Literacy_Improvement', 'Duration_Years',
                                         'Cost_Per_Person', 'Beneficiaries_M']]
-    
-    comparison_table.columns = ['Rank', 'Program', 'Country', '$/Point', 
-                                'Improvement (pts)', 'Duration (yrs)', 
+
+    comparison_table.columns = ['Rank', 'Program', 'Country', '$/Point',
+                                'Improvement (pts)', 'Duration (yrs)',
                                 '$/Person', 'Beneficiaries (M)']
+    return comparison_table
+
+def render_cost_effectiveness(cost_effectiveness):
+    st.header("Cost-Effectiveness Analysis")
     
-    st.dataframe(comparison_table, use_container_width=True, hide_index=True)
+    st.markdown("""
+    Comparative analysis of literacy interventions across the Abraham Accords region.
+    Morocco's model ranks #2 globally for optimal speed-to-cost ratio.
+    """)
+    
+    # Cost per point comparison
+    fig = cached_figure(build_cost_per_point_figure, cost_effectiveness)
+    payload.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+
+    # Detailed comparison table
+    st.subheader("Detailed Program Comparison")
+
+    comparison_table = build_comparison_table(cost_effectiveness)
+    payload.dataframe(comparison_table, 'comparison_table', use_container_width=True, hide_index=True)
     
     st.markdown("""
     <div class="insight-box">
@@ -487,32 +690,21 @@ def render_cost_effectiveness(cost_effectiveness):
 # ============================================================================
 # FEATURE IMPORTANCE (88.9% RULE)
 # ============================================================================
-def render_feature_importance(feature_importance):
-    st.header("The 88.9% Rule: What Really Drives Literacy")
-    
-    st.markdown("""
-    <div class="success-box">
-    <h3>Breakthrough Finding from Random Forest Analysis (R²=0.972)</h3>
-    <p><strong>Top 5 systemic factors explain 88.9% of literacy outcomes.</strong></p>
-    <p><strong>Investment amount ranks #9 at only 1.6%.</strong></p>
-    <p><strong>Conclusion: HOW you spend matters 50× more than HOW MUCH you spend.</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Feature importance chart - reverse order so highest is at top
+def build_feature_importance_figure(feature_importance):
+    # Reverse order so highest is at top
     feature_importance_sorted = feature_importance.iloc[::-1].copy()
-    
+
     fig = go.Figure(data=[go.Bar(
         y=feature_importance_sorted['Feature'],
         x=feature_importance_sorted['Importance'],
         orientation='h',
         text=feature_importance_sorted['Importance'].round(1),
         textposition='outside',
-        marker_color=['#10b981' if cat == 'Systemic' else '#3b82f6' if cat == 'Infrastructure' 
+        marker_color=['#10b981' if cat == 'Systemic' else '#3b82f6' if cat == 'Infrastructure'
                      else '#f59e0b' if cat == 'Temporal' else '#64748b' if cat == 'Context'
                      else '#ef4444' for cat in feature_importance_sorted['Category']]
     )])
-    
+
     fig.update_layout(
         title="Random Forest Feature Importance (%)",
         xaxis_title="Importance (%)",
@@ -520,8 +712,23 @@ def render_feature_importance(feature_importance):
         height=500,
         showlegend=False
     )
+    return fig
+
+def render_feature_importance(feature_importance):
+    st.header("The 88.9% Rule: What Really Drives Literacy")
+    
+    st.markdown("""
+    <div class="success-box">
+    <h3>Breakthrough Finding from Random Forest Analysis (R²=0.972)</h3>
+    <p><strong>Top 5 systemic factors explain 88.9% of literacy outcomes.</strong></p>
+    <p><strong>Investment amount ranks #9 at only 1.6%.</strong></p>
+    <p><strong>Conclusion: HOW you spend matters 50× more than HOW MUCH you spend.</strong></p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Feature importance chart
+    fig = cached_figure(build_feature_importance_figure, feature_importance)
+    payload.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     
@@ -569,16 +776,9 @@ def render_feature_importance(feature_importance):
 # ============================================================================
 # 2030 PROJECTIONS
 # ============================================================================
-def render_2030_projections(projections_2030):
-    st.header("2030 SDG 4 Projections: Scenario Analysis")
-    
-    st.markdown("""
-    Prophet time-series forecasting with scenario-based outcomes for Sudan.
-    """)
-    
-    # Create visualization showing all scenarios
+def build_2030_projections_figure(projections_2030):
     fig = go.Figure()
-    
+
     # High performers (baseline scenario)
     high_performers = projections_2030[projections_2030['Scenario'] == 'Baseline']
     fig.add_trace(go.Bar(
@@ -589,7 +789,7 @@ def render_2030_projections(projections_2030):
         text=high_performers['Projected_2030'].round(1),
         textposition='outside'
     ))
-    
+
     # Morocco
     morocco = projections_2030[projections_2030['Country'] == 'Morocco']
     fig.add_trace(go.Bar(
@@ -600,13 +800,13 @@ def render_2030_projections(projections_2030):
         text=morocco['Projected_2030'].round(1),
         textposition='outside'
     ))
-    
+
     # Sudan scenarios
-    sudan_phase1 = projections_2030[(projections_2030['Country'] == 'Sudan') & 
+    sudan_phase1 = projections_2030[(projections_2030['Country'] == 'Sudan') &
                                     (projections_2030['Scenario'] == 'Phase 1 Only')]
-    sudan_phase2 = projections_2030[(projections_2030['Country'] == 'Sudan') & 
+    sudan_phase2 = projections_2030[(projections_2030['Country'] == 'Sudan') &
                                     (projections_2030['Scenario'] == 'Phase 1 + Phase 2')]
-    
+
     fig.add_trace(go.Bar(
         name='Sudan Phase 1 Only',
         x=['Sudan (Phase 1)'],
@@ -615,7 +815,7 @@ def render_2030_projections(projections_2030):
         text=sudan_phase1['Projected_2030'].round(1),
         textposition='outside'
     ))
-    
+
     fig.add_trace(go.Bar(
         name='Sudan Phase 1+2',
         x=['Sudan (Phase 2)'],
@@ -624,10 +824,10 @@ def render_2030_projections(projections_2030):
         text=sudan_phase2['Projected_2030'].round(1),
         textposition='outside'
     ))
-    
+
     fig.add_hline(y=95, line_dash="dash", line_color="gold",
                   annotation_text="SDG 4 Target (95%)")
-    
+
     fig.update_layout(
         title="2030 Literacy Projections by Scenario",
         yaxis_title="Projected Literacy Rate (%)",
@@ -635,8 +835,18 @@ def render_2030_projections(projections_2030):
         height=500,
         showlegend=True
     )
+    return fig
+
+def render_2030_projections(projections_2030):
+    st.header("2030 SDG 4 Projections: Scenario Analysis")
+    
+    st.markdown("""
+    Prophet time-series forecasting with scenario-based outcomes for Sudan.
+    """)
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Create visualization showing all scenarios
+    fig = cached_figure(build_2030_projections_figure, projections_2030)
+    payload.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     
@@ -769,4 +979,78 @@ def render_policy_recommendations(aalni_data, projections_2030):
     **Learn from Precedents:**
     - Afghanistan, Rwanda, Colombia demonstrate phased approach works
     - Humanitarian response during conflict → Systemic transformation post-conflict
-    """)
\ No newline at end of file
+    """)
+
+# ============================================================================
+# DATA EXPLORER
+# ============================================================================
+# Beyond this many lines a trend chart is unreadable (and heavy to ship); the table has them all
+MAX_TREND_SERIES = 20
+
+def build_indicator_trend_figure(series, indicator):
+    fig = px.line(series, x='Year', y='Value', color='Country', markers=True,
+                  title=indicator.replace('_', ' '))
+    fig.update_layout(height=450, yaxis_title=indicator.replace('_', ' '), hovermode='x unified')
+    return fig
+
+def render_data_explorer(cube):
+    st.header("Panel Data Explorer")
+    
+    st.markdown("""
+    Filter the quarterly panel by country, year range and indicator. Values come from a 
+    cube aggregated once per data version, so changing a filter only indexes into it.
+    """)
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        countries = st.multiselect("Countries", cube.countries, default=cube.countries[:MAX_TREND_SERIES])
+    with col2:
+        stat = st.radio("Aggregate", ['mean', 'sum', 'last'], horizontal=True,
+                        help="How quarterly observations are combined within each year")
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        # Only years the panel observes are offered
+        start = next((year for year in cube.years if year >= 2014), cube.years[0])
+        year_range = st.select_slider("Years", cube.years, (start, cube.years[-1]))
+    with col2:
+        indicators = st.multiselect("Indicators", cube.indicators, default=['Adult_Literacy_Rate'])
+    
+    if not countries or not indicators:
+        st.info("Select at least one country and one indicator.")
+        return
+    
+    charted = countries[:MAX_TREND_SERIES]
+    series = cube.series(charted, year_range, indicators, stat)
+    if len(countries) > MAX_TREND_SERIES:
+        st.caption(f"Charts show the first {MAX_TREND_SERIES} of {len(countries)} selected; "
+                   "the summary table has all of them.")
+    for indicator in indicators:
+        trend = series[series['Indicator'] == indicator]
+        if len(trend):
+            fig = session_cached('trend_figures', cube, (tuple(charted), year_range, indicator, stat),
+                                 lambda: build_indicator_trend_figure(trend, indicator))
+            payload.plotly_chart(fig, use_container_width=True)
+        else:
+            st.caption(f"No {indicator.replace('_', ' ')} observations in {year_range[0]}-{year_range[1]}.")
+    
+    st.subheader(f"{year_range[0]}-{year_range[1]} Summary ({stat})")
+    payload.dataframe(cube.totals(countries, year_range, indicators, stat).round(2), 'explorer_totals',
+                      use_container_width=True)
+
+# ============================================================================
+# PAGE FIGURES
+# ============================================================================
+# Default figures per page as (builder, dashboard frame names), used for warm-up
+PAGE_FIGURES = {
+    "Executive Summary": [],
+    "AALNI Rankings": [(build_aalni_scores_figure, ['aalni_data']),
+                       (build_phase1_allocation_figure, ['aalni_data'])],
+    "Morocco Case Study": [(build_morocco_timeline_figure, ['morocco_timeline'])],
+    "Sudan Conflict Analysis": [(build_sudan_conflict_figure, ['sudan_conflict'])],
+    "Cost-Effectiveness": [(build_cost_per_point_figure, ['cost_effectiveness'])],
+    "Feature Importance (88.9% Rule)": [(build_feature_importance_figure, ['feature_importance'])],
+    "2030 Projections": [(build_2030_projections_figure, ['projections_2030'])],
+    "Policy Recommendations": [],
+    "Data Explorer": [],
+}
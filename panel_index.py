@@ -0,0 +1,179 @@
+"""
+Panel index for the Abraham Accords Literacy Dashboard
+Sorts the panel by (region, date) once and keeps per-region row offsets, so a
+region's rows are a contiguous slice and per-region lags, differences, rolling
+windows and as-of-date lookups are array operations instead of boolean masks
+over the whole panel.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class PanelIndex:
+    """Panel rows ordered by (region, date) with offsets per region
+
+    Region i occupies rows offsets[i]:offsets[i + 1]. Rows sharing a region and
+    date (e.g. one row per program) stay adjacent in their original order.
+    """
+
+    def __init__(self, panel, region_col='CountryName', date_col='Date', id_col='CountryID'):
+        self.region_col = region_col
+        self.date_col = date_col
+
+        codes, self.regions = pd.factorize(panel[region_col], sort=True)
+        dates = pd.to_datetime(panel[date_col]).to_numpy()
+        self.unique_dates, date_codes = np.unique(dates, return_inverse=True)
+        order = np.lexsort((date_codes, codes))
+
+        self.frame = panel.iloc[order].reset_index(drop=True)
+        self.codes = codes[order]
+        self.dates = dates[order]
+        # (region, date) as one sorted integer key, for searchsorted lookups
+        self.keys = self.codes.astype(np.int64) * len(self.unique_dates) + date_codes[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(self.codes, minlength=len(self.regions)))])
+        # Position of each row within its region
+        self.positions = np.arange(len(self.codes)) - self.offsets[self.codes]
+
+        self._region_position = {region: idx for idx, region in enumerate(self.regions)}
+        if id_col in panel.columns:
+            # An ID is an alias only when it names a single region (not for sub-national panels)
+            ids = self.frame.groupby(id_col)[region_col].unique()
+            for region_id, names in ids.items():
+                if len(names) == 1:
+                    self._region_position.setdefault(region_id, self._region_position[names[0]])
+        self._columns = {}
+
+    @classmethod
+    def of(cls, panel):
+        """The panel itself if already indexed, else a new index over it"""
+        return panel if isinstance(panel, cls) else cls(panel)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, region):
+        return region in self._region_position
+
+    # ------------------------------------------------------------------------
+    # Slices
+    # ------------------------------------------------------------------------
+    def region_slice(self, region):
+        """slice of the sorted rows for a region name (or unambiguous ID)"""
+        try:
+            idx = self._region_position[region]
+        except KeyError:
+            raise KeyError(f"No panel rows for {region!r}") from None
+        return slice(self.offsets[idx], self.offsets[idx + 1])
+
+    def rows(self, region):
+        """The region's rows as a DataFrame slice of the sorted panel"""
+        return self.frame.iloc[self.region_slice(region)]
+
+    def column(self, name, dtype=float):
+        """Whole sorted column as a NumPy array, converted once and reused"""
+        key = (name, np.dtype(dtype))
+        if key not in self._columns:
+            self._columns[key] = self.frame[name].to_numpy(dtype=dtype)
+        return self._columns[key]
+
+    def mapped(self, name, mapping):
+        """Column mapped through a dict (e.g. status labels to codes) as floats, cached"""
+        key = (name, tuple(mapping.items()))
+        if key not in self._columns:
+            self._columns[key] = self.frame[name].map(mapping).to_numpy(dtype=float)
+        return self._columns[key]
+
+    def values(self, name, region, dtype=float):
+        """One region's values of a column: a view, not a copy"""
+        return self.column(name, dtype)[self.region_slice(region)]
+
+    def years(self):
+        return sorted(np.unique(self.dates.astype('datetime64[Y]').astype(int) + 1970).tolist())
+
+    # ------------------------------------------------------------------------
+    # Per-region transforms (full-length arrays aligned with self.frame)
+    # ------------------------------------------------------------------------
+    def lag(self, name, periods=1):
+        """Value `periods` rows earlier in the same region (negative: later), NaN at edges"""
+        values = self.column(name)
+        result = np.full(len(values), np.nan)
+        if periods >= 0:
+            result[periods:] = values[:len(values) - periods]
+            result[self.positions < periods] = np.nan
+        else:
+            result[:periods] = values[-periods:]
+            sizes = np.diff(self.offsets)[self.codes]
+            result[self.positions >= sizes + periods] = np.nan
+        return result
+
+    def diff(self, name, periods=1):
+        return self.column(name) - self.lag(name, periods)
+
+    def rolling(self, name, window, how='mean', min_periods=1):
+        """Trailing window of `window` rows within each region; NaNs are skipped"""
+        values = self.column(name)
+        present = ~np.isnan(values)
+        sums = np.concatenate([[0.0], np.cumsum(np.where(present, values, 0.0))])
+        counts = np.concatenate([[0], np.cumsum(present)])
+
+        end = np.arange(1, len(values) + 1)
+        start = np.maximum(end - window, self.offsets[self.codes])
+        total, count = sums[end] - sums[start], counts[end] - counts[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = {'mean': total / count, 'sum': total, 'count': count.astype(float)}[how]
+        return np.where(count >= min_periods, result, np.nan)
+
+    # ------------------------------------------------------------------------
+    # As-of lookups
+    # ------------------------------------------------------------------------
+    def asof_blocks(self, date):
+        """(region codes, start, stop) of each region's rows on its latest date <= date
+
+        Regions with no observation by then are left out.
+        """
+        rank = np.searchsorted(self.unique_dates, np.datetime64(pd.Timestamp(date), 'ns'), side='right') - 1
+        regions = np.arange(len(self.regions))
+        if rank < 0:
+            return regions[:0], regions[:0], regions[:0]
+        stop = np.searchsorted(self.keys, regions * len(self.unique_dates) + rank, side='right')
+        found = stop > self.offsets[:-1]
+        regions, stop = regions[found], stop[found]
+        start = np.searchsorted(self.keys, self.keys[stop - 1], side='left')
+        return regions, start, stop
+
+    def asof(self, date, columns, how='mean'):
+        """One row per region from its latest observation up to `date`
+
+        Rows sharing that date are combined with `how` ('mean', 'max' or 'last').
+        """
+        regions, start, stop = self.asof_blocks(date)
+        result = pd.DataFrame({self.region_col: self.regions[regions],
+                               self.date_col: self.dates[start]})
+        for name in columns:
+            result[name] = reduce_blocks(self.column(name), start, stop, how)
+        return result
+
+
+def reduce_blocks(values, start, stop, how='mean'):
+    """Reduce values[start[i]:stop[i]] for every i (blocks are short: loops over block length)"""
+    if how == 'last':
+        return values[stop - 1]
+    result = values[start].copy()
+    count = (~np.isnan(result)).astype(int)
+    if how == 'mean':
+        result = np.nan_to_num(result)
+    for step in range(1, int((stop - start).max(initial=1))):
+        rows = start + step
+        inside = rows < stop
+        current = values[rows[inside]]
+        if how == 'max':
+            result[inside] = np.fmax(result[inside], current)
+        else:
+            present = ~np.isnan(current)
+            result[inside] += np.where(present, current, 0.0)
+            count[inside] += present
+    if how == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(count > 0, result / count, np.nan)
+    return result
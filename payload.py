@@ -0,0 +1,129 @@
+"""
+Payload minimization for the Abraham Accords Literacy Dashboard
+Charts and tables go through these helpers instead of st.plotly_chart and
+st.dataframe. Figure arrays are rounded to SIGNIFICANT_DIGITS significant digits
+per value, dates at midnight are sent as plain dates, and the theme template is
+cut down to the trace types the figure actually draws. Long tables are paginated
+on the server, so a rerun only ships the visible page.
+
+Arrays stay JSON lists rather than base64 typed arrays: Streamlit 1.37's plotly.js
+(2.30) could decode those, but plotly 5.18's validators reject them in figure data.
+
+DASHBOARD_PAYLOAD_MODE=full turns all of this off (for comparison).
+"""
+
+import os
+import weakref
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+PAYLOAD_ENV_VAR = 'DASHBOARD_PAYLOAD_MODE'
+SIGNIFICANT_DIGITS = 5
+TABLE_PAGE_SIZE = 50
+
+# Layout template entries only read by traces with continuous color scales
+COLORSCALE_LAYOUT_KEYS = ('colorscale', 'coloraxis')
+COLORSCALE_TRACES = {'heatmap', 'contour', 'contourcarpet', 'histogram2d', 'histogram2dcontour',
+                     'surface', 'choropleth', 'choroplethmapbox', 'densitymapbox'}
+
+# Minimized copies by id() of the source figure, dropped when it is garbage collected
+_MINIMIZED = {}
+
+
+def minimal_payload():
+    return os.environ.get(PAYLOAD_ENV_VAR, 'minimal') != 'full'
+
+# ============================================================================
+# FIGURES
+# ============================================================================
+def quantize(values, significant=SIGNIFICANT_DIGITS):
+    """Round every element to `significant` significant digits of its own magnitude
+
+    Non-zero values never become 0 (log axes stay valid); 0, NaN and inf pass through.
+    """
+    values = np.asarray(values, dtype=float)
+    nonzero = np.isfinite(values) & (values != 0)
+    if not nonzero.any():
+        return values
+    decimals = significant - 1 - np.floor(np.log10(np.abs(values[nonzero]))).astype(int)
+    # Multiply or divide by an exact power of ten, so the results print as short decimals
+    up = np.power(10.0, np.maximum(decimals, 0))
+    down = np.power(10.0, np.maximum(-decimals, 0))
+    result = values.copy()
+    result[nonzero] = np.round(values[nonzero] * up / down) * down / up
+    return result
+
+
+def _compact(value, significant):
+    if isinstance(value, dict):
+        return {key: _compact(item, significant) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, float) for item in value):
+            return quantize(np.asarray(value), significant)
+        return [_compact(item, significant) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            return quantize(value, significant)
+        if value.dtype.kind == 'M':
+            days = value.astype('datetime64[D]')
+            # '2024-01-01' instead of '2024-01-01T00:00:00' for quarterly dates
+            if (days == value).all():
+                return np.datetime_as_string(days)
+    return value
+
+
+def _trim_template(template, trace_types):
+    """Keep template defaults only for the trace types in use"""
+    trimmed = dict(template)
+    trimmed['data'] = {name: styles for name, styles in template.get('data', {}).items()
+                       if name in trace_types}
+    if not trace_types & COLORSCALE_TRACES:
+        trimmed['layout'] = {key: item for key, item in template.get('layout', {}).items()
+                             if key not in COLORSCALE_LAYOUT_KEYS}
+    return trimmed
+
+
+def minimize_figure(fig, significant=SIGNIFICANT_DIGITS):
+    """Figure as a plain dict with quantized arrays and a trimmed template"""
+    spec = fig.to_plotly_json()
+    data = [_compact(trace, significant) for trace in spec['data']]
+    layout = dict(spec['layout'])
+    if 'template' in layout:
+        layout['template'] = _trim_template(layout['template'],
+                                            {trace.get('type', 'scatter') for trace in data})
+    return {'data': data, 'layout': layout}
+
+
+def minimized(fig):
+    """minimize_figure(fig) as a Figure, built once per figure object
+
+    st.plotly_chart validates a plain dict on every call but takes a Figure's
+    to_dict() as is, so cached figures are shrunk and validated only once.
+    """
+    key = id(fig)
+    if key not in _MINIMIZED:
+        _MINIMIZED[key] = go.Figure(minimize_figure(fig))
+        weakref.finalize(fig, _MINIMIZED.pop, key, None)
+    return _MINIMIZED[key]
+
+
+def plotly_chart(fig, **kwargs):
+    st.plotly_chart(minimized(fig) if minimal_payload() else fig, **kwargs)
+
+# ============================================================================
+# TABLES
+# ============================================================================
+def dataframe(frame, key, page_size=TABLE_PAGE_SIZE, **kwargs):
+    """st.dataframe that sends one page of a long table per rerun"""
+    if not minimal_payload() or len(frame) <= page_size:
+        st.dataframe(frame, **kwargs)
+        return
+
+    pages = -(-len(frame) // page_size)
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                           key=f"{key}_page")
+    start = (page - 1) * page_size
+    st.dataframe(frame.iloc[start:start + page_size], **kwargs)
+    st.caption(f"Rows {start + 1}-{min(start + page_size, len(frame))} of {len(frame)}")
@@ -0,0 +1,128 @@
+"""
+Payload benchmark for the Abraham Accords Literacy Dashboard
+Renders every page with AppTest in full and minimal payload mode and reports the
+serialized size of the elements sent to the browser (charts, tables, text and
+widgets). Optionally repeats the Data Explorer on a synthetic panel with many
+regions, with the default selection and with every region selected, after
+reporting the cube's build time and memory.
+
+Usage:
+    python payload_bench.py
+    python payload_bench.py --regions 10000
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from cube import IndicatorCube
+from payload import PAYLOAD_ENV_VAR
+from versioning import get_store
+
+ROOT = Path(__file__).parent
+APP_SCRIPT = str(ROOT / 'app.py')
+MODES = ['full', 'minimal']
+
+EXPLORER_SCRIPT = """
+import pickle
+import sys
+sys.path.insert(0, {root!r})
+import pages_content
+with open({cube_path!r}, 'rb') as handle:
+    cube = pickle.load(handle)
+pages_content.render_data_explorer(cube)
+"""
+
+
+def element_bytes(node):
+    """Serialized size of every element proto under a node of the AppTest tree"""
+    proto = getattr(node, 'proto', None)
+    size = proto.ByteSize() if hasattr(proto, 'ByteSize') else 0
+    return size + sum(element_bytes(child) for child in getattr(node, 'children', {}).values())
+
+
+def page_bytes(mode):
+    """{page: bytes} for one payload mode"""
+    os.environ[PAYLOAD_ENV_VAR] = mode
+    app = AppTest.from_file(APP_SCRIPT, default_timeout=120).run()
+    navigation = app.sidebar.radio[0]
+    sizes = {}
+    for page in navigation.options:
+        app.sidebar.radio[0].set_value(page).run()
+        if app.exception:
+            raise RuntimeError(f"{page}: {app.exception[0].value}")
+        sizes[page] = element_bytes(app._tree)
+    return sizes
+
+# ============================================================================
+# SYNTHETIC PANEL
+# ============================================================================
+def synthetic_panel(regions, seed=0):
+    """The dashboard panel repeated as `regions` regions with per-region noise"""
+    panel = get_store().get('panel')
+    countries = panel['CountryName'].unique()
+    rng = np.random.default_rng(seed)
+    numeric = [col for col in panel.columns
+               if pd.api.types.is_float_dtype(panel[col]) and col not in ('Year', 'Year_Numeric')]
+    frames = []
+    for idx in range(regions):
+        rows = panel[panel['CountryName'] == countries[idx % len(countries)]].copy()
+        rows['CountryName'] = f"{countries[idx % len(countries)]} Region {idx:05d}"
+        rows[numeric] = rows[numeric] * rng.normal(1.0, 0.05)
+        frames.append(rows)
+    return pd.concat(frames, ignore_index=True)
+
+
+def explorer_bytes(cube_path, mode, select_all):
+    os.environ[PAYLOAD_ENV_VAR] = mode
+    script = EXPLORER_SCRIPT.format(root=str(ROOT), cube_path=cube_path)
+    app = AppTest.from_string(script, default_timeout=600).run()
+    if select_all:
+        app.multiselect[0].set_value(list(app.multiselect[0].options)).run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return element_bytes(app._tree)
+
+
+def format_row(label, full, minimal):
+    return f"{label:<36} {full:>12,} {minimal:>12,} {1 - minimal / full:>8.0%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bytes sent per page, full vs minimal payload mode')
+    parser.add_argument('--regions', type=int, default=0,
+                        help='also benchmark the Data Explorer on a synthetic panel with this many regions')
+    args = parser.parse_args()
+
+    print(f"{'page':<36} {'full B':>12} {'minimal B':>12} {'saved':>8}")
+    sizes = {mode: page_bytes(mode) for mode in MODES}
+    for page in sizes['full']:
+        print(format_row(page, sizes['full'][page], sizes['minimal'][page]), flush=True)
+    print(format_row('all pages', sum(sizes['full'].values()), sum(sizes['minimal'].values())))
+
+    if args.regions:
+        panel = synthetic_panel(args.regions)
+        started = time.perf_counter()
+        cube = IndicatorCube(panel)
+        print(f"Cube for {args.regions:,} regions ({len(panel):,} rows, {len(cube.years)} years): "
+              f"built in {time.perf_counter() - started:.2f} s, {cube.nbytes / 1e6:,.0f} MB of arrays", flush=True)
+        with tempfile.NamedTemporaryFile(suffix='.pkl', delete=False) as handle:
+            pickle.dump(cube, handle)
+        try:
+            for select_all in (False, True):
+                label = f"Explorer, {args.regions:,} regions" + (', all selected' if select_all else '')
+                full, minimal = (explorer_bytes(handle.name, mode, select_all) for mode in MODES)
+                print(format_row(label, full, minimal), flush=True)
+        finally:
+            os.unlink(handle.name)
+
+
+if __name__ == '__main__':
+    main()
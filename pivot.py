@@ -0,0 +1,260 @@
+"""
+Long <-> wide pivot engine for the Abraham Accords Literacy Dashboard
+Builds abraham_accords_wide_dataset.csv-style views from the long master dataset
+(and back) using integer country/indicator indexes and a dense value matrix.
+"""
+
+import csv
+
+import numpy as np
+import pandas as pd
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+VALUE_COLUMNS = ['Total_Value', 'Male_Value', 'Female_Value', 'Urban_Value', 'Rural_Value']
+
+ROW_META_COLUMNS = ['Data_Year', 'Source', 'Confidence_Level', 'Notes']
+
+MASTER_COLUMNS = ['Country', 'Indicator_Category', 'Indicator_Name'] + VALUE_COLUMNS + ROW_META_COLUMNS
+
+WIDE_META_COLUMNS = ['Data_Year', 'Source_Primary']
+
+# Indicator whose Data_Year / Source fill the wide metadata columns
+PRIMARY_INDICATOR = 'Adult_Literacy_Rate_15plus'
+
+# (Indicator_Name, value column) -> wide column, where it differs from the default naming
+WIDE_COLUMN_NAMES = {
+    ('Adult_Literacy_Rate_15plus', 'Total_Value'): 'Adult_Literacy_Total',
+    ('Adult_Literacy_Rate_15plus', 'Male_Value'): 'Adult_Literacy_Male',
+    ('Adult_Literacy_Rate_15plus', 'Female_Value'): 'Adult_Literacy_Female',
+    ('Adult_Literacy_Rate_15plus', 'Urban_Value'): 'Urban_Literacy_Rate',
+    ('Adult_Literacy_Rate_15plus', 'Rural_Value'): 'Rural_Literacy_Rate',
+    ('Youth_Literacy_Rate_15to24', 'Total_Value'): 'Youth_Literacy_Total',
+    ('Youth_Literacy_Rate_15to24', 'Male_Value'): 'Youth_Literacy_Male',
+    ('Youth_Literacy_Rate_15to24', 'Female_Value'): 'Youth_Literacy_Female',
+    ('Illiterate_Population_Millions', 'Male_Value'): 'Illiterate_Male_Millions',
+    ('Illiterate_Population_Millions', 'Female_Value'): 'Illiterate_Female_Millions',
+    ('Rural_Urban_Literacy_Gap_Points', 'Total_Value'): 'Rural_Urban_Literacy_Gap',
+}
+LONG_KEYS = {wide: key for key, wide in WIDE_COLUMN_NAMES.items()}
+
+
+def wide_column_name(indicator, value_column):
+    """Wide column for an (indicator, value column) pair"""
+    if (indicator, value_column) in WIDE_COLUMN_NAMES:
+        return WIDE_COLUMN_NAMES[(indicator, value_column)]
+    if value_column == 'Total_Value':
+        return indicator
+    return f"{indicator}_{value_column[:-len('_Value')]}"
+
+
+def long_key(wide_column):
+    """Inverse of wide_column_name: wide column -> (indicator, value column)"""
+    if wide_column in LONG_KEYS:
+        return LONG_KEYS[wide_column]
+    for value_column in VALUE_COLUMNS[1:]:
+        suffix = '_' + value_column[:-len('_Value')]
+        if wide_column.endswith(suffix):
+            return wide_column[:-len(suffix)], value_column
+    return wide_column, 'Total_Value'
+
+# ============================================================================
+# LOADING
+# ============================================================================
+def read_master_dataset(path='data/abraham_accords_master_dataset.csv'):
+    """Read the long master dataset, tolerating rows with a stray empty value field"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        records = []
+        for row in reader:
+            if not any(field.strip() for field in row):
+                continue
+            # Some Disparities rows carry one extra empty field among the value columns
+            while len(row) > len(header) and '' in row[4:9]:
+                del row[4 + row[4:9].index('')]
+            records.append(row[:len(header)] + [''] * (len(header) - len(row)))
+
+    long_df = pd.DataFrame(records, columns=header)
+    for column in VALUE_COLUMNS:
+        long_df[column] = pd.to_numeric(long_df[column], errors='coerce')
+    return long_df
+
+
+def _unstack(values, row_labels, column_keys):
+    """Turn a dense (row x wide column) matrix into long rows without pivot_table"""
+    indicators, indicator_codes = np.unique([key[0] for key in column_keys], return_inverse=True)
+    slots = np.array([VALUE_COLUMNS.index(key[1]) for key in column_keys], dtype=np.intp)
+
+    rows, cols = np.nonzero(~np.isnan(values))
+    pair = rows * len(indicators) + indicator_codes[cols]
+    pair_codes, pairs = pd.factorize(pair, sort=True)
+
+    out = np.full((len(pairs), len(VALUE_COLUMNS)), np.nan)
+    out[pair_codes, slots[cols]] = values[rows, cols]
+
+    long_df = pd.DataFrame(out, columns=VALUE_COLUMNS)
+    long_df.insert(0, 'Country', np.asarray(row_labels, dtype=object)[pairs // len(indicators)])
+    long_df.insert(1, 'Indicator_Name', indicators[pairs % len(indicators)])
+    return long_df
+
+
+def wide_to_long(wide_df, categories=None):
+    """Convert a wide dataset (one row per country) back to master long format"""
+    value_cols = [col for col in wide_df.columns if col != 'Country' and col not in WIDE_META_COLUMNS]
+    values = wide_df[value_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+    long_df = _unstack(values, wide_df['Country'].to_numpy(), [long_key(col) for col in value_cols])
+    long_df.insert(1, 'Indicator_Category', long_df['Indicator_Name'].map(categories or {}).fillna(''))
+
+    meta = wide_df.set_index('Country')
+    long_df['Data_Year'] = long_df['Country'].map(meta['Data_Year']) if 'Data_Year' in meta else ''
+    long_df['Source'] = long_df['Country'].map(meta['Source_Primary']) if 'Source_Primary' in meta else ''
+    long_df['Confidence_Level'] = ''
+    long_df['Notes'] = ''
+    return long_df[MASTER_COLUMNS]
+
+# ============================================================================
+# PIVOT ENGINE
+# ============================================================================
+class PivotEngine:
+    """Dense country x (indicator, value column) matrix with a cached wide view
+
+    Countries and indicator columns are assigned stable integer positions once;
+    updates write into the matrix in place and patch only the affected columns
+    of the cached wide frame.
+    """
+
+    def __init__(self, long_df):
+        long_df = long_df.reset_index(drop=True)
+        country_codes, countries = pd.factorize(long_df['Country'])
+        indicator_codes, indicators = pd.factorize(long_df['Indicator_Name'])
+
+        stacked = long_df[VALUE_COLUMNS].to_numpy(dtype=float)
+        rows, slots = np.nonzero(~np.isnan(stacked))
+        col_codes, col_pairs = pd.factorize(indicator_codes[rows] * len(VALUE_COLUMNS) + slots)
+
+        self.country_index = {country: idx for idx, country in enumerate(countries)}
+        self.column_keys = [(indicators[pair // len(VALUE_COLUMNS)], VALUE_COLUMNS[pair % len(VALUE_COLUMNS)])
+                            for pair in col_pairs]
+        self.column_index = {key: idx for idx, key in enumerate(self.column_keys)}
+
+        self._values = np.full((max(len(countries), 1), max(len(col_pairs), 1)), np.nan)
+        self._values[country_codes[rows], col_codes] = stacked[rows, slots]
+
+        categories = long_df.drop_duplicates('Indicator_Name', keep='last')
+        self.categories = dict(zip(categories['Indicator_Name'], categories['Indicator_Category']))
+        self.row_meta = long_df.drop_duplicates(['Country', 'Indicator_Name'], keep='last') \
+            .set_index(['Country', 'Indicator_Name'])[ROW_META_COLUMNS]
+        primary = long_df[long_df['Indicator_Name'] == PRIMARY_INDICATOR]
+        self.data_year = dict(zip(primary['Country'], primary['Data_Year']))
+        self.source = dict(zip(primary['Country'], primary['Source']))
+
+        self._wide = None
+
+    @classmethod
+    def from_csv(cls, path='data/abraham_accords_master_dataset.csv'):
+        return cls(read_master_dataset(path))
+
+    @property
+    def countries(self):
+        return list(self.country_index)
+
+    @property
+    def values(self):
+        """View of the populated part of the matrix"""
+        return self._values[:len(self.country_index), :len(self.column_keys)]
+
+    def _grow(self, n_rows, n_cols):
+        """Reallocate with doubling so repeated appends stay amortized O(1)"""
+        rows, cols = self._values.shape
+        if n_rows <= rows and n_cols <= cols:
+            return
+        grown = np.full((max(n_rows, rows * 2 if n_rows > rows else rows),
+                         max(n_cols, cols * 2 if n_cols > cols else cols)), np.nan)
+        grown[:rows, :cols] = self._values
+        self._values = grown
+
+    def _country_position(self, country):
+        if country not in self.country_index:
+            self._grow(len(self.country_index) + 1, len(self.column_keys))
+            self.country_index[country] = len(self.country_index)
+            self._wide = None
+        return self.country_index[country]
+
+    def _column_position(self, key):
+        if key not in self.column_index:
+            self._grow(len(self.country_index), len(self.column_keys) + 1)
+            self.column_index[key] = len(self.column_keys)
+            self.column_keys.append(key)
+        return self.column_index[key]
+
+    def wide(self, countries=None):
+        """Wide view, one row per country, built once and patched on update"""
+        if self._wide is None:
+            wide_df = pd.DataFrame(self.values.copy(),
+                                   columns=[wide_column_name(*key) for key in self.column_keys])
+            wide_df.insert(0, 'Country', self.countries)
+            wide_df['Data_Year'] = wide_df['Country'].map(self.data_year)
+            wide_df['Source_Primary'] = wide_df['Country'].map(self.source)
+            self._wide = wide_df
+
+        if countries is None:
+            return self._wide
+        positions = [self.country_index[country] for country in countries]
+        return self._wide.iloc[positions].reset_index(drop=True)
+
+    def update_indicator(self, indicator, frame, category=None):
+        """Replace one indicator's values for the countries in frame
+
+        frame has a Country column plus any of the VALUE_COLUMNS and ROW_META_COLUMNS.
+        Metadata it leaves out is kept, or empty for (country, indicator) pairs it adds.
+        """
+        if category is not None:
+            self.categories[indicator] = category
+        self._update_meta(indicator, frame)
+
+        positions = np.array([self._country_position(country) for country in frame['Country']],
+                             dtype=np.intp)
+        touched = []
+        for value_column in VALUE_COLUMNS:
+            if value_column not in frame:
+                continue
+            col = self._column_position((indicator, value_column))
+            self._values[positions, col] = pd.to_numeric(frame[value_column], errors='coerce').to_numpy(dtype=float)
+            touched.append(col)
+
+        if self._wide is not None:
+            for col in touched:
+                name = wide_column_name(*self.column_keys[col])
+                if name not in self._wide:
+                    # Keep the metadata columns last, as in the wide dataset
+                    self._wide.insert(len(self._wide.columns) - len(WIDE_META_COLUMNS), name, np.nan)
+                self._wide[name] = self.values[:, col]
+
+    def _update_meta(self, indicator, frame):
+        keys = pd.MultiIndex.from_arrays([frame['Country'], [indicator] * len(frame)],
+                                         names=['Country', 'Indicator_Name'])
+        meta = self.row_meta.reindex(keys)
+        for column in ROW_META_COLUMNS:
+            if column in frame:
+                meta[column] = frame[column].to_numpy()
+        self.row_meta = pd.concat([self.row_meta.drop(keys, errors='ignore'), meta.fillna('')])
+
+        if indicator == PRIMARY_INDICATOR:
+            self.data_year.update(zip(frame['Country'], meta['Data_Year']))
+            self.source.update(zip(frame['Country'], meta['Source']))
+        for country in frame['Country']:
+            self.data_year.setdefault(country, '')
+            self.source.setdefault(country, '')
+        if self._wide is not None:
+            self._wide['Data_Year'] = self._wide['Country'].map(self.data_year)
+            self._wide['Source_Primary'] = self._wide['Country'].map(self.source)
+
+    def to_long(self):
+        """Long master-format view of the current matrix"""
+        long_df = _unstack(self.values, self.countries, self.column_keys)
+        long_df.insert(1, 'Indicator_Category', long_df['Indicator_Name'].map(self.categories).fillna(''))
+        long_df = long_df.join(self.row_meta, on=['Country', 'Indicator_Name'])
+        return long_df[MASTER_COLUMNS]
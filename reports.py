@@ -0,0 +1,357 @@
+"""
+Batch report generation for the Abraham Accords Literacy Dashboard
+Writes a donor brief per country and per scenario (AALNI breakdown, literacy
+trajectory, cost comparison, projections and allocation) as standalone HTML,
+using the pages_content chart builders. Figures are rendered in a process pool,
+figures shared by many reports are rendered once, and reports whose inputs are
+unchanged since the last run are skipped.
+
+Usage:
+    python reports.py [--out reports] [--countries Sudan,Morocco] [--workers 4] [--force]
+    python reports.py --panel data/regional_panel.csv      # one report per region
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import pages_content
+from analytics import AALNI_WEIGHTS, aalni_scores, evaluate_scenario, investment_need
+from conflict_model import PHASE2_THRESHOLD, adjust_transitions
+from cube import IndicatorCube
+from pages_content import frame_fingerprint
+from panel_index import PanelIndex
+from versioning import get_store
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report layout changes so every report is regenerated
+REPORT_FORMAT_VERSION = 1
+MANIFEST_FILE = 'report_manifest.json'
+PLOTLY_JS_FILE = 'plotly.min.js'
+
+SCENARIOS = {
+    'phase1_only': {'title': 'Phase 1 Only (No Sudan Peace)', 'phase2_budget_m': 0.0,
+                    'de_escalation': 1.0},
+    'phase1_phase2': {'title': 'Phase 1 + Phase 2 (Peace by 2027)', 'phase2_budget_m': 357.5,
+                      'de_escalation': 1.0},
+    'best_case': {'title': 'Best Case (Early Peace)', 'phase2_budget_m': 357.5,
+                  'de_escalation': 3.0},
+}
+
+# Case-study charts that exist for specific countries
+COUNTRY_FIGURES = {
+    'Morocco': [('build_morocco_timeline_figure', 'morocco_timeline')],
+    'Sudan': [('build_sudan_conflict_figure', 'sudan_conflict')],
+}
+
+TRAJECTORY_INDICATORS = ['Adult_Literacy_Rate', 'Youth_Literacy_Rate']
+
+PAGE_STYLE = """
+body { font-family: -apple-system, 'Segoe UI', Roboto, sans-serif; margin: 0 auto; max-width: 1000px;
+       color: #1f2937; padding: 0 1.5rem 2rem; }
+.main-header { background: linear-gradient(90deg, #1e3a8a 0%, #3b82f6 100%); padding: 1.5rem;
+               border-radius: 10px; color: white; text-align: center; margin: 1.5rem 0; }
+h2 { border-bottom: 2px solid #3b82f6; padding-bottom: 0.3rem; margin-top: 2rem; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9em; }
+th, td { border: 1px solid #e5e7eb; padding: 0.35rem 0.6rem; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+th { background-color: #f8fafc; }
+.note { color: #6b7280; font-size: 0.85em; }
+@media print { .figure { page-break-inside: avoid; } h2 { page-break-after: avoid; } }
+"""
+
+# ============================================================================
+# REPORT SPECS
+# ============================================================================
+# A report is a list of sections; each section is one of
+#   ('heading', text) | ('text', text) | ('table', frame) | ('figure', builder name, [args])
+def _aalni_breakdown(row):
+    weights = pd.Series(AALNI_WEIGHTS)
+    values = row[list(AALNI_WEIGHTS)].astype(float)
+    return pd.DataFrame({
+        'Component': [name.replace('_', ' ') for name in weights.index],
+        'Value': values.to_numpy(),
+        'Weight': weights.to_numpy(),
+        'Weighted': (values * weights).to_numpy(),
+    })
+
+
+def country_report(country, scores, cube, frames):
+    row = scores.set_index('Country').loc[country]
+    summary = (f"AALNI score {row['AALNI_Score']:.1f} (rank {int(row['Rank'])} of {len(scores)}), "
+               f"observed {int(row['Observed_Year'])}. Conflict status: "
+               f"{row['Conflict_Status'].replace('_', ' ')} ({row['Conflict_Multiplier']:.1f}x multiplier).")
+    sections = [('heading', 'AALNI Breakdown'), ('text', summary),
+                ('table', _aalni_breakdown(row)),
+                ('figure', 'build_aalni_scores_figure', [frames['aalni_data']]),
+                ('heading', 'Literacy Trajectory')]
+
+    for indicator in TRAJECTORY_INDICATORS:
+        series = cube.series([country], None, [indicator], 'mean')
+        if len(series):
+            sections.append(('figure', 'build_indicator_trend_figure', [series, indicator]))
+    for builder, frame_name in COUNTRY_FIGURES.get(country, []):
+        sections.append(('figure', builder, [frames[frame_name]]))
+
+    costs = frames['cost_effectiveness']
+    programs = pages_content.build_comparison_table(costs)
+    sections += [('heading', 'Cost Comparison'),
+                 ('figure', 'build_cost_per_point_figure', [costs]),
+                 ('table', programs[programs['Country'] == country] if (programs['Country'] == country).any()
+                  else programs),
+                 ('heading', '2030 Projections'),
+                 ('figure', 'build_2030_projections_figure', [frames['projections_2030']])]
+
+    projections = frames['projections_2030']
+    if (projections['Country'] == country).any():
+        sections.append(('table', projections[projections['Country'] == country]))
+    return {'kind': 'country', 'id': country, 'title': f"{country}: Literacy Investment Brief",
+            'sections': sections}
+
+
+def scenario_report(key, scenario, scores, need, frames, conflict_model):
+    result = evaluate_scenario(scores, need, frames['projections_2030'], conflict_model,
+                               phase2_budget_m=scenario['phase2_budget_m'],
+                               de_escalation=scenario['de_escalation'])
+    trigger = result['phase2_trigger']
+    totals = result['totals']
+    expected_year = f"{trigger['expected_year']:.1f}" if trigger['expected_year'] else 'not reached'
+    summary = (f"Phase 1 budget ${totals['budget_m']:,.0f}M (${totals['reserve_m']:,.0f}M M&E reserve), "
+               f"Phase 2 budget ${totals['phase2_budget_m']:,.1f}M covering "
+               f"{totals['phase2_coverage']:.0%} of remaining need. Probability the conflict trigger "
+               f"(severity ≤ {PHASE2_THRESHOLD}) is met by the end of Phase 1: "
+               f"{trigger['probability_by_year_3']:.0%}; by year 6: {trigger['probability_by_year_6']:.0%}; "
+               f"expected year {expected_year}.")
+    outlook = conflict_model.trigger_summary(
+        years=6, transition=adjust_transitions(conflict_model.transition, 1.0, scenario['de_escalation']))
+    return {'kind': 'scenario', 'id': key, 'title': f"Scenario: {scenario['title']}",
+            'sections': [('heading', 'Summary'), ('text', summary),
+                         ('heading', 'Allocation'),
+                         ('figure', 'build_phase1_allocation_figure', [result['allocation']]),
+                         ('table', result['allocation']),
+                         ('heading', 'Phase 2 Trigger Outlook'),
+                         ('figure', 'build_conflict_outlook_figure', [outlook['by_year'], PHASE2_THRESHOLD]),
+                         ('heading', 'Expected 2030 Literacy'),
+                         ('table', result['expected_2030'])]}
+
+
+def _value_fingerprint(value, memo):
+    # Shared frames (cost table, projections) appear in every report; hash each object once
+    if isinstance(value, pd.DataFrame):
+        if id(value) not in memo:
+            memo[id(value)] = (value, frame_fingerprint(value))
+        return memo[id(value)][1]
+    return hashlib.sha1(repr(value).encode()).hexdigest()
+
+
+def section_key(section, memo):
+    return (section[0],) + tuple(_value_fingerprint(part, memo) if not isinstance(part, list)
+                                 else tuple(_value_fingerprint(arg, memo) for arg in part)
+                                 for part in section[1:])
+
+
+def add_fingerprints(reports):
+    """Attach section keys and an overall fingerprint to each report"""
+    memo = {}
+    for report in reports:
+        report['keys'] = [section_key(section, memo) for section in report['sections']]
+        digest = hashlib.sha1(f"{REPORT_FORMAT_VERSION}|{report['kind']}|{report['id']}|{report['title']}".encode())
+        for key in report['keys']:
+            digest.update(repr(key).encode())
+        report['fingerprint'] = digest.hexdigest()
+    return reports
+
+
+def report_filename(report):
+    slug = ''.join(ch if ch.isalnum() else '_' for ch in str(report['id'])).strip('_').lower()
+    return f"{report['kind']}_{slug}.html"
+
+# ============================================================================
+# RENDERING (runs in worker processes)
+# ============================================================================
+def render_figure(builder_name, args):
+    import plotly.io as pio
+    fig = getattr(pages_content, builder_name)(*args)
+    return pio.to_html(fig, full_html=False, include_plotlyjs=False, config={'displaylogo': False})
+
+
+def _render_figure_task(task):
+    key, builder_name, args = task
+    return key, render_figure(builder_name, args)
+
+
+def render_section(section):
+    kind = section[0]
+    if kind == 'heading':
+        return f"<h2>{html.escape(section[1])}</h2>"
+    if kind == 'text':
+        return f"<p>{html.escape(section[1])}</p>"
+    if kind == 'table':
+        frame = section[1].rename(columns=lambda col: str(col).replace('_', ' '))
+        return frame.to_html(index=False, float_format=lambda value: f"{value:,.2f}", na_rep='n/a', border=0)
+    if kind == 'html':
+        return f"<div class=\"figure\">{section[1]}</div>"
+    return f"<div class=\"figure\">{render_figure(section[1], section[2])}</div>"
+
+
+def render_report(task):
+    """Write one report; returns (report id, seconds)"""
+    report, path, data_version = task
+    start = time.perf_counter()
+    body = '\n'.join(render_section(section) for section in report['sections'])
+    page = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(report['title'])}</title>
+<script src="{PLOTLY_JS_FILE}"></script>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<div class="main-header"><h1>{html.escape(report['title'])}</h1>
+<div>Abraham Accords Literacy Initiative</div></div>
+{body}
+<p class="note">Data version {data_version}. Source: Abraham Accords Literacy Dashboard.</p>
+</body>
+</html>
+"""
+    Path(path).write_text(page, encoding='utf-8')
+    return report['id'], time.perf_counter() - start
+
+# ============================================================================
+# BATCH
+# ============================================================================
+def build_reports(store, panel=None, countries=None, scenarios=SCENARIOS):
+    """Report specs for the current data version (no rendering yet)"""
+    snapshot = store.snapshot
+    frames = {name: store.get(name, snapshot) for name in
+              ('aalni_data', 'cost_effectiveness', 'projections_2030', 'morocco_timeline', 'sudan_conflict')}
+    published = store.get('aalni_scores', snapshot)
+    economic_constraint = dict(zip(published['CountryName'], published['Economic_Constraint']))
+
+    national = store.get('panel_index', snapshot)
+    if panel is None:
+        index, cube = national, store.get('cube', snapshot)
+        region_constraint = economic_constraint
+    else:
+        index, cube = PanelIndex(panel), IndicatorCube(panel)
+        # Sub-national regions inherit their country's economic constraint
+        by_id = dict(zip(published['CountryID'], published['Economic_Constraint']))
+        names = panel[['CountryName', 'CountryID']].drop_duplicates('CountryName')
+        region_constraint = dict(zip(names['CountryName'], names['CountryID'].map(by_id)))
+    scores = aalni_scores(index, index.years()[-1], region_constraint)
+    committed = dict(zip(frames['aalni_data']['Country'], frames['aalni_data']['Total_Need_M']))
+
+    reports = [country_report(country, scores, cube, frames)
+               for country in (countries or scores['Country'])]
+    if scenarios:
+        national_scores = aalni_scores(national, national.years()[-1], economic_constraint)
+        need = investment_need(national_scores, committed)
+        conflict_model = store.get('sudan_conflict_model', snapshot)
+        reports += [scenario_report(key, scenario, national_scores, need, frames, conflict_model)
+                    for key, scenario in scenarios.items()]
+    return reports
+
+
+def _share_common_figures(reports, pool):
+    """Render figures that appear in more than one report once, in the pool"""
+    counts = Counter(key for report in reports for key in report['keys'] if key[0] == 'figure')
+    shared = {}
+    for report in reports:
+        for section, key in zip(report['sections'], report['keys']):
+            if key[0] == 'figure' and counts[key] > 1 and key not in shared:
+                shared[key] = (key, section[1], section[2])
+
+    rendered = dict(pool.map(_render_figure_task, shared.values()))
+    for report in reports:
+        report['sections'] = [('html', rendered[key]) if key in rendered else section
+                              for section, key in zip(report['sections'], report['keys'])]
+    return len(rendered)
+
+
+def _write_index(out_dir, manifest):
+    links = '\n'.join(f"<li><a href=\"{entry['file']}\">{html.escape(entry['title'])}</a></li>"
+                      for entry in sorted(manifest.values(), key=lambda entry: (entry['kind'], entry['title'])))
+    (out_dir / 'index.html').write_text(
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Reports</title>"
+        f"<style>{PAGE_STYLE}</style></head><body><div class=\"main-header\"><h1>Donor Briefs</h1></div>"
+        f"<ul>{links}</ul></body></html>\n", encoding='utf-8')
+
+
+def generate_reports(out_dir='reports', panel=None, countries=None, scenarios=SCENARIOS,
+                     workers=None, force=False, store=None):
+    """Render every report whose inputs changed; returns a summary dict"""
+    start = time.perf_counter()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    store = store or get_store()
+    manifest_path = out_dir / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    reports = add_fingerprints(build_reports(store, panel, countries, scenarios))
+    pending = []
+    for report in reports:
+        report_id = f"{report['kind']}:{report['id']}"
+        fingerprint = report['fingerprint']
+        path = out_dir / report_filename(report)
+        entry = manifest.get(report_id)
+        if not force and entry and entry['fingerprint'] == fingerprint and path.exists():
+            continue
+        manifest[report_id] = {'kind': report['kind'], 'title': report['title'],
+                               'file': path.name, 'fingerprint': fingerprint}
+        pending.append((report, str(path), store.version))
+
+    if not (out_dir / PLOTLY_JS_FILE).exists():
+        from plotly.offline import get_plotlyjs
+        (out_dir / PLOTLY_JS_FILE).write_text(get_plotlyjs(), encoding='utf-8')
+
+    shared = 0
+    if pending:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shared = _share_common_figures([task[0] for task in pending], pool)
+            # Batches keep per-task pickling overhead low with hundreds of reports
+            list(pool.map(render_report, pending, chunksize=max(1, len(pending) // (4 * workers))))
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    _write_index(out_dir, manifest)
+    summary = {'reports': len(reports), 'rendered': len(pending), 'skipped': len(reports) - len(pending),
+               'shared_figures': shared, 'seconds': time.perf_counter() - start}
+    logger.info("Reports: %(rendered)d rendered, %(skipped)d unchanged, %(shared_figures)d shared figures, "
+                "%(seconds).1fs", summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate per-country and per-scenario donor briefs')
+    parser.add_argument('--out', default='reports', help='output directory')
+    parser.add_argument('--countries', help='comma-separated country/region names (default: all)')
+    parser.add_argument('--panel', help='panel CSV to report on instead of the dashboard panel')
+    parser.add_argument('--no-scenarios', action='store_true', help='skip scenario reports')
+    parser.add_argument('--workers', type=int, help='render processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='regenerate unchanged reports too')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    summary = generate_reports(
+        args.out,
+        panel=pd.read_csv(args.panel) if args.panel else None,
+        countries=args.countries.split(',') if args.countries else None,
+        scenarios=None if args.no_scenarios else SCENARIOS,
+        workers=args.workers, force=args.force)
+    print(f"{summary['rendered']} reports written, {summary['skipped']} unchanged "
+          f"({summary['seconds']:.1f}s) -> {args.out}/index.html")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""
+Multi-process serving for the Abraham Accords Literacy Dashboard
+Starts several Streamlit workers (each through the warm-up launcher) behind a
+local reverse proxy, so a CPU-heavy rerun in one session no longer stalls the
+others. Workers share derived datasets and figures through a SQLite cache.
+
+Sessions are pinned to a worker with a cookie: a Streamlit session lives on one
+worker's websocket, and media files are served by the worker that created them.
+
+Usage:
+    python serve.py --workers 4 --port 7860
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+import tornado.httpclient
+import tornado.ioloop
+import tornado.web
+import tornado.websocket
+
+from shared_cache import CACHE_ENV_VAR
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SCRIPT = str(Path(__file__).with_name('warmup.py'))
+WORKER_COOKIE = 'dashboard_worker'
+STREAM_PATH = '/_stcore/stream'
+HEALTH_PATH = '/_stcore/health'
+
+# Hop-by-hop headers are per connection and must not be forwarded
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+                      'te', 'trailer', 'transfer-encoding', 'upgrade', 'content-length'}
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+class WorkerPool:
+    """Streamlit worker processes on consecutive local ports"""
+
+    def __init__(self, n_workers, first_port, cache_path, streamlit_args=()):
+        self.ports = [first_port + idx for idx in range(n_workers)]
+        self.cache_path = str(cache_path)
+        self.streamlit_args = list(streamlit_args)
+        self.processes = []
+        self.sessions = [0] * n_workers
+        self._round_robin = itertools.cycle(range(n_workers))
+
+    def start(self, timeout=120):
+        # Same cookie secret everywhere, so XSRF tokens validate on any worker
+        env = dict(os.environ, **{CACHE_ENV_VAR: self.cache_path,
+                                  'STREAMLIT_SERVER_COOKIE_SECRET': secrets.token_hex(16)})
+
+        for idx, port in enumerate(self.ports):
+            command = [sys.executable, WARMUP_SCRIPT,
+                       '--server.port', str(port),
+                       '--server.address', '127.0.0.1',
+                       '--server.headless', 'true',
+                       '--browser.gatherUsageStats', 'false'] + self.streamlit_args
+            self.processes.append(subprocess.Popen(command, env=env))
+            # The first worker fills the shared cache; the rest start warm from it
+            if idx == 0:
+                self.wait_healthy([port], timeout)
+
+        self.wait_healthy(self.ports[1:], timeout)
+
+    def wait_healthy(self, ports, timeout):
+        deadline = time.monotonic() + timeout
+        pending = list(ports)
+        while pending:
+            port = pending[0]
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{HEALTH_PATH}", timeout=2) as response:
+                    if response.status == 200:
+                        pending.pop(0)
+                        continue
+            except OSError:
+                pass
+            if any(process.poll() is not None for process in self.processes):
+                raise RuntimeError('A Streamlit worker exited during startup')
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Worker on port {port} not healthy after {timeout}s")
+            time.sleep(0.25)
+
+    def stop(self):
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def pick(self, handler):
+        """Worker index from the sticky cookie, else the worker with the fewest sessions"""
+        cookie = handler.get_cookie(WORKER_COOKIE)
+        if cookie is not None and cookie.isdigit() and int(cookie) < len(self.ports):
+            return int(cookie)
+        fewest = min(self.sessions)
+        candidates = [idx for idx, count in enumerate(self.sessions) if count == fewest]
+        while True:
+            idx = next(self._round_robin)
+            if idx in candidates:
+                return idx
+
+# ============================================================================
+# PROXY
+# ============================================================================
+def _forward_headers(headers):
+    # Host is kept so the workers' websocket origin check sees the public address
+    return {name: value for name, value in headers.get_all() if name.lower() not in HOP_BY_HOP_HEADERS}
+
+
+class HttpProxyHandler(tornado.web.RequestHandler):
+    SUPPORTED_METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'OPTIONS', 'PATCH')
+
+    def initialize(self, pool):
+        self.pool = pool
+
+    async def _proxy(self):
+        idx = self.pool.pick(self)
+        request = tornado.httpclient.HTTPRequest(
+            f"http://127.0.0.1:{self.pool.ports[idx]}{self.request.uri}",
+            method=self.request.method,
+            headers=_forward_headers(self.request.headers),
+            body=self.request.body if self.request.method in ('POST', 'PUT', 'PATCH') else None,
+            follow_redirects=False,
+            decompress_response=False,
+            request_timeout=300,
+        )
+        response = await tornado.httpclient.AsyncHTTPClient().fetch(request, raise_error=False)
+        if response.code == 599:
+            raise tornado.web.HTTPError(502, f"Worker {idx} unavailable: {response.error}")
+
+        self.set_status(response.code, response.reason)
+        self.clear_header('Content-Type')
+        for name, value in response.headers.get_all():
+            if name.lower() in HOP_BY_HOP_HEADERS:
+                continue
+            if name.lower() in ('set-cookie', 'vary'):
+                self.add_header(name, value)
+            else:
+                self.set_header(name, value)
+        self.set_cookie(WORKER_COOKIE, str(idx), httponly=True, samesite='Lax')
+        if response.body and self.request.method != 'HEAD':
+            self.write(response.body)
+
+    get = head = post = put = delete = options = patch = _proxy
+
+    def compute_etag(self):
+        # Workers set their own ETags; do not add a proxy-level one
+        return None
+
+
+class StreamProxyHandler(tornado.websocket.WebSocketHandler):
+    """Relays one browser session's websocket to its worker"""
+
+    def initialize(self, pool):
+        self.pool = pool
+        self.upstream = None
+        self.worker = None
+
+    def select_subprotocol(self, subprotocols):
+        return subprotocols[0] if subprotocols else None
+
+    async def open(self, *args, **kwargs):
+        self.worker = self.pool.pick(self)
+        self.pool.sessions[self.worker] += 1
+        headers = _forward_headers(self.request.headers)
+        subprotocols = [p.strip() for p in self.request.headers.get('Sec-WebSocket-Protocol', '').split(',')
+                        if p.strip()]
+        for name in list(headers):
+            if name.lower().startswith('sec-websocket'):
+                del headers[name]
+        request = tornado.httpclient.HTTPRequest(
+            f"ws://127.0.0.1:{self.pool.ports[self.worker]}{self.request.uri}", headers=headers)
+        try:
+            self.upstream = await tornado.websocket.websocket_connect(
+                request, on_message_callback=self._from_worker, subprotocols=subprotocols or None,
+                max_message_size=self.settings.get('websocket_max_message_size', 200 * 1024 * 1024))
+        except Exception as exc:
+            logger.warning("Worker %d refused websocket: %s", self.worker, exc)
+            self.close(1011, 'worker unavailable')
+
+    def _from_worker(self, message):
+        if message is None:
+            self.close()
+            return
+        try:
+            self.write_message(message, binary=isinstance(message, bytes))
+        except tornado.websocket.WebSocketClosedError:
+            pass
+
+    def on_message(self, message):
+        if self.upstream is not None:
+            self.upstream.write_message(message, binary=isinstance(message, bytes))
+
+    def on_close(self):
+        if self.worker is not None:
+            self.pool.sessions[self.worker] -= 1
+            self.worker = None
+        if self.upstream is not None:
+            self.upstream.close()
+            self.upstream = None
+
+
+def make_proxy_app(pool):
+    return tornado.web.Application([
+        (STREAM_PATH, StreamProxyHandler, {'pool': pool}),
+        (r'.*', HttpProxyHandler, {'pool': pool}),
+    ], websocket_max_message_size=200 * 1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the dashboard from several Streamlit workers')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--port', type=int, default=7860, help='public proxy port')
+    parser.add_argument('--address', default='0.0.0.0')
+    parser.add_argument('--worker-port', type=int, default=8601, help='first worker port')
+    parser.add_argument('--cache-db', default=str(Path(tempfile.gettempdir()) / 'dashboard_cache.sqlite'))
+    args, streamlit_args = parser.parse_known_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    # Start from an empty cache so entries pickled by an older code version are never served
+    for suffix in ('', '-wal', '-shm'):
+        Path(args.cache_db + suffix).unlink(missing_ok=True)
+
+    pool = WorkerPool(args.workers, args.worker_port, args.cache_db, streamlit_args)
+    try:
+        pool.start()
+        make_proxy_app(pool).listen(args.port, address=args.address, xheaders=True)
+        logger.info("Serving %d workers (ports %s) on http://%s:%d", args.workers,
+                    ', '.join(map(str, pool.ports)), args.address, args.port)
+
+        loop = tornado.ioloop.IOLoop.current()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: loop.add_callback_from_signal(loop.stop))
+        loop.start()
+    finally:
+        pool.stop()
+
+
+if __name__ == '__main__':
+    main()
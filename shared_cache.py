@@ -0,0 +1,97 @@
+"""
+Shared cache backend for the Abraham Accords Literacy Dashboard
+SQLite-backed key/value store that lets several Streamlit worker processes share
+derived datasets and figures, so only the first worker pays to build them.
+
+Enabled by pointing DASHBOARD_SHARED_CACHE at a database file (serve.py does this
+for its workers); without it every process keeps its own in-memory caches.
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV_VAR = 'DASHBOARD_SHARED_CACHE'
+
+
+class SharedCache:
+    """Pickled values keyed by string, safe for concurrent processes and threads"""
+
+    def __init__(self, path, timeout=30.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS cache ('
+                         'key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL)')
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections must not cross threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def get(self, key, default=None):
+        row = self._connect().execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return default
+        try:
+            return pickle.loads(row[0])
+        except Exception as exc:
+            logger.warning("Dropping unreadable cache entry %s: %s", key, exc)
+            self.delete(key)
+            return default
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO cache (key, value, created) VALUES (?, ?, ?)',
+                         (key, blob, time.time()))
+
+    def delete(self, key):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def delete_prefix(self, prefix):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def get_or_build(self, key, build):
+        """Cached value for key, building and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = build()
+            try:
+                self.set(key, value)
+            except (pickle.PicklingError, TypeError, AttributeError) as exc:
+                logger.warning("Not sharing %s (not picklable): %s", key, exc)
+        return value
+
+    def keys(self, prefix=''):
+        rows = self._connect().execute(
+            "SELECT key FROM cache WHERE substr(key, 1, ?) = ? ORDER BY key", (len(prefix), prefix))
+        return [row[0] for row in rows]
+
+
+_SHARED = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_cache():
+    """Process-wide SharedCache from DASHBOARD_SHARED_CACHE, or None when not configured"""
+    global _SHARED
+    path = os.environ.get(CACHE_ENV_VAR)
+    if not path:
+        return None
+    with _SHARED_LOCK:
+        if _SHARED is None or _SHARED.path != path:
+            _SHARED = SharedCache(path)
+        return _SHARED
@@ -0,0 +1,194 @@
+"""
+Result snapshots for the Abraham Accords Literacy Dashboard
+Stores model outputs (AALNI scores, forecasts, cost rankings, feature importances)
+as typed Arrow IPC files with schema metadata instead of CSV float dumps. Floats
+are narrowed to float32 and snapshots are read back through a memory map. CSV
+copies are an opt-in side output. A snapshot records the hash of the CSV it was
+written with; if that CSV is edited, reads convert it in memory until the
+snapshot is regenerated. Reading never writes to disk.
+
+Usage:
+    python snapshots.py            # convert results/*.csv to results/*.arrow
+    python snapshots.py --csv      # ...and write CSV copies alongside the snapshots
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = '.arrow'
+SCHEMA_VERSION = 1
+# Suffix of snapshots still being written; the manifest scan skips these files
+PARTIAL_SUFFIX = '.partial'
+
+# Model outputs, as {dataset name: results file stem}
+RESULT_SNAPSHOTS = {
+    'aalni_scores': 'aalni_scores_2024',
+    'forecast': '2030_forecast_results',
+    'cost_rankings': 'cost_effectiveness_rankings',
+    'feature_rankings': 'feature_importance_rankings',
+}
+RESULT_NAMES = {stem: name for name, stem in RESULT_SNAPSHOTS.items()}
+
+# Schema metadata key holding the sha256 of the snapshot's CSV copy
+CSV_HASH_KEY = 'csv_sha256'
+
+# ============================================================================
+# TYPING
+# ============================================================================
+def _arrow_type(series):
+    """Narrowest Arrow type that holds the column without losing meaning"""
+    if pd.api.types.is_bool_dtype(series):
+        return pa.bool_()
+    if pd.api.types.is_integer_dtype(series):
+        info = np.iinfo(np.int32)
+        in_range = series.empty or (series.min() >= info.min and series.max() <= info.max)
+        return pa.int32() if in_range else pa.int64()
+    if pd.api.types.is_float_dtype(series):
+        return pa.float32()
+    return pa.string()
+
+
+def to_arrow_table(df, name, source=None):
+    """Typed Arrow table with dataset metadata attached to its schema"""
+    fields = [pa.field(col, _arrow_type(df[col])) for col in df.columns]
+    metadata = {
+        'dataset': name,
+        'source': source or '',
+        'rows': str(len(df)),
+        'schema_version': str(SCHEMA_VERSION),
+    }
+    table = pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+    # Replaces pyarrow's pandas metadata, which is larger than these tables themselves
+    return table.replace_schema_metadata({key: value.encode() for key, value in metadata.items()})
+
+# ============================================================================
+# READ / WRITE
+# ============================================================================
+def snapshot_path(name, root='.'):
+    return Path(root) / 'results' / f"{RESULT_SNAPSHOTS[name]}{SNAPSHOT_SUFFIX}"
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def write_snapshot(df, name, root='.', source=None, export_csv=False):
+    """Write one result frame as an Arrow snapshot, plus a CSV copy if export_csv is set
+
+    The snapshot records the CSV hash when it was exported or read from that CSV.
+    """
+    path = snapshot_path(name, root)
+    csv_path = path.with_suffix('.csv')
+    table = to_arrow_table(df, name, source)
+    if export_csv:
+        table.to_pandas().to_csv(csv_path, index=False)
+    if export_csv or source == csv_path.name:
+        metadata = dict(table.schema.metadata)
+        metadata[CSV_HASH_KEY.encode()] = file_digest(csv_path).encode()
+        table = table.replace_schema_metadata(metadata)
+
+    # Written to a unique file beside the target and renamed over it, so concurrent
+    # writers never share a partial file and memory-mapped readers of the previous
+    # snapshot keep a valid file; uncompressed so buffers map directly
+    fd, partial = tempfile.mkstemp(prefix=path.name + '.', suffix=PARTIAL_SUFFIX, dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.chmod(partial, 0o644)
+        os.replace(partial, path)
+    except BaseException:
+        os.unlink(partial)
+        raise
+    return path
+
+
+def read_snapshot_table(path):
+    """Arrow table backed by a memory map of the snapshot file"""
+    with pa.memory_map(str(path), 'r') as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_snapshot_file(path):
+    """Snapshot as a DataFrame; numeric columns without nulls are not copied"""
+    return read_snapshot_table(path).to_pandas(split_blocks=True)
+
+
+def read_snapshot(name, root='.'):
+    return read_snapshot_file(snapshot_path(name, root))
+
+
+def snapshot_metadata(path):
+    with pa.memory_map(str(path), 'r') as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items()}
+
+
+def is_stale(path):
+    """True if the CSV the snapshot was written with has been edited since (or the
+    snapshot is missing); a CSV the snapshot never recorded is not its source"""
+    path = Path(path)
+    csv_path = path.with_suffix('.csv')
+    if not csv_path.exists() or path.stem not in RESULT_NAMES:
+        return False
+    if not path.exists():
+        return True
+    recorded = snapshot_metadata(path).get(CSV_HASH_KEY)
+    return recorded is not None and recorded != file_digest(csv_path)
+
+
+def read_dataset(path):
+    """Load a dataset file by suffix: Arrow snapshot or CSV
+
+    A stale snapshot is not rewritten here; its edited CSV is converted in memory with
+    the snapshot's typing. `python snapshots.py` regenerates the file.
+    """
+    path = Path(path)
+    if path.suffix != SNAPSHOT_SUFFIX:
+        return pd.read_csv(path)
+    if is_stale(path):
+        csv_path = path.with_suffix('.csv')
+        logger.info("Reading edited %s in place of %s", csv_path.name, path.name)
+        return to_arrow_table(pd.read_csv(csv_path), RESULT_NAMES[path.stem], csv_path.name).to_pandas()
+    return read_snapshot_file(path)
+
+# ============================================================================
+# CONVERSION
+# ============================================================================
+def convert_results(root='.', export_csv=False):
+    """Snapshot every results CSV; returns {name: (csv bytes, snapshot bytes)}"""
+    root = Path(root)
+    sizes = {}
+
+    for name, stem in RESULT_SNAPSHOTS.items():
+        csv_path = root / 'results' / f"{stem}.csv"
+        if not csv_path.exists():
+            continue
+        path = write_snapshot(pd.read_csv(csv_path), name, root, source=csv_path.name,
+                              export_csv=export_csv)
+        sizes[name] = (csv_path.stat().st_size, path.stat().st_size)
+
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write typed Arrow snapshots of the results tables')
+    parser.add_argument('--root', default=str(Path(__file__).parent))
+    parser.add_argument('--csv', action='store_true', help='also write CSV copies of the snapshots')
+    args = parser.parse_args()
+
+    for name, (csv_bytes, snapshot_bytes) in convert_results(args.root, args.csv).items():
+        print(f"{name}: {csv_bytes:,} B csv -> {snapshot_bytes:,} B {SNAPSHOT_SUFFIX}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import orjson
+import pytest
+
+from api import DashboardApi
+
+
+def get(app, path, query=''):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(), 'headers': []}
+    asyncio.run(app(scope, receive, send))
+    return messages[0]['status'], orjson.loads(messages[1]['body'])
+
+
+@pytest.fixture(scope='module')
+def app():
+    return DashboardApi()
+
+
+@pytest.mark.parametrize('path', ['/api/v1/allocation', '/api/v1/scenario'])
+def test_default_reserve_never_exceeds_small_budget(app, path):
+    status, body = get(app, path, 'budget=10')
+    assert status == 200
+    assert body['totals']['reserve_m'] <= body['totals']['budget_m'] == 10
+
+
+def test_explicit_reserve_above_budget_is_rejected(app):
+    status, body = get(app, '/api/v1/allocation', 'budget=10&reserve=20')
+    assert status == 400 and 'reserve' in body['error']
+
+
+def test_store_refresh_runs_off_the_event_loop():
+    threads = []
+
+    class Store:
+        snapshot = None
+
+        def refresh(self):
+            threads.append(threading.current_thread())
+
+    api = DashboardApi(store_factory=Store)
+
+    async def main():
+        await api.current_store()
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert threads and threads[0] is not loop_thread
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from conflict_model import REGIMES, RegimeSwitchingModel, adjust_transitions, fit_transition_matrix
+
+TRANSITION = fit_transition_matrix([3, 3, 2, 3, 2, 1, 1, 0, 1, 2])
+
+
+@pytest.fixture
+def model():
+    return RegimeSwitchingModel(TRANSITION, np.ones((len(REGIMES), 2)), start_regime=3, start_year=2024)
+
+
+@pytest.mark.parametrize('sustained, expected', [
+    (1, [1, 0, -1, 4]),
+    (2, [2, 1, -1, -1]),
+    (3, [3, 2, -1, -1]),
+    (5, [-1, 4, -1, -1]),
+])
+def test_trigger_times_need_consecutive_years(model, sustained, expected):
+    intensity = np.array([
+        [5.0, 2.0, 1.0, 0.5, 3.0],
+        [1.0, 2.0, 1.5, 0.0, 2.0],
+        [2.5, 9.0, 2.1, 4.0, 3.0],
+        [3.0, 2.5, 4.0, 3.0, 1.0],
+    ])
+    np.testing.assert_array_equal(model.trigger_times(intensity, threshold=2.0, sustained=sustained), expected)
+
+
+def test_trigger_times_restart_after_a_break(model):
+    intensity = np.array([[1.0, 3.0, 1.0, 1.0, 3.0, 1.0, 1.0, 1.0]])
+    assert model.trigger_times(intensity, sustained=2).tolist() == [3]
+    assert model.trigger_times(intensity, sustained=3).tolist() == [7]
+
+
+@pytest.mark.parametrize('escalation, de_escalation', [(1, 1), (0.5, 2), (3, 0.2), (10, 10), (0, 5)])
+def test_adjusted_rows_stay_stochastic(escalation, de_escalation):
+    adjusted = adjust_transitions(TRANSITION, escalation, de_escalation)
+    assert (adjusted >= 0).all()
+    np.testing.assert_allclose(adjusted.sum(axis=1), 1.0)
+
+
+def test_adjust_transitions_scales_moves():
+    np.testing.assert_allclose(adjust_transitions(TRANSITION), TRANSITION)
+    adjusted = adjust_transitions(TRANSITION, escalation=2.0, de_escalation=0.5)
+    upper = np.triu_indices(len(REGIMES), k=1)
+    lower = np.tril_indices(len(REGIMES), k=-1)
+    np.testing.assert_allclose(adjusted[upper], 2.0 * TRANSITION[upper])
+    np.testing.assert_allclose(adjusted[lower], 0.5 * TRANSITION[lower])
+
+
+def test_zero_multipliers_give_the_identity():
+    np.testing.assert_array_equal(adjust_transitions(TRANSITION, 0.0, 0.0), np.eye(len(REGIMES)))
+
+
+def test_no_escalation_never_worsens_simulated_regimes(model):
+    regimes, _ = model.simulate(years=8, n_paths=500, transition=adjust_transitions(TRANSITION, 0.0, 1.0))
+    assert (np.diff(regimes, axis=1) <= 0).all()
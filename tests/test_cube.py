@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import QUARTERS, IndicatorCube
+
+
+@pytest.fixture
+def panel():
+    # Two countries, gaps between observed years, several rows per quarter
+    rng = np.random.default_rng(0)
+    dates = pd.to_datetime(['1990-02-01', '1990-03-01', '2005-05-01', '2005-11-01',
+                            '2005-12-01', '2020-01-01', '2020-08-01', '2024-10-01'])
+    frame = pd.DataFrame({
+        'CountryName': np.repeat(['Bahrain', 'Morocco'], len(dates)),
+        'Date': np.tile(dates, 2),
+        'Adult_Literacy_Rate': rng.uniform(40, 100, 2 * len(dates)).round(1),
+        'Cost_Per_Person_USD': rng.uniform(1, 50, 2 * len(dates)).round(2),
+    })
+    frame.loc[[3, 12], 'Adult_Literacy_Rate'] = np.nan
+    return frame.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def _expected(panel, year_range, stat, by):
+    rows = panel.assign(Year=panel['Date'].dt.year, Quarter=panel['Date'].dt.quarter)
+    rows = rows[rows['Year'].between(*year_range)].sort_values('Date', kind='stable')
+    grouped = rows.groupby(by)[['Adult_Literacy_Rate', 'Cost_Per_Person_USD']]
+    if stat == 'last':
+        return grouped.last()
+    return grouped.mean() if stat == 'mean' else grouped.sum(min_count=1)
+
+
+def test_only_observed_years_get_a_slot(panel):
+    cube = IndicatorCube(panel)
+    assert cube.years == [1990, 2005, 2020, 2024]
+    assert cube.year_sum.shape == (2, 4, 2)
+    assert len(cube.quarter_cells) == len(panel.groupby(['CountryName', panel['Date'].dt.to_period('Q')]))
+
+
+@pytest.mark.parametrize('stat', ['mean', 'sum', 'last'])
+@pytest.mark.parametrize('year_range', [(1990, 2024), (2000, 2021), (2006, 2019)])
+def test_totals_match_pandas(panel, stat, year_range):
+    cube = IndicatorCube(panel)
+    expected = _expected(panel, year_range, stat, 'CountryName')
+    got = cube.totals(year_range=year_range, stat=stat)
+    expected = expected.reindex(got.index)
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-5)
+
+
+@pytest.mark.parametrize('stat', ['mean', 'sum', 'last'])
+def test_series_match_pandas(panel, stat):
+    cube = IndicatorCube(panel)
+    expected = (_expected(panel, (2000, 2024), stat, ['CountryName', 'Year'])
+                .stack().rename('Value').reset_index()
+                .set_axis(['Country', 'Year', 'Indicator', 'Value'], axis=1))
+    got = cube.series(['Bahrain', 'Morocco'], (2000, 2024), stat=stat)
+    merged = got.merge(expected, on=['Country', 'Year', 'Indicator'], how='outer', suffixes=('', '_pandas'))
+    np.testing.assert_allclose(merged['Value'], merged['Value_pandas'], rtol=1e-5)
+
+
+@pytest.mark.parametrize('stat', ['mean', 'last'])
+def test_quarterly_match_pandas(panel, stat):
+    cube = IndicatorCube(panel)
+    expected = _expected(panel, (2005, 2020), stat, ['CountryName', 'Year', 'Quarter'])['Adult_Literacy_Rate']
+    got = cube.quarterly(['Morocco'], (2005, 2020), ['Adult_Literacy_Rate'], stat)
+    got_values = got.set_index(['Year', got['Quarter'].map(QUARTERS.index) + 1])['Value']
+    expected = expected.loc['Morocco'].dropna()
+    assert list(got_values.index) == list(expected.index)
+    np.testing.assert_allclose(got_values.to_numpy(), expected.to_numpy(), rtol=1e-5)
+
+
+def test_range_without_observed_years_is_empty(panel):
+    cube = IndicatorCube(panel)
+    assert cube.series(year_range=(2010, 2015)).empty
+    assert cube.totals(year_range=(2010, 2015)).isna().all().all()
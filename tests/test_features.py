@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import compute_features, iter_features, training_matrix
+
+SPEC = {'columns': ['Adult_Literacy_Rate'], 'lags': [1, 2], 'leads': [1], 'rolling': [3],
+        'growth': [1], 'intervention': True}
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    frames = []
+    for idx, size in enumerate([2, 5, 9]):
+        dates = pd.date_range('2016-01-01', periods=size, freq='QS')
+        frame = pd.DataFrame({'CountryName': f"Region {idx}", 'Date': dates,
+                              'Intervention_Active': np.where(np.arange(size) >= size // 2, 'Yes', 'No')})
+        # A second program on every other date; features average them per date
+        frames += [frame, frame.iloc[::2]]
+    frame = pd.concat(frames, ignore_index=True)
+    frame['Adult_Literacy_Rate'] = rng.normal(60, 5, len(frame)).round(1)
+    return frame.sort_values(['CountryName', 'Date'], kind='stable').reset_index(drop=True)
+
+
+def test_features_match_pandas_groupby(panel):
+    features = compute_features(panel, SPEC)
+    observations = panel.groupby(['CountryName', 'Date'], as_index=False)['Adult_Literacy_Rate'].mean()
+    grouped = observations.groupby('CountryName')['Adult_Literacy_Rate']
+
+    np.testing.assert_allclose(features['Adult_Literacy_Rate'], observations['Adult_Literacy_Rate'])
+    for periods in (1, 2):
+        np.testing.assert_allclose(features[f"Adult_Literacy_Rate_lag{periods}"], grouped.shift(periods))
+    np.testing.assert_allclose(features['Adult_Literacy_Rate_lead1'], grouped.shift(-1))
+    rolling = grouped.rolling(3, min_periods=1).mean().reset_index(level=0, drop=True).sort_index()
+    np.testing.assert_allclose(features['Adult_Literacy_Rate_roll3'], rolling)
+    np.testing.assert_allclose(features['Adult_Literacy_Rate_growth1'], 100 * grouped.pct_change(fill_method=None))
+
+
+def test_years_since_intervention(panel):
+    features = compute_features(panel, SPEC)
+    region = features[features['CountryName'] == 'Region 2']
+    first = region.loc[region['Intervention_Active'] > 0, 'Date'].min()
+    expected = (region['Date'] - first).dt.days / 365.25
+    np.testing.assert_allclose(region['Years_Since_Intervention'], expected, atol=1e-9)
+
+
+@pytest.mark.parametrize('chunksize', [1, 4, 7, 100])
+def test_streamed_chunks_match_whole_panel(panel, chunksize):
+    chunks = (panel.iloc[start:start + chunksize] for start in range(0, len(panel), chunksize))
+    streamed = pd.concat(iter_features(chunks, SPEC), ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, compute_features(panel, SPEC))
+
+
+def test_training_matrix_never_uses_leads_as_inputs(panel):
+    inputs, target = training_matrix(compute_features(panel, SPEC))
+    assert not [col for col in inputs.columns if '_lead' in col]
+    assert target.notna().all() and len(inputs) == len(target)
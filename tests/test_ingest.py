@@ -0,0 +1,65 @@
+import csv
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from ingest import ingest, iter_unesco_records, iter_world_bank_records
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def read_rows(path):
+    with open(path, newline='') as handle:
+        return {(row['Country'], row['Indicator_Name']): row for row in csv.DictReader(handle)}
+
+
+@pytest.mark.parametrize('unesco, world_bank', [
+    ('uis_data_national.csv', 'wb_edstats_data.csv'),
+    ('uis_bulk.zip', 'edstats_bulk.zip'),
+])
+def test_ingest_streams_csv_and_zip_exports(tmp_path, unesco, world_bank):
+    stats = {}
+    output = tmp_path / 'ingested.csv'
+    ingest(FIXTURES / unesco, FIXTURES / world_bank, output, stats)
+    rows = read_rows(output)
+
+    # Untracked countries are dropped; one row per tracked (country, indicator)
+    assert set(rows) == {
+        ('Morocco', 'Adult_Literacy_Rate_15plus'), ('Morocco', 'Secondary_Enrollment_Rate'),
+        ('Sudan', 'Adult_Literacy_Rate_15plus'), ('Sudan', 'Out_of_School_Children_thousands'),
+        ('Sudan', 'Population_Millions'),
+    }
+    # UIS wins the 2022 tie with World Bank; the 2023 male value is from another year
+    morocco = rows[('Morocco', 'Adult_Literacy_Rate_15plus')]
+    assert (morocco['Data_Year'], morocco['Source']) == ('2022', 'UNESCO_UIS')
+    assert (morocco['Total_Value'], morocco['Male_Value'], morocco['Female_Value']) == ('77.3', '85.5', '69.5')
+    # '..' in 2022 is not a value, so 2018 is Sudan's latest year
+    sudan = rows[('Sudan', 'Adult_Literacy_Rate_15plus')]
+    assert (sudan['Data_Year'], sudan['Total_Value'], sudan['Female_Value']) == ('2018', '60.7', '')
+    assert rows[('Morocco', 'Secondary_Enrollment_Rate')]['Data_Year'] == '2020'
+    assert rows[('Sudan', 'Out_of_School_Children_thousands')]['Total_Value'] == '2800.0'
+    assert rows[('Sudan', 'Population_Millions')]['Total_Value'] == '44.909'
+    # Blank YEAR and truncated rows are skipped, not fatal
+    assert stats == {'malformed_rows': 3}
+
+
+def test_readers_close_the_archive_when_stopped_early(monkeypatch):
+    opened = []
+
+    class TrackedZipFile(zipfile.ZipFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(zipfile, 'ZipFile', TrackedZipFile)
+    records = iter_unesco_records(FIXTURES / 'uis_bulk.zip')
+    assert next(records) == ('MAR', 'LR.AG15T99', 2018, 73.8)
+    records.close()
+    assert len(opened) == 1 and opened[0].fp is None
+
+
+def test_world_bank_reader_yields_every_reported_year():
+    records = list(iter_world_bank_records(FIXTURES / 'wb_edstats_data.csv'))
+    assert ('MAR', 'SE.SEC.ENRR', 2019, 80.1) in records
+    assert ('MAR', 'SE.SEC.ENRR', 2020, 81.5) in records
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from panel_index import PanelIndex, reduce_blocks
+
+
+@pytest.fixture
+def panel():
+    # Uneven region lengths, shuffled rows, NaNs and two programs on some dates
+    rng = np.random.default_rng(0)
+    frames = []
+    for idx, size in enumerate([1, 3, 7, 12]):
+        dates = pd.date_range('2015-01-01', periods=size, freq='QS')
+        frame = pd.DataFrame({'CountryName': f"Region {idx}", 'CountryID': f"R{idx}",
+                              'Date': dates, 'Intervention_Name': 'A'})
+        if size > 3:
+            frame = pd.concat([frame, frame.iloc[::3].assign(Intervention_Name='B')])
+        frames.append(frame)
+    frame = pd.concat(frames, ignore_index=True)
+    frame['Value'] = rng.normal(50, 10, len(frame)).round(2)
+    frame.loc[frame.sample(5, random_state=1).index, 'Value'] = np.nan
+    return frame.sample(frac=1, random_state=2).reset_index(drop=True)
+
+
+def test_rows_are_sorted_with_region_offsets(panel):
+    index = PanelIndex(panel)
+    expected = panel.sort_values(['CountryName', 'Date'], kind='stable')
+    assert index.frame['CountryName'].tolist() == expected['CountryName'].tolist()
+    assert index.frame['Date'].tolist() == expected['Date'].tolist()
+    assert index.rows('R3')['CountryName'].eq('Region 3').all()
+
+
+@pytest.mark.parametrize('periods', [1, 2, 4, -1, -3])
+def test_lag_matches_groupby_shift(panel, periods):
+    index = PanelIndex(panel)
+    expected = index.frame.groupby('CountryName')['Value'].shift(periods)
+    np.testing.assert_array_equal(index.lag('Value', periods), expected.to_numpy())
+
+
+@pytest.mark.parametrize('how', ['mean', 'sum'])
+@pytest.mark.parametrize('window, min_periods', [(1, 1), (3, 1), (4, 2), (20, 1)])
+def test_rolling_matches_groupby_rolling(panel, how, window, min_periods):
+    index = PanelIndex(panel)
+    rolling = index.frame.groupby('CountryName')['Value'].rolling(window, min_periods=min_periods)
+    expected = getattr(rolling, how)().reset_index(level=0, drop=True).sort_index()
+    np.testing.assert_allclose(index.rolling('Value', window, how, min_periods), expected.to_numpy())
+
+
+@pytest.mark.parametrize('date', ['2014-06-30', '2015-01-01', '2015-05-15', '2016-09-30', '2030-01-01'])
+@pytest.mark.parametrize('how', ['mean', 'max'])
+def test_asof_matches_mask_and_groupby(panel, date, how):
+    observed = panel[panel['Date'] <= pd.Timestamp(date)]
+    latest = observed[observed['Date'] == observed.groupby('CountryName')['Date'].transform('max')]
+    expected = latest.groupby('CountryName').agg(Date=('Date', 'first'), Value=('Value', how)).reset_index()
+
+    result = PanelIndex(panel).asof(date, ['Value'], how)
+    assert result['CountryName'].tolist() == expected['CountryName'].tolist()
+    assert result['Date'].tolist() == expected['Date'].tolist()
+    np.testing.assert_allclose(result['Value'], expected['Value'])
+
+
+def test_reduce_blocks_matches_loops():
+    values = np.array([1.0, np.nan, 3.0, 4.0, np.nan, np.nan, 7.0, 2.0])
+    start, stop = np.array([0, 3, 4, 6]), np.array([3, 4, 6, 8])
+    blocks = [pd.Series(values[a:b]) for a, b in zip(start, stop)]
+
+    np.testing.assert_allclose(reduce_blocks(values, start, stop, 'mean'), [b.mean() for b in blocks])
+    np.testing.assert_allclose(reduce_blocks(values, start, stop, 'max'), [b.max() for b in blocks])
+    np.testing.assert_allclose(reduce_blocks(values, start, stop, 'last'), [b.iat[-1] for b in blocks])
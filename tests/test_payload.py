@@ -0,0 +1,20 @@
+import numpy as np
+
+from payload import quantize
+
+
+def test_quantize_rounds_each_value_to_its_own_significant_digits():
+    values = quantize([0.00123456, 0.0241234, 37.123456, 150.0], significant=5)
+    assert values.tolist() == [0.0012346, 0.024123, 37.123, 150.0]
+
+
+def test_quantize_never_turns_small_values_into_zero():
+    values = quantize(np.array([0.0012, 0.024, 37.1, 150000.0]), significant=2)
+    assert (values > 0).all()
+    assert values.tolist() == [0.0012, 0.024, 37.0, 150000.0]
+
+
+def test_quantize_passes_zero_nan_and_inf_through():
+    values = quantize([0.0, np.nan, np.inf, -2.345678])
+    assert values[0] == 0 and np.isnan(values[1]) and np.isinf(values[2])
+    assert values[3] == -2.3457
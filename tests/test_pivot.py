@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pivot import PivotEngine, read_master_dataset, wide_to_long
+
+DATA = Path(__file__).resolve().parent.parent / 'data'
+
+
+@pytest.fixture
+def master():
+    return read_master_dataset(DATA / 'abraham_accords_master_dataset.csv')
+
+
+def assert_same_wide(actual, expected):
+    """Same countries and values for every column of expected (numeric within float noise)"""
+    actual = actual.set_index('Country').loc[expected['Country']]
+    expected = expected.set_index('Country')
+    for column in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[column]):
+            np.testing.assert_allclose(pd.to_numeric(actual[column]).to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float), err_msg=column)
+        else:
+            assert actual[column].tolist() == expected[column].tolist(), column
+
+
+def test_wide_matches_wide_dataset_csv(master):
+    expected = pd.read_csv(DATA / 'abraham_accords_wide_dataset.csv')
+    wide = PivotEngine(master).wide()
+    assert set(expected.columns) <= set(wide.columns)
+    assert_same_wide(wide, expected)
+
+
+def test_update_indicator_patches_cached_wide(master):
+    engine = PivotEngine(master)
+    engine.wide()
+
+    update = pd.DataFrame({'Country': ['Sudan', 'Morocco'], 'Total_Value': [58.5, 73.0],
+                           'Female_Value': [50.1, 64.0]})
+    engine.update_indicator('Adult_Literacy_Rate_15plus', update)
+    engine.update_indicator('Digital_Skills_Index', pd.DataFrame({'Country': ['Israel'], 'Total_Value': [0.8]}),
+                            category='Literacy_Rates')
+
+    wide = engine.wide()
+    assert wide.columns[-2:].tolist() == ['Data_Year', 'Source_Primary']
+    rows = wide.set_index('Country')
+    assert rows.loc['Sudan', 'Adult_Literacy_Total'] == 58.5
+    assert rows.loc['Morocco', 'Adult_Literacy_Female'] == 64.0
+    assert rows.loc['Israel', 'Digital_Skills_Index'] == 0.8
+    assert np.isnan(rows.loc['Sudan', 'Digital_Skills_Index'])
+
+    # The patched view equals a full rebuild from the updated long data
+    rebuilt = PivotEngine(engine.to_long()).wide()
+    assert_same_wide(rebuilt, wide[rebuilt.columns])
+
+
+def test_update_indicator_adds_countries(master):
+    engine = PivotEngine(master)
+    engine.wide()
+    engine.update_indicator('Adult_Literacy_Rate_15plus', pd.DataFrame({
+        'Country': ['Oman'], 'Total_Value': [97.0], 'Data_Year': ['2023'], 'Source': ['UIS_2024'],
+        'Confidence_Level': ['HIGH']}))
+    engine.update_indicator('Youth_Literacy_Rate_15to24', pd.DataFrame({'Country': ['Oman'], 'Total_Value': [99.1]}))
+
+    wide = engine.wide(['Oman', 'Israel'])
+    assert wide['Country'].tolist() == ['Oman', 'Israel']
+    assert wide['Adult_Literacy_Total'].tolist() == [97.0, 97.8]
+    assert wide['Data_Year'].tolist() == ['2023', '2022']
+    assert wide['Source_Primary'].tolist() == ['UIS_2024', 'UNESCO_2024']
+
+    # Metadata the update gives is kept, the rest defaults to empty like the CSV's blank fields
+    long_df = engine.to_long()
+    oman = long_df[long_df['Country'] == 'Oman'].set_index('Indicator_Name')
+    assert oman.loc['Adult_Literacy_Rate_15plus', ['Data_Year', 'Source', 'Confidence_Level', 'Notes']].tolist() \
+        == ['2023', 'UIS_2024', 'HIGH', '']
+    assert oman.loc['Youth_Literacy_Rate_15to24', ['Data_Year', 'Source', 'Confidence_Level']].tolist() == ['', '', '']
+    assert not long_df[['Data_Year', 'Source', 'Confidence_Level', 'Notes']].isna().any().any()
+
+
+def test_update_indicator_keeps_existing_metadata(master):
+    engine = PivotEngine(master)
+    before = engine.row_meta.loc[('Sudan', 'Adult_Literacy_Rate_15plus')].tolist()
+    engine.update_indicator('Adult_Literacy_Rate_15plus', pd.DataFrame({'Country': ['Sudan'], 'Total_Value': [58.5]}))
+    assert engine.row_meta.loc[('Sudan', 'Adult_Literacy_Rate_15plus')].tolist() == before
+    assert engine.wide(['Sudan'])['Data_Year'].iat[0] == before[0]
+
+
+def test_wide_to_long_round_trip(master):
+    engine = PivotEngine(master)
+    wide = engine.wide()
+    long_df = wide_to_long(wide, engine.categories)
+    assert_same_wide(PivotEngine(long_df).wide(), wide.drop(columns=['Data_Year', 'Source_Primary']))
@@ -0,0 +1,59 @@
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from snapshots import (CSV_HASH_KEY, PARTIAL_SUFFIX, is_stale, read_dataset, snapshot_metadata, snapshot_path,
+                       write_snapshot)
+
+RESULTS = Path(__file__).resolve().parent.parent / 'results'
+
+
+@pytest.fixture
+def root(tmp_path):
+    shutil.copytree(RESULTS, tmp_path / 'results')
+    return tmp_path
+
+
+def test_edited_csv_is_read_without_rewriting_snapshot(root):
+    path = snapshot_path('aalni_scores', root)
+    csv_path = path.with_suffix('.csv')
+    before = path.read_bytes()
+    edited = pd.read_csv(csv_path)
+    edited.loc[0, 'AALNI_Score'] = 123.5
+    edited.to_csv(csv_path, index=False)
+
+    assert is_stale(path)
+    assert read_dataset(path).loc[0, 'AALNI_Score'] == 123.5
+    assert path.read_bytes() == before
+    assert is_stale(path)
+
+
+def test_csv_copy_is_written_only_on_request(root):
+    path = snapshot_path('forecast', root)
+    csv_path = path.with_suffix('.csv')
+    csv_before = csv_path.read_bytes()
+    frame = read_dataset(path)
+    frame['Projected_2030'] = 50.0
+
+    write_snapshot(frame, 'forecast', root)
+    assert csv_path.read_bytes() == csv_before
+    assert CSV_HASH_KEY not in snapshot_metadata(path)
+    assert not is_stale(path)
+    assert (read_dataset(path)['Projected_2030'] == 50.0).all()
+
+    write_snapshot(frame, 'forecast', root, export_csv=True)
+    assert (pd.read_csv(csv_path)['Projected_2030'] == 50.0).all()
+    assert snapshot_metadata(path)[CSV_HASH_KEY]
+    assert not is_stale(path)
+
+
+def test_concurrent_writers_leave_a_readable_snapshot(root):
+    frame = read_dataset(snapshot_path('cost_rankings', root))
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: write_snapshot(frame, 'cost_rankings', root), range(32)))
+
+    assert read_dataset(snapshot_path('cost_rankings', root)).equals(frame)
+    assert not list((root / 'results').glob(f"*{PARTIAL_SUFFIX}"))
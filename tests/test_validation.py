@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from validation import ValidationError, check_consistency, gate, validate, validate_frame
+
+RULE = {'left': 'frame', 'left_key': 'Country', 'left_column': 'Score',
+        'right': 'results', 'right_key': 'CountryName', 'right_column': 'Score', 'tolerance': 0.1}
+
+
+def test_unmatched_consistency_keys_fail():
+    datasets = {
+        'frame': pd.DataFrame({'Country': ['Sudan', 'Oman'], 'Score': [115.7, 3.0]}),
+        'results': pd.DataFrame({'CountryName': ['Sudan'], 'Score': [115.7]}),
+    }
+    rows = {row['Rule']: row for row in check_consistency(datasets, [RULE])}
+    assert rows['matched']['Failures'] == 1
+    assert rows['matched']['Sample_Rows'] == ['Oman']
+    assert rows['consistent']['Failures'] == 0
+
+
+def test_required_when_treats_missing_flag_as_false():
+    df = pd.DataFrame({'Cost': [np.nan, np.nan, 5.0], 'Cost_Data_Available': [np.nan, True, True]})
+    rule = {'rule': 'required_when', 'column': 'Cost', 'flag': 'Cost_Data_Available'}
+    [row] = validate_frame('panel', df, [rule])
+    assert (row['Failures'], row['Sample_Rows']) == (1, [1])
+
+
+def test_gate_raises_only_for_error_level_failures():
+    datasets = {'frame': pd.DataFrame({'Country': ['Sudan'], 'Score': [-1.0]})}
+    rules = [{'rule': 'range', 'column': 'Score', 'min': 0}]
+    report = validate(datasets, {'frame': rules}, [])
+    with pytest.raises(ValidationError, match=r'frame\.Score \(range\): 1'):
+        gate(report)
+
+    warnings = validate(datasets, {'frame': [dict(rules[0], severity='warning')]}, [])
+    assert gate(warnings) is warnings
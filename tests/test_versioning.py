@@ -0,0 +1,71 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from versioning import DatasetStore
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def store(tmp_path):
+    for directory in ('data', 'results'):
+        shutil.copytree(ROOT / directory, tmp_path / directory)
+    return DatasetStore(tmp_path, persist_manifest=False)
+
+
+def test_editing_one_frame_invalidates_only_its_dependents(store):
+    path = store.root / 'data/dashboard/morocco_timeline.csv'
+    path.write_text(path.read_text().replace('72.1', '72.2'))
+
+    stale = store.refresh()
+    assert 'morocco_timeline' in stale
+    assert 'aalni_data' not in stale and 'cube' not in stale
+    figures = [name for name in stale if name.startswith('figure:')]
+    assert figures and all('morocco_timeline' in store.graph[name]['inputs'] for name in figures)
+    assert 72.2 in store.get('morocco_timeline')['Literacy_Rate'].tolist()
+
+
+def test_different_artifacts_build_concurrently(store):
+    started = threading.Barrier(2, timeout=5)
+
+    def slow_build(root, inputs):
+        started.wait()  # Times out unless both builds run at once
+        time.sleep(0.01)
+        return object()
+
+    for name in ('slow_a', 'slow_b'):
+        store.graph[name] = {'files': [], 'inputs': [], 'build': slow_build}
+        store.snapshot.versions[name] = name
+
+    threads = [threading.Thread(target=store.get, args=(name,)) for name in ('slow_a', 'slow_b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 'slow_a' in store.snapshot.values and 'slow_b' in store.snapshot.values
+
+
+def test_rejected_csv_edit_leaves_snapshot_and_later_edits_alone(store):
+    snapshot = store.root / 'results/cost_effectiveness_rankings.arrow'
+    csv_path = snapshot.with_suffix('.csv')
+    before = snapshot.read_bytes()
+    lines = csv_path.read_text().splitlines(keepends=True)
+    header = lines[0].rstrip('\n').split(',')
+    row = lines[1].rstrip('\n').split(',')
+    row[header.index('Cost_Per_Point_Improved')] = '-5'
+    csv_path.write_text(lines[0] + ','.join(row) + '\n' + ''.join(lines[2:]))
+
+    assert store.refresh() == []
+    rejected = store.last_rejected['version']
+    assert snapshot.read_bytes() == before
+    assert store.refresh() == [] and store.last_rejected['version'] == rejected
+
+    row[header.index('Cost_Per_Point_Improved')] = '0.54'
+    csv_path.write_text(lines[0] + ','.join(row) + '\n' + ''.join(lines[2:]))
+    assert 'cost_rankings' in store.refresh()
+    assert store.get('cost_rankings')['Cost_Per_Point_Improved'].iloc[0] == pytest.approx(0.54)
+    assert snapshot.read_bytes() == before
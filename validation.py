@@ -0,0 +1,301 @@
+"""
+Data validation for the Abraham Accords Literacy Dashboard
+Declarative rules for the panel and results schemas, evaluated as vectorized
+column checks. Run as a gate before refreshing dashboard data:
+
+    python validation.py            # exits non-zero if any error-level rule fails
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard_data import dashboard_frames_by_name
+from snapshots import read_dataset
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+DATASET_FILES = {
+    'panel': 'data/abraham_accords_panel_data.csv',
+    'aalni_scores': 'results/aalni_scores_2024.arrow',
+    'forecast': 'results/2030_forecast_results.arrow',
+    'cost_rankings': 'results/cost_effectiveness_rankings.arrow',
+    'feature_rankings': 'results/feature_importance_rankings.arrow',
+}
+
+# ============================================================================
+# RULES
+# ============================================================================
+LITERACY_COLUMNS = ['Adult_Literacy_Rate', 'Youth_Literacy_Rate',
+                    'Rural_Literacy_Rate', 'Urban_Literacy_Rate']
+
+PANEL_RULES = [
+    {'rule': 'not_null', 'columns': ['Date', 'CountryID', 'Intervention_Name'] + LITERACY_COLUMNS},
+    {'rule': 'unique', 'columns': ['CountryID', 'Date', 'Intervention_Name']},
+    *[{'rule': 'range', 'column': col, 'min': 0, 'max': 100} for col in LITERACY_COLUMNS],
+    {'rule': 'range', 'column': 'Gender_Parity_Index', 'min': 0, 'max': 2},
+    {'rule': 'range', 'column': 'Rural_Urban_Gap', 'min': 0, 'max': 100},
+    {'rule': 'range', 'column': 'Annual_Investment_USD_Millions', 'min': 0},
+    {'rule': 'range', 'column': 'Cost_Per_Person_USD', 'min': 0},
+    {'rule': 'allowed', 'column': 'Conflict_Status',
+     'values': ['Stable', 'Unstable', 'Conflict', 'Severe_Conflict']},
+    {'rule': 'allowed', 'column': 'Intervention_Active', 'values': ['Yes', 'No']},
+    {'rule': 'monotone', 'columns': ['Cumulative_Investment_USD_Millions',
+                                     'Cumulative_Beneficiaries_thousands'],
+     'by': ['CountryID', 'Intervention_Name'], 'order': 'Date'},
+    {'rule': 'required_when', 'column': 'Cost_Per_Person_USD', 'flag': 'Cost_Data_Available'},
+    {'rule': 'required_when', 'column': 'Cumulative_Investment_USD_Millions',
+     'flag': 'Investment_Data_Available'},
+]
+
+AALNI_RULES = [
+    {'rule': 'not_null', 'columns': ['CountryName', 'AALNI_Score', 'Rank']},
+    {'rule': 'unique', 'columns': ['CountryName']},
+    {'rule': 'range', 'column': 'AALNI_Score', 'min': 0},
+    {'rule': 'range', 'column': 'Conflict_Multiplier', 'min': 1, 'max': 3},
+]
+
+FORECAST_RULES = [
+    {'rule': 'not_null', 'columns': ['Country', 'Projected_2030', 'Lower_Bound', 'Upper_Bound']},
+    *[{'rule': 'range', 'column': col, 'min': 0, 'max': 100}
+      for col in ['Current_2024', 'Projected_2030', 'Lower_Bound', 'Upper_Bound']],
+    {'rule': 'ordered', 'columns': ['Lower_Bound', 'Projected_2030', 'Upper_Bound']},
+]
+
+COST_RULES = [
+    {'rule': 'not_null', 'columns': ['Intervention_Name', 'Cost_Per_Point_Improved', 'Rank']},
+    {'rule': 'unique', 'columns': ['Rank']},
+    {'rule': 'range', 'column': 'Cost_Per_Point_Improved', 'min': 0},
+    {'rule': 'range', 'column': 'Avg_Cost_Per_Person', 'min': 0},
+    {'rule': 'ordered', 'columns': ['Start_Year', 'End_Year']},
+]
+
+FEATURE_RULES = [
+    {'rule': 'not_null', 'columns': ['Feature', 'Importance']},
+    {'rule': 'range', 'column': 'Importance', 'min': 0, 'max': 1},
+]
+
+SCHEMAS = {
+    'panel': PANEL_RULES,
+    'aalni_scores': AALNI_RULES,
+    'forecast': FORECAST_RULES,
+    'cost_rankings': COST_RULES,
+    'feature_rankings': FEATURE_RULES,
+}
+
+# Dashboard frames are curated by hand (data/dashboard/), so they are checked against the result files
+CONSISTENCY_RULES = [
+    {'left': 'cost_effectiveness', 'left_key': 'Program', 'left_column': 'Cost_Per_Point',
+     'right': 'cost_rankings', 'right_key': 'Intervention_Name', 'right_column': 'Cost_Per_Point_Improved',
+     'tolerance': 0.05},
+    {'left': 'aalni_data', 'left_key': 'Country', 'left_column': 'AALNI_Score',
+     'right': 'aalni_scores', 'right_key': 'CountryName', 'right_column': 'AALNI_Score',
+     'tolerance': 0.1},
+    {'left': 'aalni_data', 'left_key': 'Country', 'left_column': 'Adult_Literacy_Rate',
+     'right': 'aalni_scores', 'right_key': 'CountryName', 'right_column': 'Adult_Literacy_Rate',
+     'tolerance': 0.05},
+]
+
+
+class ValidationError(Exception):
+    """Raised by gate() when error-level rules fail"""
+
+# ============================================================================
+# VECTORIZED CHECKS
+# ============================================================================
+# Each check returns {column label: boolean failure mask aligned to df rows}
+def _check_not_null(df, spec):
+    return {col: df[col].isna().to_numpy() for col in spec['columns']}
+
+
+def _check_unique(df, spec):
+    return {'+'.join(spec['columns']): df.duplicated(spec['columns'], keep=False).to_numpy()}
+
+
+def _check_range(df, spec):
+    values = pd.to_numeric(df[spec['column']], errors='coerce').to_numpy(dtype=float)
+    failed = np.zeros(len(values), dtype=bool)
+    if 'min' in spec:
+        failed |= values < spec['min']
+    if 'max' in spec:
+        failed |= values > spec['max']
+    return {spec['column']: failed}
+
+
+def _check_allowed(df, spec):
+    column = df[spec['column']]
+    return {spec['column']: (column.notna() & ~column.isin(spec['values'])).to_numpy()}
+
+
+def _check_ordered(df, spec):
+    values = df[spec['columns']].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    failed = (np.diff(values, axis=1) < 0).any(axis=1)
+    return {' <= '.join(spec['columns']): failed}
+
+
+def _check_monotone(df, spec):
+    """Non-decreasing within each group, after one sort by (group, order)"""
+    group_codes = np.zeros(len(df), dtype=np.int64)
+    for col in spec['by']:
+        codes, uniques = pd.factorize(df[col])
+        group_codes = group_codes * (len(uniques) + 1) + codes
+    order = np.lexsort([df[spec['order']].to_numpy(), group_codes])
+    group_codes = group_codes[order]
+    same_group = group_codes[1:] == group_codes[:-1]
+
+    masks = {}
+    for col in spec['columns']:
+        values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)[order]
+        decreasing = np.zeros(len(df), dtype=bool)
+        decreasing[order[1:]] = same_group & (np.diff(values) < 0)
+        masks[col] = decreasing
+    return masks
+
+
+def _check_required_when(df, spec):
+    # A missing flag means the data is not known to be available
+    flag = (df[spec['flag']].notna() & df[spec['flag']].astype(bool)).to_numpy()
+    return {spec['column']: flag & df[spec['column']].isna().to_numpy()}
+
+
+CHECKS = {
+    'not_null': _check_not_null,
+    'unique': _check_unique,
+    'range': _check_range,
+    'allowed': _check_allowed,
+    'ordered': _check_ordered,
+    'monotone': _check_monotone,
+    'required_when': _check_required_when,
+}
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+REPORT_COLUMNS = ['Dataset', 'Rule', 'Column', 'Severity', 'Failures', 'Sample_Rows']
+
+
+def _normalize_key(series):
+    """Match labels like 'Morocco National\\nProgram' and 'Morocco_National_Program'"""
+    return series.astype(str).map(lambda text: re.sub(r'[^0-9a-z]+', '_', text.lower()).strip('_'))
+
+
+def check_consistency(datasets, rules=CONSISTENCY_RULES):
+    """Cross-file checks: the same quantity must agree across datasets"""
+    rows = []
+
+    for spec in rules:
+        if spec['left'] not in datasets or spec['right'] not in datasets:
+            continue
+        left = datasets[spec['left']]
+        right = datasets[spec['right']]
+        right_values = pd.Series(pd.to_numeric(right[spec['right_column']], errors='coerce').to_numpy(),
+                                 index=_normalize_key(right[spec['right_key']]))
+        right_values = right_values[~right_values.index.duplicated()]
+
+        keys = _normalize_key(left[spec['left_key']])
+        # A key missing from the right-hand file cannot be checked, so it fails
+        unmatched = ~keys.isin(right_values.index).to_numpy()
+        rows.append({
+            'Dataset': f"{spec['left']} ~ {spec['right']}",
+            'Rule': 'matched',
+            'Column': f"{spec['left_key']} ~ {spec['right_key']}",
+            'Severity': spec.get('severity', 'error'),
+            'Failures': int(unmatched.sum()),
+            'Sample_Rows': left[spec['left_key']][unmatched].head(5).tolist(),
+        })
+
+        expected = keys.map(right_values).to_numpy(dtype=float)
+        actual = pd.to_numeric(left[spec['left_column']], errors='coerce').to_numpy(dtype=float)
+        failed = np.abs(actual - expected) > spec['tolerance']
+
+        rows.append({
+            'Dataset': f"{spec['left']} ~ {spec['right']}",
+            'Rule': 'consistent',
+            'Column': f"{spec['left_column']} ~ {spec['right_column']}",
+            'Severity': spec.get('severity', 'error'),
+            'Failures': int(failed.sum()),
+            'Sample_Rows': left[spec['left_key']][failed].head(5).tolist(),
+        })
+
+    return rows
+
+
+def validate_frame(name, df, rules):
+    """Evaluate rules against one DataFrame"""
+    rows = []
+
+    for spec in rules:
+        missing = [col for col in spec.get('columns', [spec.get('column')]) if col not in df]
+        if missing:
+            rows.append({'Dataset': name, 'Rule': 'schema', 'Column': ', '.join(missing),
+                         'Severity': 'error', 'Failures': len(missing), 'Sample_Rows': []})
+            continue
+
+        for column, failed in CHECKS[spec['rule']](df, spec).items():
+            rows.append({
+                'Dataset': name,
+                'Rule': spec['rule'],
+                'Column': column,
+                'Severity': spec.get('severity', 'error'),
+                'Failures': int(failed.sum()),
+                'Sample_Rows': np.flatnonzero(failed)[:5].tolist(),
+            })
+
+    return rows
+
+
+def load_datasets(root='.'):
+    """Load result/panel files plus the dashboard frames they are compared against"""
+    root = Path(root)
+    datasets = {name: read_dataset(root / path) for name, path in DATASET_FILES.items()
+                if (root / path).exists()}
+    datasets.update(dashboard_frames_by_name(root))
+    return datasets
+
+
+def validate(datasets=None, schemas=SCHEMAS, consistency_rules=CONSISTENCY_RULES):
+    """Run every schema and consistency rule; returns a report DataFrame"""
+    datasets = load_datasets() if datasets is None else datasets
+    rows = []
+
+    for name, rules in schemas.items():
+        if name in datasets:
+            rows.extend(validate_frame(name, datasets[name], rules))
+    rows.extend(check_consistency(datasets, consistency_rules))
+
+    return pd.DataFrame(rows, columns=REPORT_COLUMNS)
+
+
+def failures(report, severity='error'):
+    return report[(report['Failures'] > 0) & (report['Severity'] == severity)]
+
+
+def gate(report):
+    """Raise ValidationError if any error-level rule failed"""
+    failed = failures(report)
+    if len(failed):
+        summary = '; '.join(f"{row.Dataset}.{row.Column} ({row.Rule}): {row.Failures}"
+                            for row in failed.itertuples())
+        raise ValidationError(f"{len(failed)} validation rule(s) failed: {summary}")
+    return report
+
+
+def main():
+    report = validate()
+    failed = failures(report)
+
+    if len(failed):
+        print(failed.to_string(index=False))
+    print(f"\n{len(report)} checks, {len(failed)} failed")
+    try:
+        gate(report)
+    except ValidationError as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == '__main__':
+    main()
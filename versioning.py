@@ -0,0 +1,320 @@
+"""
+Dataset versioning for the Abraham Accords Literacy Dashboard
+Content-addresses every file under data/ and results/, records them in a
+manifest, and tracks which derived frames and figures depend on which files so a
+data change invalidates only the caches downstream of it.
+
+Usage:
+    python versioning.py            # hash files and update dataset_manifest.json
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from conflict_model import RegimeSwitchingModel, observed_intensity
+from cube import IndicatorCube
+from dashboard_data import FRAME_FILES, FRAME_NAMES
+from features import build_features
+from panel_index import PanelIndex
+from pivot import PivotEngine, read_master_dataset
+from shared_cache import get_shared_cache
+from snapshots import PARTIAL_SUFFIX, SNAPSHOT_SUFFIX, read_dataset
+from validation import DATASET_FILES, validate
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_DIRS = ('data', 'results')
+MANIFEST_FILE = 'dataset_manifest.json'
+MASTER_FILE = 'data/abraham_accords_master_dataset.csv'
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(root='.', previous=None, stats=None):
+    """Hash every versioned file; unchanged (size, mtime) entries reuse the previous hash
+
+    stats is an optional {path: (size, mtime_ns)} dict from the previous call and is
+    updated in place.
+    """
+    root = Path(root)
+    previous_files = (previous or {}).get('files', {})
+    stats = {} if stats is None else stats
+    files = {}
+
+    for directory in VERSIONED_DIRS:
+        for path in sorted((root / directory).rglob('*')):
+            # Snapshots still being written are not part of any version
+            if not path.is_file() or path.name.endswith(PARTIAL_SUFFIX):
+                continue
+            rel = path.relative_to(root).as_posix()
+            stat = path.stat()
+            key = (stat.st_size, stat.st_mtime_ns)
+            if stats.get(rel) == key and rel in previous_files:
+                files[rel] = previous_files[rel]
+            else:
+                files[rel] = {'sha256': hash_file(path), 'size': stat.st_size}
+            stats[rel] = key
+
+    combined = hashlib.sha256(''.join(f"{rel}:{entry['sha256']};" for rel, entry in files.items()).encode())
+    return {'version': combined.hexdigest()[:12], 'files': files}
+
+
+def read_manifest(root='.'):
+    path = Path(root) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def write_manifest(manifest, root='.'):
+    (Path(root) / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+
+# ============================================================================
+# DEPENDENCY GRAPH
+# ============================================================================
+def _file_loader(rel_path):
+    return lambda root, inputs: read_dataset(root / rel_path)
+
+
+def _figure_builder(builder):
+    def build(root, inputs):
+        from pages_content import cached_figure
+        return cached_figure(builder, *inputs.values())
+    build.builder_name = builder.__name__
+    return build
+
+
+def build_dependency_graph():
+    """{artifact: {'files': [...], 'inputs': [...], 'build': fn(root, inputs)}}"""
+    from pages_content import PAGE_FIGURES
+
+    graph = {name: {'files': [rel_path], 'inputs': [], 'build': _file_loader(rel_path)}
+             for name, rel_path in FRAME_FILES.items()}
+
+    for name, rel_path in DATASET_FILES.items():
+        files = [rel_path]
+        if rel_path.endswith(SNAPSHOT_SUFFIX):
+            # An edited CSV copy is read in place of the snapshot, so it is a source too
+            files.append(rel_path[:-len(SNAPSHOT_SUFFIX)] + '.csv')
+        graph[name] = {'files': files, 'inputs': [], 'build': _file_loader(rel_path)}
+
+    graph['master'] = {'files': [MASTER_FILE], 'inputs': [],
+                       'build': lambda root, inputs: read_master_dataset(root / MASTER_FILE)}
+    graph['wide'] = {'files': [], 'inputs': ['master'],
+                     'build': lambda root, inputs: PivotEngine(inputs['master']).wide()}
+    graph['panel_index'] = {'files': [], 'inputs': ['panel'],
+                            'build': lambda root, inputs: PanelIndex(inputs['panel'])}
+    graph['features'] = {'files': [], 'inputs': ['panel_index'],
+                         'build': lambda root, inputs: build_features(inputs['panel_index'])}
+    graph['cube'] = {'files': [], 'inputs': ['panel'],
+                     'build': lambda root, inputs: IndicatorCube(inputs['panel'])}
+    graph['sudan_conflict_model'] = {
+        'files': [], 'inputs': ['panel_index', 'sudan_conflict'],
+        'build': lambda root, inputs: RegimeSwitchingModel.from_panel(
+            inputs['panel_index'], 'SDN', observed_intensity(inputs['sudan_conflict']))}
+    graph['validation_report'] = {'files': [], 'inputs': list(DATASET_FILES) + list(FRAME_NAMES),
+                                  'build': lambda root, inputs: validate(inputs)}
+
+    for figures in PAGE_FIGURES.values():
+        for builder, frame_names in figures:
+            graph[f"figure:{builder.__name__}"] = {'files': [], 'inputs': list(frame_names),
+                                                   'build': _figure_builder(builder)}
+    return graph
+
+
+def artifact_versions(graph, manifest):
+    """Merkle-style version per artifact from its file hashes and input versions"""
+    versions = {}
+
+    def version(name):
+        if name not in versions:
+            node = graph[name]
+            parts = [manifest['files'].get(rel, {}).get('sha256', 'missing') for rel in node['files']]
+            parts += [version(dep) for dep in node['inputs']]
+            versions[name] = hashlib.sha256(f"{name}|{'|'.join(parts)}".encode()).hexdigest()[:12]
+        return versions[name]
+
+    for name in graph:
+        version(name)
+    return versions
+
+# ============================================================================
+# DATASET STORE
+# ============================================================================
+class DataSnapshot:
+    """One immutable data version; artifacts are built lazily on first access"""
+
+    def __init__(self, manifest, versions, values=None):
+        self.manifest = manifest
+        self.versions = versions
+        self.values = dict(values or {})
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def artifact_lock(self, name):
+        """Lock for building one artifact, so different artifacts build concurrently"""
+        with self._locks_lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+
+class DatasetStore:
+    """Serves artifacts for the current data version and hot-swaps on file changes
+
+    refresh() is cheap when nothing changed (one stat per file). When files change,
+    only artifacts whose version moved are dropped; the rest carry over. A new
+    version that introduces validation failures is rejected and the current one
+    keeps serving. Readers holding the old snapshot finish on it undisturbed.
+    """
+
+    def __init__(self, root='.', persist_manifest=True):
+        self.root = Path(root)
+        self.persist_manifest = persist_manifest
+        self.graph = build_dependency_graph()
+        self._stats = {}
+        self._refresh_lock = threading.Lock()
+        self.last_rejected = None
+
+        manifest = build_manifest(self.root, read_manifest(self.root), self._stats)
+        # Latest scan, accepted or not, so the (size, mtime) fast path maps to current content
+        self._scanned = manifest
+        self._snapshot = DataSnapshot(manifest, artifact_versions(self.graph, manifest))
+        self._load_file_artifacts(self._snapshot)
+        self._persist(manifest)
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def get(self, name, snapshot=None):
+        snapshot = snapshot or self._snapshot
+        if name in snapshot.values:
+            return snapshot.values[name]
+
+        node = self.graph[name]
+        inputs = {dep: self.get(dep, snapshot) for dep in node['inputs']}
+        with snapshot.artifact_lock(name):
+            if name not in snapshot.values:
+                snapshot.values[name] = self._build(name, node, inputs, snapshot)
+        return snapshot.values[name]
+
+    def _build(self, name, node, inputs, snapshot):
+        """Build one artifact, sharing derived ones across worker processes when configured
+
+        File-backed artifacts are read from disk, constant frames are free and figures
+        go through the figure cache, so only derived data is kept in the shared cache
+        (keyed by version).
+        """
+        shared = get_shared_cache()
+        if (shared is None or node['files'] or not node['inputs']
+                or hasattr(node['build'], 'builder_name')):
+            return node['build'](self.root, inputs)
+        return shared.get_or_build(f"artifact:{name}:{snapshot.versions[name]}",
+                                   lambda: node['build'](self.root, inputs))
+
+    def _load_file_artifacts(self, snapshot):
+        """Read file-backed artifacts when the snapshot is created, so a lazily built
+        artifact can never see file contents from a later version"""
+        for name, node in self.graph.items():
+            if node['files']:
+                self.get(name, snapshot)
+
+    def refresh(self):
+        """Check for changed files and swap to the new version if it validates
+
+        Returns the list of invalidated artifacts (empty when nothing changed).
+        """
+        with self._refresh_lock:
+            current = self._snapshot
+            manifest = self._scanned = build_manifest(self.root, self._scanned, self._stats)
+            if manifest['version'] == current.version:
+                return []
+            # An unchanged rejected version is not re-validated on every call
+            if self.last_rejected and manifest['version'] == self.last_rejected['version']:
+                return []
+
+            versions = artifact_versions(self.graph, manifest)
+            stale = [name for name, version in versions.items() if current.versions.get(name) != version]
+            kept = {name: value for name, value in current.values.items() if name not in stale}
+            candidate = DataSnapshot(manifest, versions, kept)
+            self._load_file_artifacts(candidate)
+
+            new_failures = self._new_validation_failures(current, candidate)
+            if new_failures:
+                self.last_rejected = {'version': manifest['version'], 'failures': new_failures}
+                logger.warning("Rejected data version %s: %s", manifest['version'], new_failures)
+                return []
+
+            for name in stale:
+                build = self.graph[name]['build']
+                if hasattr(build, 'builder_name'):
+                    from pages_content import discard_figures
+                    discard_figures(build.builder_name)
+
+            self._snapshot = candidate
+            self._persist(manifest)
+            logger.info("Swapped data version %s -> %s, invalidated: %s",
+                        current.version, manifest['version'], ', '.join(stale))
+            return stale
+
+    def _new_validation_failures(self, current, candidate):
+        """Rules that fail more rows in the candidate than in the current version"""
+        def failure_counts(snapshot):
+            report = self.get('validation_report', snapshot)
+            failed = report[(report['Failures'] > 0) & (report['Severity'] == 'error')]
+            return {(row.Dataset, row.Rule, row.Column): row.Failures for row in failed.itertuples()}
+
+        before = failure_counts(current)
+        after = failure_counts(candidate)
+        return {f"{dataset}.{column} ({rule})": count for (dataset, rule, column), count in after.items()
+                if count > before.get((dataset, rule, column), 0)}
+
+    def _persist(self, manifest):
+        if not self.persist_manifest or read_manifest(self.root) == manifest:
+            return
+        try:
+            write_manifest(manifest, self.root)
+        except OSError as exc:
+            logger.warning("Could not write %s: %s", MANIFEST_FILE, exc)
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store(root=None):
+    """Process-wide DatasetStore shared by the dashboard and the warm-up"""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = DatasetStore(root or Path(__file__).parent)
+        return _STORE
+
+
+def main():
+    root = Path(__file__).parent
+    manifest = build_manifest(root, read_manifest(root))
+    write_manifest(manifest, root)
+    print(f"Data version {manifest['version']} ({len(manifest['files'])} files) -> {MANIFEST_FILE}")
+
+
+if __name__ == '__main__':
+    main()
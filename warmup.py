@@ -0,0 +1,104 @@
+"""
+Startup warm-up for the Abraham Accords Literacy Dashboard
+Pays the cold-start cost (imports, datasets, result tables, default figures for
+every page) in background threads before the Streamlit server starts listening,
+so the health check only reports ready once the first visit is as fast as any other.
+
+Usage:
+    python warmup.py [streamlit run options, e.g. --server.port 7860]
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+APP_SCRIPT = str(Path(__file__).with_name('app.py'))
+# Store artifacts app.session_data reads besides the dashboard frames
+SESSION_MODELS = ('cube', 'sudan_conflict_model')
+
+# Last completed warm-up, as {stage: seconds}
+WARMUP_REPORT = {}
+_WARMUP_LOCK = threading.Lock()
+
+# ============================================================================
+# STAGES
+# ============================================================================
+def _import_modules():
+    import pandas  # noqa: F401
+    import plotly.graph_objects  # noqa: F401
+    import streamlit  # noqa: F401
+    import pages_content  # noqa: F401
+
+
+def _load_datasets():
+    """Current data version with its file-backed datasets loaded"""
+    from versioning import get_store
+    return get_store()
+
+
+def _build_artifacts(store, max_workers):
+    """Everything a first visit reads: the frames and models app.session_data fetches
+    and every page figure"""
+    from dashboard_data import FRAME_NAMES
+    names = list(FRAME_NAMES) + list(SESSION_MODELS)
+    figure_names = [name for name in store.graph if name.startswith('figure:')]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warmup') as pool:
+        artifacts = list(pool.map(store.get, names + figure_names))
+    # Serializing once primes plotly's validators and JSON encoder as well
+    for fig in artifacts[len(names):]:
+        fig.to_json()
+    return len(artifacts)
+
+
+def warm_up(max_workers=4):
+    """Run every warm-up stage and return {stage: seconds}"""
+    with _WARMUP_LOCK:
+        report = {}
+        start = time.perf_counter()
+
+        stage_start = time.perf_counter()
+        _import_modules()
+        report['imports'] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        store = _load_datasets()
+        report['datasets'] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        n_artifacts = _build_artifacts(store, max_workers)
+        report['artifacts'] = time.perf_counter() - stage_start
+
+        report['total'] = time.perf_counter() - start
+        WARMUP_REPORT.clear()
+        WARMUP_REPORT.update(report)
+
+    logger.info("Warm-up finished in %.2fs (%d artifacts): %s", report['total'], n_artifacts,
+                ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in report.items()))
+    return report
+
+
+def warm_up_in_background(max_workers=4):
+    """Start warm-up on a daemon thread (used when launched via plain `streamlit run`)"""
+    thread = threading.Thread(target=warm_up, args=(max_workers,), name='warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    report = warm_up()
+    print(f"Warm-up complete in {report['total']:.2f}s - starting Streamlit")
+
+    # Run Streamlit in this process so the warmed modules and figure cache are reused
+    from streamlit.web import cli
+    sys.argv = ['streamlit', 'run', APP_SCRIPT] + sys.argv[1:]
+    sys.exit(cli.main())
+
+
+if __name__ == '__main__':
+    main()